@@ -14,5 +14,8 @@ if __name__ == '__main__':
         if candidate not in sys.path:
             sys.path.insert(0, candidate)
 
+    from MZLauncher_app.core.startup_trace import start_startup_trace
+    start_startup_trace()
+
     from MZLauncher_app.core.splash import main
     main()
@@ -0,0 +1,130 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+
+from MZLauncher_app.core.http_cache import get_cache_dir
+from MZLauncher_app.core.java_registry import get_java_registry, read_release_file
+
+# Dynamic archives (-XX:ArchiveClassesAtExit) need JDK 13 or newer.
+MIN_JAVA_MAJOR = 13
+# First log lines printed once the client has finished loading its classes.
+STARTUP_MARKERS = ("Sound engine started", "Created: 1024x", "Narrator library")
+
+
+def get_cds_dir():
+    return get_cache_dir() / "cds"
+
+
+def get_classpath(command):
+    for flag in ("-cp", "-classpath", "--class-path"):
+        if flag in command:
+            index = command.index(flag)
+            if index + 1 < len(command):
+                return command[index + 1]
+    return ""
+
+
+class AppCDS:
+    """Per-launch handle on the dynamic AppCDS archive of one version+JVM+classpath.
+
+    The first successful run dumps the loaded classes with
+    -XX:ArchiveClassesAtExit; later runs map them with -XX:SharedArchiveFile.
+    The archive name hashes the JVM (path and mtime) and the classpath, so an
+    update of either makes the old archive stale and it is deleted.
+    """
+
+    def __init__(self, version_id, command, java_major=None):
+        self.version_id = version_id
+        self.java = command[0]
+        self.java_major = java_major
+        self.classpath = get_classpath(command)
+        self.version_dir = get_cds_dir() / "".join(c if c.isalnum() or c in "._-" else "_" for c in version_id)
+        self.mode = None
+        self.key = None
+        self.archive_path = None
+
+    def _java_major(self):
+        # Runs on the GUI thread: use what the launch already resolved, else stored data only, never a probe.
+        if self.java_major:
+            return self.java_major
+        java_home = str(Path(self.java).parent.parent)
+        entry = get_java_registry().cached(java_home)
+        if entry:
+            return entry["major"]
+        info = read_release_file(java_home)
+        return info[0] if info else None
+
+    def _compute_key(self):
+        try:
+            java_mtime = os.stat(self.java).st_mtime_ns
+        except OSError:
+            return None
+        digest = hashlib.sha1()
+        digest.update(f"{os.path.realpath(self.java)}|{java_mtime}|".encode("utf-8"))
+        digest.update(self.classpath.encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def apply(self, command):
+        """Return command with the archive flags added, or unchanged if CDS cannot be used."""
+        if not self.classpath:
+            return command
+        major = self._java_major()
+        if major is None or major < MIN_JAVA_MAJOR:
+            print(f"[AppCDS] Skipped: needs Java {MIN_JAVA_MAJOR}+, found {major or 'unknown'}")
+            return command
+        self.key = self._compute_key()
+        if self.key is None:
+            return command
+
+        self.archive_path = self.version_dir / f"{self.key}.jsa"
+        self._remove_stale_archives()
+        if self.archive_path.exists():
+            self.mode = "use"
+            flags = [f"-XX:SharedArchiveFile={self.archive_path}", "-Xshare:auto"]
+        else:
+            self.version_dir.mkdir(parents=True, exist_ok=True)
+            self.mode = "create"
+            flags = [f"-XX:ArchiveClassesAtExit={self.archive_path}"]
+        print(f"[AppCDS] {'Using' if self.mode == 'use' else 'Creating'} archive {self.archive_path.name}")
+        return [command[0], *flags, *command[1:]]
+
+    def _remove_stale_archives(self):
+        if not self.version_dir.is_dir():
+            return
+        for path in self.version_dir.glob("*.jsa"):
+            if path != self.archive_path:
+                path.unlink(missing_ok=True)
+                print(f"[AppCDS] Removed stale archive {path.name}")
+
+    def finish(self, success):
+        """Drop an archive dumped by a run that did not exit cleanly."""
+        if self.mode == "create" and not success and self.archive_path:
+            self.archive_path.unlink(missing_ok=True)
+
+    def record_startup(self, seconds):
+        """Store the startup time of this run and print it next to the other mode's."""
+        if not self.mode:
+            return
+        stats_path = get_cds_dir() / "stats.json"
+        try:
+            with open(stats_path, "r", encoding="utf-8") as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            stats = {}
+        entry = stats.get(self.version_id, {})
+        if entry.get("key") != self.key:
+            entry = {"key": self.key}
+        entry["without_cds" if self.mode == "create" else "with_cds"] = round(seconds, 2)
+        stats[self.version_id] = entry
+        try:
+            stats_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(stats_path, "w", encoding="utf-8") as f:
+                json.dump(stats, f, indent=1)
+        except OSError as e:
+            print(f"[AppCDS] Could not save startup stats: {e}")
+
+        if "without_cds" in entry and "with_cds" in entry:
+            print(f"[AppCDS] Startup of {self.version_id}: {entry['without_cds']}s without archive, {entry['with_cds']}s with archive")
+        else:
+            print(f"[AppCDS] Startup of {self.version_id}: {round(seconds, 2)}s")
@@ -1,21 +1,27 @@
-import importlib
-import pkgutil
-import time
-import datetime
-
-import MZLauncher_app
-import MZLauncher_app.core
-import MZLauncher_app.gui
-import MZLauncher_app.minecraft_account
-import MZLauncher_app.modloader
-import MZLauncher_app.download
-import MZLauncher_app.settings
-
-
-def preload_modules():
-    package = MZLauncher_app
-    for module_info in pkgutil.walk_packages(package.__path__, package.__name__ + '.'):
-        try:
-            importlib.import_module(module_info.name)
-        except Exception:
-            pass
+import sys
+
+
+def parse_launcher_args():
+    args = sys.argv[1:]
+
+    has_launcher = False
+    updater_ver = None
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+
+        if arg == "--Launcher":
+            has_launcher = True
+
+        elif arg == "--UpdaterVer":
+            if i + 1 < len(args):
+                updater_ver = args[i + 1]
+                i += 1
+
+        i += 1
+
+    if has_launcher and updater_ver is None:
+        updater_ver = "0.0.0"
+
+    return {"has_launcher": has_launcher, "updater_ver": updater_ver}
@@ -0,0 +1,136 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import platform
+import threading
+from pathlib import Path
+
+from MZLauncher_app.core.http_cache import get_cache_dir
+from MZLauncher_app.core.startup_trace import lazy_import
+
+minecraft_launcher_lib = lazy_import("minecraft_launcher_lib")
+
+CACHE_FORMAT = 1
+MAX_ENTRIES = 32
+# Launch options that change from click to click. They are baked into the
+# cached template as placeholders and filled in by render().
+PER_LAUNCH_OPTIONS = ("username", "uuid", "token", "user_type", "gameDirectory")
+JVM_ARGS_PLACEHOLDER = "${mz_jvm_arguments}"
+PLACEHOLDER_PATTERN = re.compile(r"\$\{mz_(\w+)\}")
+
+
+def version_json_chain(minecraft_directory, version_id):
+    """Return {path: mtime_ns} for the version JSON and every inheritsFrom parent, or None."""
+    versions_dir = Path(minecraft_directory) / "versions"
+    files = {}
+    while version_id and str(versions_dir / version_id / f"{version_id}.json") not in files:
+        json_path = versions_dir / version_id / f"{version_id}.json"
+        try:
+            mtime = os.stat(json_path).st_mtime_ns
+            with open(json_path, "r", encoding="utf-8") as f:
+                version_id = json.load(f).get("inheritsFrom")
+        except (OSError, ValueError):
+            return None
+        files[str(json_path)] = mtime
+    return files
+
+
+class CommandCache:
+    """Resolved launch commands, reused while the version JSONs are unchanged.
+
+    get_minecraft_command() merges the inheritsFrom chain, evaluates every
+    library rule and joins the classpath; for modloader profiles that is the
+    slow part of pressing Play. It is run once with placeholders for the
+    per-launch options and the result is stored per version, Minecraft
+    directory, Java and OS. Accounts and tokens never reach the cache file.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_cache_dir() / "launch-commands.json"
+        self.entries = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self.entries is not None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = data.get("entries", {}) if data.get("format") == CACHE_FORMAT else {}
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def _save(self):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": CACHE_FORMAT, "entries": self.entries}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[Launcher] Could not save the launch command cache: {e}")
+
+    @staticmethod
+    def _key(version_id, minecraft_directory, static_options, per_launch_keys):
+        digest = hashlib.sha1()
+        digest.update(json.dumps([version_id, os.path.realpath(minecraft_directory), static_options,
+                                  sorted(per_launch_keys), sys.platform, platform.machine(),
+                                  minecraft_launcher_lib.utils.get_library_version()]).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_command(self, version_id, minecraft_directory, options):
+        """Drop-in for minecraft_launcher_lib.command.get_minecraft_command."""
+        static_options = {k: v for k, v in options.items() if k not in PER_LAUNCH_OPTIONS and k != "jvmArguments"}
+        per_launch_keys = [k for k in PER_LAUNCH_OPTIONS if k in options]
+        key = self._key(version_id, minecraft_directory, static_options, per_launch_keys)
+        files = version_json_chain(minecraft_directory, version_id)
+
+        with self._lock:
+            self._load()
+            entry = self.entries.get(key)
+        if entry and files and entry["files"] == files:
+            print(f"[Launcher] Using cached launch command for {version_id}")
+            return self.render(entry["template"], options)
+
+        template_options = dict(static_options)
+        template_options.update({k: f"${{mz_{k}}}" for k in per_launch_keys})
+        template_options["jvmArguments"] = [JVM_ARGS_PLACEHOLDER]
+        template = minecraft_launcher_lib.command.get_minecraft_command(version_id, str(minecraft_directory), template_options)
+
+        if files:
+            with self._lock:
+                self.entries.pop(key, None)
+                self.entries[key] = {"files": files, "template": template}
+                while len(self.entries) > MAX_ENTRIES:
+                    del self.entries[next(iter(self.entries))]
+                self._save()
+        return self.render(template, options)
+
+    @staticmethod
+    def render(template, options):
+        def fill(match):
+            if match.group(1) not in PER_LAUNCH_OPTIONS or options.get(match.group(1)) is None:
+                return match.group(0)
+            return str(options[match.group(1)])
+
+        command = []
+        for arg in template:
+            if arg == JVM_ARGS_PLACEHOLDER:
+                command.extend(options.get("jvmArguments", []))
+            else:
+                command.append(PLACEHOLDER_PATTERN.sub(fill, arg))
+        return command
+
+
+_command_cache = None
+_command_cache_lock = threading.Lock()
+
+
+def get_command_cache():
+    global _command_cache
+    with _command_cache_lock:
+        if _command_cache is None:
+            _command_cache = CommandCache()
+        return _command_cache
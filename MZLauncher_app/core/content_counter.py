@@ -0,0 +1,124 @@
+import os
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QThread, Signal, QFileSystemWatcher, QTimer
+
+# Folder name -> which directory entries count as content.
+CONTENT_FOLDERS = {
+    "mods": lambda entry: entry.name.endswith(".jar"),
+    "saves": lambda entry: entry.is_dir(),
+    "resourcepacks": lambda entry: entry.name.endswith(".zip") or entry.is_dir(),
+    "shaderpacks": lambda entry: entry.name.endswith(".zip") or entry.is_dir(),
+}
+RESCAN_DELAY_MS = 250
+
+
+def count_entries(path, folder):
+    """Count the content entries of one folder; is_dir() uses the d_type scandir already read."""
+    matches = CONTENT_FOLDERS[folder]
+    try:
+        with os.scandir(path) as entries:
+            return sum(1 for entry in entries if matches(entry))
+    except OSError:
+        return 0
+
+
+class ContentScanThread(QThread):
+    counted = Signal(str, int)
+
+    def __init__(self, jobs, parent=None):
+        super().__init__(parent)
+        self.jobs = jobs
+
+    def run(self):
+        for path, folder in self.jobs:
+            self.counted.emit(path, count_entries(path, folder))
+
+
+class ContentCounter(QObject):
+    """Live counts of mods, worlds and packs in the game directory.
+
+    Counts are cached per directory and kept current by a QFileSystemWatcher:
+    only a directory that reported a change is rescanned, on a worker thread
+    and debounced, so switching pages or saving settings never touches the disk.
+    """
+    count_changed = Signal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.folders = {}
+        self.counts = {}
+        self._dirty = set()
+        self._scan_thread = None
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(RESCAN_DELAY_MS)
+        self._rescan_timer.timeout.connect(self.scan_dirty)
+
+    def set_root(self, minecraft_directory):
+        root = str(Path(minecraft_directory))
+        if root == self.root:
+            # Watched roots are kept current by the watcher. A root that did not exist yet
+            # (fresh install) was never watched, so pick it up and recount instead.
+            if root in self.watcher.directories():
+                return
+            self.update_watched_paths()
+            self._dirty.update(self.folders)
+            self.scan_dirty()
+            return
+        self.root = root
+        self.folders = {str(Path(root) / folder): folder for folder in CONTENT_FOLDERS}
+        self._dirty = set()
+        self.update_watched_paths()
+
+        # Show what is known right away; the folders were not watched in the meantime, so recount them.
+        for path, folder in self.folders.items():
+            if path in self.counts:
+                self.count_changed.emit(folder, self.counts[path])
+            self._dirty.add(path)
+        self.scan_dirty()
+
+    def count(self, folder):
+        return self.counts.get(str(Path(self.root) / folder), 0) if self.root else 0
+
+    def update_watched_paths(self):
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        # The game directory itself is watched so folders created later get picked up.
+        paths = [path for path in [self.root, *self.folders] if os.path.isdir(path)]
+        if paths:
+            self.watcher.addPaths(paths)
+
+    def on_directory_changed(self, path):
+        if path == self.root:
+            watched = set(self.watcher.directories())
+            for folder_path in self.folders:
+                if os.path.isdir(folder_path) != (folder_path in watched):
+                    self._dirty.add(folder_path)
+            self.update_watched_paths()
+        elif path in self.folders:
+            self._dirty.add(path)
+        if self._dirty:
+            self._rescan_timer.start()
+
+    def scan_dirty(self):
+        if not self._dirty:
+            return
+        if self._scan_thread and self._scan_thread.isRunning():
+            self._rescan_timer.start()
+            return
+        jobs = [(path, self.folders[path]) for path in self._dirty if path in self.folders]
+        self._dirty = set()
+        self._scan_thread = ContentScanThread(jobs, self)
+        self._scan_thread.counted.connect(self.on_counted)
+        self._scan_thread.start()
+
+    def on_counted(self, path, count):
+        previous = self.counts.get(path)
+        self.counts[path] = count
+        folder = self.folders.get(path)
+        if folder and previous != count:
+            self.count_changed.emit(folder, count)
@@ -0,0 +1,99 @@
+import os
+import re
+import time
+from pathlib import Path
+
+from MZLauncher_app.settings.settings import load_settings
+
+# Checked in order; the first signature seen in the log decides the error code.
+DEFAULT_SIGNATURES = [
+    ("OUT_OF_MEMORY", r"java\.lang\.OutOfMemoryError|Could not reserve enough space for .*object heap"),
+    ("WRONG_JAVA_VERSION", r"UnsupportedClassVersionError|compiled by a more recent version of the Java Runtime"
+                           r"|Unrecognized VM option|requires Java \d+|Incompatible Java version"),
+    ("MISSING_NATIVE", r"java\.lang\.UnsatisfiedLinkError|Failed to locate library|no lwjgl\w* in java\.library\.path"),
+    ("MIXIN_FAILURE", r"org\.spongepowered\.asm\.mixin\.\S*(Exception|Error)|Mixin apply(ing)? failed|MixinApplyError"),
+]
+CLEAN_EXIT_PATTERN = r"Stopping!"
+CRASH_REPORT_PATTERN = r"[Cc]rash report saved to:\s*(?:#@!@#\s*)?(?P<report_path>.+)"
+
+
+class CrashDetector:
+    """Classifies a game session line by line while it runs.
+
+    All signatures are compiled into one alternation, so each line costs a
+    single regex search and nothing about the session has to be kept for the
+    exit check. Extra signatures can be added through the
+    "crash_signatures" setting as {"CODE": "regex"}; they take priority.
+    """
+
+    def __init__(self, minecraft_directory, signatures=None):
+        self.minecraft_directory = Path(minecraft_directory)
+        if signatures is None:
+            custom = load_settings().get("crash_signatures", {})
+            signatures = list(custom.items()) + DEFAULT_SIGNATURES
+
+        self.codes = {}
+        parts = [f"(?P<clean_exit>{CLEAN_EXIT_PATTERN})", f"(?P<crash_report>{CRASH_REPORT_PATTERN})"]
+        self.pattern = re.compile("|".join(parts))
+        for i, (code, pattern) in enumerate(signatures):
+            if not isinstance(pattern, str):
+                print(f"[CrashCheck] Ignoring invalid signature {code}: pattern is not a string")
+                continue
+            # Checked inside the alternation: a pattern valid on its own can still clash there
+            # (duplicate group names, inline flags that are no longer at the start).
+            candidate = parts + [f"(?P<sig{i}>{pattern})"]
+            try:
+                combined = re.compile("|".join(candidate))
+            except re.error as e:
+                print(f"[CrashCheck] Ignoring invalid signature {code}: {e}")
+                continue
+            self.codes[f"sig{i}"] = code
+            parts, self.pattern = candidate, combined
+
+        self.started_at = time.time()
+        self.error_code = None
+        self.crash_report_path = None
+        self.clean_exit = False
+
+    def feed(self, line):
+        match = self.pattern.search(line)
+        if not match:
+            return
+        group = match.lastgroup
+        if group == "clean_exit":
+            self.clean_exit = True
+        elif group in ("crash_report", "report_path"):
+            self.crash_report_path = match.group("report_path").strip().strip('"')
+        elif self.error_code is None:
+            self.error_code = self.codes.get(group)
+            print(f"[CrashCheck] Detected {self.error_code}: {line.strip()}")
+
+    def _latest_crash_report(self):
+        crash_report_dir = self.minecraft_directory / "crash-reports"
+        latest = None
+        try:
+            with os.scandir(crash_report_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".txt"):
+                        continue
+                    mtime = entry.stat().st_mtime
+                    if mtime >= self.started_at and (latest is None or mtime > latest[0]):
+                        latest = (mtime, entry.path)
+        except OSError:
+            return None
+        return latest[1] if latest else None
+
+    def result(self, exit_code=None, killed_by_user=False):
+        """Return (error_code, crash_report_path) if the session crashed, else None."""
+        if killed_by_user:
+            return None
+        failed_after_stop = exit_code not in (0, None) and self.error_code is not None
+        if self.clean_exit and not failed_after_stop:
+            return None
+
+        crash_report_path = self.crash_report_path
+        if crash_report_path and not os.path.exists(crash_report_path):
+            crash_report_path = None
+        if not crash_report_path:
+            crash_report_path = self._latest_crash_report()
+        return self.error_code or "UNKNOWN", crash_report_path
@@ -0,0 +1,139 @@
+import time
+import queue
+import threading
+from collections import deque
+
+from MZLauncher_app.core.startup_trace import lazy_import
+
+# Imported by the worker on its first connection attempt.
+pypresence = lazy_import("pypresence")
+
+DISCORD_CLIENT_ID = "1410269369748946986"
+# The Discord client accepts at most 5 presence updates per 20 seconds.
+RATE_LIMIT = 5
+RATE_WINDOW = 20
+RECONNECT_DELAYS = (5, 15, 30, 60, 120)
+
+
+class DiscordRPC:
+    """Discord Rich Presence owned by a background thread.
+
+    The GUI only puts messages on a queue, so it never waits on the Discord
+    IPC pipe. Updates are sent as they come while Discord's limit of
+    RATE_LIMIT per RATE_WINDOW seconds allows; past that the worker keeps just
+    the newest presence until a slot frees up. The last slot is reserved for
+    transitions (game start/stop), so those always go out right away. While
+    Discord is not running the worker retries the connection with growing
+    delays.
+    """
+
+    def __init__(self, client_id=DISCORD_CLIENT_ID):
+        self.client_id = client_id
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def _post(self, kind, value=None):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="DiscordRPC", daemon=True)
+            self._thread.start()
+        self._queue.put((kind, value))
+
+    def set_enabled(self, enabled):
+        self._post("enable", bool(enabled))
+
+    def set_presence(self, transition=False, **presence):
+        self._post("presence", (presence, transition))
+
+    def close(self, timeout=2):
+        if self._thread and self._thread.is_alive():
+            self._queue.put(("stop", None))
+            self._thread.join(timeout)
+
+    def _connect(self):
+        try:
+            rpc = pypresence.Presence(self.client_id)
+            rpc.connect()
+            print("[RPC] Connected to Discord")
+            return rpc
+        except pypresence.InvalidID:
+            print("[RPC] Invalid Client ID for Discord RPC. Please check your settings.")
+        except Exception as e:
+            print(f"[RPC] Failed to connect to Discord RPC: {e}")
+        return None
+
+    @staticmethod
+    def _disconnect(rpc):
+        try:
+            rpc.close()
+        except Exception as e:
+            print(f"[RPC] Error while closing Discord RPC: {e}")
+
+    def _run(self):
+        rpc = None
+        enabled = False
+        pending = None
+        pending_transition = False
+        sent = deque(maxlen=RATE_LIMIT)
+        next_connect = 0.0
+        attempt = 0
+
+        def next_slot(transition):
+            # Ordinary updates leave the newest slot free for a transition.
+            used = len(sent) if transition else len(sent) + 1
+            if used < RATE_LIMIT:
+                return 0.0
+            return sent[used - RATE_LIMIT] + RATE_WINDOW
+
+        while True:
+            now = time.monotonic()
+            if enabled and rpc is None:
+                timeout = max(0.0, next_connect - now)
+            elif rpc is not None and pending is not None:
+                timeout = max(0.0, next_slot(pending_transition) - now)
+            else:
+                timeout = None
+
+            try:
+                kind, value = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                kind, value = None, None
+
+            if kind == "stop":
+                break
+            if kind == "enable" and value != enabled:
+                enabled = value
+                next_connect, attempt = 0.0, 0
+                if not enabled and rpc is not None:
+                    self._disconnect(rpc)
+                    rpc = None
+            elif kind == "presence":
+                # A plain update replacing a waiting transition keeps its priority.
+                pending_transition = value[1] or (pending_transition and pending is not None)
+                pending = value[0]
+            if not self._queue.empty():
+                continue
+
+            now = time.monotonic()
+            if enabled and rpc is None and now >= next_connect:
+                rpc = self._connect()
+                if rpc is None:
+                    next_connect = now + RECONNECT_DELAYS[min(attempt, len(RECONNECT_DELAYS) - 1)]
+                    attempt += 1
+                    continue
+                attempt = 0
+
+            if rpc is not None and pending is not None and now >= next_slot(pending_transition):
+                try:
+                    rpc.update(**pending)
+                    sent.append(now)
+                    pending = None
+                    pending_transition = False
+                except Exception as e:
+                    # Usually PipeClosed: Discord quit. Keep the presence and reconnect.
+                    print(f"[RPC] Lost connection to Discord: {e}")
+                    self._disconnect(rpc)
+                    rpc = None
+                    next_connect = now
+
+        if rpc is not None:
+            self._disconnect(rpc)
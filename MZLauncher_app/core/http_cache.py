@@ -0,0 +1,163 @@
+import os
+import json
+import time
+import threading
+from pathlib import Path
+
+import requests
+
+from MZLauncher_app.settings.settings import load_settings, get_appdata_path
+
+VERSION_MANIFEST_URL = 'https://piston-meta.mojang.com/mc/game/version_manifest_v2.json'
+DEFAULT_TTL = 600
+REQUEST_TIMEOUT = 15
+# After a failed fetch, callers get the cached copy (or None) without retrying for this long.
+FAILURE_BACKOFF = 30
+
+
+def get_cache_dir():
+    cache_dir = get_appdata_path() / 'cache'
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+class CachedResource:
+    """A remote document fetched with conditional GETs and kept in memory for a TTL.
+
+    The body is stored on disk next to a small meta file holding its ETag and
+    Last-Modified values. A 304 only refreshes the in-memory timestamp, and the
+    body file is rewritten only when the server sends different bytes. A failed
+    fetch is not retried for FAILURE_BACKOFF seconds, so offline callers do not
+    each wait out REQUEST_TIMEOUT.
+    """
+
+    def __init__(self, url, cache_path, ttl=None, parse=json.loads):
+        self.url = url
+        self.parse = parse
+        self.cache_path = Path(cache_path)
+        self.meta_path = self.cache_path.with_name(self.cache_path.name + '.meta')
+        self.ttl = ttl
+        self.data = None
+        self.raw = None
+        self.etag = None
+        self.last_modified = None
+        self.fetched_at = None
+        self.failed_at = None
+        self._disk_loaded = False
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+
+    def _get_ttl(self):
+        if self.ttl is not None:
+            return self.ttl
+        return load_settings().get('manifest_ttl', DEFAULT_TTL)
+
+    def _load_disk(self):
+        if self._disk_loaded:
+            return
+        self._disk_loaded = True
+        try:
+            with open(self.cache_path, 'rb') as f:
+                raw = f.read()
+            self.data = self.parse(raw)
+            self.raw = raw
+        except (OSError, ValueError):
+            return
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            self.etag = meta.get('etag')
+            self.last_modified = meta.get('last_modified')
+        except (OSError, ValueError):
+            pass
+
+    def _write(self, path, content):
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _store(self, response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        raw = response.content
+        data = self.parse(raw)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        if raw != self.raw:
+            self._write(self.cache_path, raw)
+        if (etag, last_modified) != (self.etag, self.last_modified):
+            self._write(self.meta_path, json.dumps({'etag': etag, 'last_modified': last_modified}).encode('utf-8'))
+        self.data, self.raw = data, raw
+        self.etag, self.last_modified = etag, last_modified
+
+    def get(self, cached_only=False, session=None):
+        """Return the document, or None if offline with no cached copy.
+
+        With cached_only the network is never touched, which keeps UI-thread
+        callers from blocking on a round trip.
+        """
+        with self._lock:
+            self._load_disk()
+            if cached_only or self._is_fresh() or self._in_backoff():
+                return self.data
+
+        # Fetches are serialised separately so cached_only readers never wait on the network.
+        with self._fetch_lock:
+            with self._lock:
+                if self._is_fresh() or self._in_backoff():
+                    return self.data
+                headers = {}
+                if self.data is not None:
+                    if self.etag:
+                        headers['If-None-Match'] = self.etag
+                    if self.last_modified:
+                        headers['If-Modified-Since'] = self.last_modified
+            try:
+                response = (session or requests).get(self.url, headers=headers, timeout=REQUEST_TIMEOUT)
+                with self._lock:
+                    if response.status_code == 304 and self.data is not None:
+                        print(f'[HttpCache] {self.cache_path.name} not modified')
+                    else:
+                        response.raise_for_status()
+                        self._store(response)
+                    self.fetched_at = time.monotonic()
+                    self.failed_at = None
+            except (requests.RequestException, ValueError, OSError) as e:
+                print(f'[HttpCache] Could not refresh {self.cache_path.name}, using cached copy: {e}')
+                with self._lock:
+                    self.failed_at = time.monotonic()
+            return self.data
+
+    def _is_fresh(self):
+        return self.data is not None and self.fetched_at is not None \
+            and time.monotonic() - self.fetched_at < self._get_ttl()
+
+    def _in_backoff(self):
+        return self.failed_at is not None and time.monotonic() - self.failed_at < FAILURE_BACKOFF
+
+    def invalidate(self):
+        with self._lock:
+            self.fetched_at = None
+            self.failed_at = None
+
+
+_resources = {}
+_resources_lock = threading.Lock()
+
+
+def get_cached_resource(url, cache_name, ttl=None, parse=json.loads):
+    with _resources_lock:
+        resource = _resources.get(url)
+        if resource is None:
+            cache_path = get_cache_dir() / cache_name
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            resource = _resources[url] = CachedResource(url, cache_path, ttl, parse)
+        return resource
+
+
+def decode_text(raw):
+    return raw.decode('utf-8')
+
+
+def get_version_manifest(cached_only=False, session=None):
+    return get_cached_resource(VERSION_MANIFEST_URL, 'version_manifest_v2.json').get(cached_only, session)
@@ -0,0 +1,401 @@
+import os
+import re
+import sys
+import json
+import glob
+import shutil
+import platform
+import threading
+import subprocess
+from pathlib import Path
+
+import requests
+from PySide6.QtCore import QThread, Signal
+
+from MZLauncher_app.settings.settings import get_minecraft_directory, load_settings
+from MZLauncher_app.core.http_cache import get_cache_dir, get_version_manifest
+from MZLauncher_app.core.startup_trace import lazy_import
+
+# Java detection at startup does not need it; only selecting or installing a Mojang runtime does.
+minecraft_launcher_lib = lazy_import("minecraft_launcher_lib")
+
+REGISTRY_FORMAT = 1
+# Versions older than the javaVersion field run on Mojang's legacy Java 8 runtime.
+LEGACY_JAVA = {"component": "jre-legacy", "majorVersion": 8}
+JAVA_EXE = "java.exe" if sys.platform.startswith("win32") else "java"
+
+if sys.platform.startswith("win32"):
+    JVM_SEARCH_PATTERNS = [
+        os.path.join(os.environ.get("ProgramFiles", r"C:\Program Files"), vendor, "*")
+        for vendor in ("Java", "Eclipse Adoptium", "Microsoft", "Zulu", "BellSoft", "Amazon Corretto")
+    ]
+elif sys.platform.startswith("darwin"):
+    JVM_SEARCH_PATTERNS = ["/Library/Java/JavaVirtualMachines/*/Contents/Home",
+                           os.path.expanduser("~/Library/Java/JavaVirtualMachines/*/Contents/Home")]
+else:
+    JVM_SEARCH_PATTERNS = ["/usr/lib/jvm/*", "/usr/lib64/jvm/*", "/usr/java/*", "/opt/java/*", "/opt/jdk*",
+                           os.path.expanduser("~/.sdkman/candidates/java/*"), os.path.expanduser("~/.jdks/*")]
+
+
+def find_java_executable(java_dir):
+    if not java_dir:
+        return None
+
+    win_candidates = [
+        os.path.join(java_dir, "bin", "javaw.exe"),
+        os.path.join(java_dir, "bin", "java.exe"),
+        os.path.join(java_dir, "javaw.exe"),
+        os.path.join(java_dir, "java.exe"),
+    ]
+
+    unix_candidates = [
+        os.path.join(java_dir, "bin", "java"),
+        os.path.join(java_dir, "java"),
+    ]
+    candidates = []
+    if sys.platform.startswith("win32"):
+        candidates = win_candidates
+    else:
+        candidates = unix_candidates
+
+    for path in candidates:
+        if os.path.exists(path) and os.access(path, os.X_OK):
+            return path
+    return None
+
+
+def parse_major_version(version):
+    """'1.8.0_392' -> 8, '17.0.2' -> 17, '21' -> 21."""
+    match = re.match(r'"?(\d+)(?:\.(\d+))?', version or "")
+    if not match:
+        return None
+    major = int(match.group(1))
+    if major == 1 and match.group(2):
+        return int(match.group(2))
+    return major
+
+
+def normalize_arch(arch):
+    arch = (arch or "").lower()
+    if arch in ("amd64", "x86_64", "x64"):
+        return "x64"
+    if arch in ("aarch64", "arm64"):
+        return "arm64"
+    if arch in ("x86", "i386", "i586", "i686"):
+        return "x86"
+    return arch
+
+
+def read_release_file(java_home):
+    values = {}
+    try:
+        with open(os.path.join(java_home, "release"), "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                key, sep, value = line.partition("=")
+                if sep:
+                    values[key.strip()] = value.strip().strip('"')
+    except OSError:
+        return None
+    major = parse_major_version(values.get("JAVA_VERSION"))
+    if major is None:
+        return None
+    return major, normalize_arch(values.get("OS_ARCH"))
+
+
+def probe_java(executable):
+    try:
+        result = subprocess.run([executable, "-XshowSettings:properties", "-version"], capture_output=True, text=True,
+                                timeout=15, creationflags=subprocess.CREATE_NO_WINDOW if sys.platform.startswith("win32") else 0)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"[Java] Could not probe {executable}: {e}")
+        return None
+    output = result.stderr + result.stdout
+    version = re.search(r"java\.version = (\S+)", output)
+    arch = re.search(r"os\.arch = (\S+)", output)
+    major = parse_major_version(version.group(1)) if version else None
+    if major is None:
+        return None
+    return major, normalize_arch(arch.group(1) if arch else "")
+
+
+class JavaRegistry:
+    """Index of the JVMs on this machine, grouped by major version.
+
+    Each JVM's major version and arch come from its `release` file, or from a
+    single `java -version` probe when there is none. Results are persisted and
+    reused while the executable's mtime is unchanged, so refreshing is mostly
+    stat calls and best_java() is a dict lookup. best_java() never scans; worker
+    threads call ensure_scanned() (select_java does) so the GUI thread never does.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_cache_dir() / "java-registry.json"
+        self.entries = {}
+        self.by_major = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._scanned = False
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") == REGISTRY_FORMAT:
+                self.entries = data.get("jvms", {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": REGISTRY_FORMAT, "jvms": self.entries}, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[Java] Could not save the Java registry: {e}")
+
+    def candidate_homes(self, minecraft_directory=None):
+        """Yield (java_home, source) pairs; earlier sources win ties within a major version."""
+        runtime_dir = Path(minecraft_directory or get_minecraft_directory()) / "runtime"
+        for component in sorted(glob.glob(str(runtime_dir / "*"))):
+            for platform_dir in sorted(glob.glob(os.path.join(component, "*"))):
+                # Mojang layout is runtime/<component>/<platform>/<component>; older layouts stop one level up.
+                for home in (os.path.join(platform_dir, os.path.basename(component)), platform_dir):
+                    yield home, "mojang"
+                    yield os.path.join(home, "jre.bundle", "Contents", "Home"), "mojang"
+
+        settings = load_settings()
+        if settings.get("java_path"):
+            yield settings["java_path"], "custom"
+        if os.environ.get("JAVA_HOME"):
+            yield os.environ["JAVA_HOME"], "java_home"
+        on_path = shutil.which("java")
+        if on_path:
+            yield str(Path(os.path.realpath(on_path)).parent.parent), "path"
+        for pattern in JVM_SEARCH_PATTERNS:
+            for home in sorted(glob.glob(pattern)):
+                yield home, "system"
+
+    def cached(self, java_home):
+        """Return the stored entry for java_home if its executable is unchanged; never probes."""
+        try:
+            mtime = os.stat(os.path.join(java_home, "bin", JAVA_EXE)).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            entry = self.entries.get(os.path.realpath(java_home))
+        return entry if entry and entry["mtime"] == mtime else None
+
+    def inspect(self, java_home, source="custom"):
+        """Return the registry entry for java_home, probing it only if it changed."""
+        entry = self.cached(java_home)
+        if entry:
+            return entry
+        executable = os.path.join(java_home, "bin", JAVA_EXE)
+        try:
+            mtime = os.stat(executable).st_mtime_ns
+        except OSError:
+            return None
+        key = os.path.realpath(java_home)
+
+        info = read_release_file(java_home) or probe_java(executable)
+        if info is None:
+            return None
+        major, arch = info
+        entry = {"home": key, "executable": executable, "major": major, "arch": arch, "source": source, "mtime": mtime}
+        with self._lock:
+            self.entries[key] = entry
+            self._dirty = True
+        return entry
+
+    def refresh(self, minecraft_directory=None):
+        # Concurrent callers (startup detection, runtime preparation) scan one after another;
+        # the second scan only stats the JVMs the first one probed.
+        with self._refresh_lock:
+            self._refresh(minecraft_directory)
+
+    def _refresh(self, minecraft_directory=None):
+        self._dirty = False
+        found = []
+        seen = set()
+        for home, source in self.candidate_homes(minecraft_directory):
+            if not os.path.isdir(home):
+                continue
+            entry = self.inspect(home, source)
+            if entry and entry["home"] not in seen:
+                seen.add(entry["home"])
+                found.append(entry)
+
+        host_arch = normalize_arch(platform.machine())
+        by_major = {}
+        for entry in found:
+            best = by_major.get(entry["major"])
+            # Prefer a JVM matching the host arch, then the earliest source.
+            if best is None or (best["arch"] != host_arch and entry["arch"] == host_arch):
+                by_major[entry["major"]] = entry
+
+        with self._lock:
+            stale = set(self.entries) - seen
+            for key in stale:
+                del self.entries[key]
+            self.by_major = by_major
+            self._scanned = True
+            dirty = self._dirty or bool(stale)
+        if dirty:
+            self.save()
+        print(f"[Java] Found Java versions: {sorted(by_major)}")
+
+    def ensure_scanned(self, minecraft_directory=None):
+        """Scan once if nothing has been scanned yet. Blocks; call from a worker thread."""
+        if not self._scanned:
+            self.refresh(minecraft_directory)
+
+    def best_java(self, major=None, allow_newer=False):
+        """Return the executable of the best JVM for Java `major` (or the newest JVM), or None while unscanned."""
+        if not self._scanned:
+            return None
+        if major is None:
+            return self.by_major[max(self.by_major)]["executable"] if self.by_major else None
+        entry = self.by_major.get(major)
+        if entry is None and allow_newer:
+            newer = [m for m in self.by_major if m > major]
+            entry = self.by_major[min(newer)] if newer else None
+        return entry["executable"] if entry else None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_java_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = JavaRegistry()
+        return _registry
+
+
+def read_version_java(minecraft_directory, version_id):
+    """Return the javaVersion of an installed version, following inheritsFrom, or None."""
+    versions_dir = Path(minecraft_directory) / "versions"
+    seen = set()
+    while version_id and version_id not in seen:
+        seen.add(version_id)
+        try:
+            with open(versions_dir / version_id / f"{version_id}.json", "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("javaVersion"):
+            return data["javaVersion"]
+        version_id = data.get("inheritsFrom")
+    return LEGACY_JAVA
+
+
+def fetch_version_java(minecraft_directory, version_id):
+    """Like read_version_java, but looks the version up in Mojang's manifest if it is not installed."""
+    java_version = read_version_java(minecraft_directory, version_id)
+    if java_version:
+        return java_version
+    manifest = get_version_manifest()
+    entry = next((v for v in (manifest or {}).get("versions", []) if v.get("id") == version_id), None)
+    if entry is None:
+        return None
+    try:
+        response = requests.get(entry["url"], timeout=15)
+        response.raise_for_status()
+        return response.json().get("javaVersion") or LEGACY_JAVA
+    except (requests.RequestException, ValueError) as e:
+        print(f"[Java] Could not read the Java requirement of {version_id}: {e}")
+        return None
+
+
+def select_java(minecraft_directory, java_version, allow_newer=False):
+    """Return an executable satisfying java_version: Mojang's runtime first, then the registry.
+
+    May scan the machine for JVMs, so it must not run on the GUI thread.
+    """
+    if not java_version:
+        return None
+    mojang_java = minecraft_launcher_lib.runtime.get_executable_path(java_version["component"], str(minecraft_directory))
+    if mojang_java:
+        return mojang_java
+    registry = get_java_registry()
+    registry.ensure_scanned(minecraft_directory)
+    return registry.best_java(java_version.get("majorVersion"), allow_newer=allow_newer)
+
+
+def java_home_of(executable):
+    return str(Path(executable).parent.parent)
+
+
+_runtime_install_lock = threading.Lock()
+
+
+def install_runtime(minecraft_directory, java_version, callback=None, force=False):
+    """Install Mojang's runtime for java_version unless it is already present; returns its executable.
+
+    With force the runtime's files are re-checked even when it is installed.
+    """
+    with _runtime_install_lock:
+        executable = minecraft_launcher_lib.runtime.get_executable_path(java_version["component"], str(minecraft_directory))
+        if executable and not force:
+            return executable
+        print(f"[Java] Installing runtime {java_version['component']}")
+        minecraft_launcher_lib.runtime.install_jvm_runtime(java_version["component"], str(minecraft_directory), callback=callback)
+        return minecraft_launcher_lib.runtime.get_executable_path(java_version["component"], str(minecraft_directory))
+
+
+class RuntimePrepareThread(QThread):
+    """Makes sure a JVM for a version exists before the user presses Play."""
+    finished_signal = Signal(str)
+
+    def __init__(self, minecraft_directory, version_id, parent=None):
+        super().__init__(parent)
+        self.minecraft_directory = minecraft_directory
+        self.version_id = version_id
+
+    def run(self):
+        try:
+            get_java_registry().refresh(self.minecraft_directory)
+            java_version = read_version_java(self.minecraft_directory, self.version_id)
+            if java_version and not select_java(self.minecraft_directory, java_version):
+                install_runtime(self.minecraft_directory, java_version)
+            self.finished_signal.emit(self.version_id)
+        except Exception as e:
+            print(f"[Java] Could not prepare Java for {self.version_id}: {e}")
+
+
+class JavaSelectThread(QThread):
+    """Resolves the JVM for a launch off the GUI thread.
+
+    Emits a dict with the version's javaVersion, the chosen executable and its
+    major version (any of them may be None).
+    """
+    finished_signal = Signal(dict)
+
+    def __init__(self, minecraft_directory, version_id, java_mode="default", java_path="", parent=None):
+        super().__init__(parent)
+        self.minecraft_directory = minecraft_directory
+        self.version_id = version_id
+        self.java_mode = java_mode
+        self.java_path = java_path
+
+    def run(self):
+        result = {"java_version": None, "executable": None, "major": None}
+        try:
+            result["java_version"] = read_version_java(self.minecraft_directory, self.version_id)
+            if self.java_mode == "custom":
+                executable = find_java_executable(self.java_path)
+            else:
+                executable = select_java(self.minecraft_directory, result["java_version"])
+            if executable:
+                result["executable"] = executable
+                entry = get_java_registry().inspect(java_home_of(executable))
+                result["major"] = entry["major"] if entry else None
+        except Exception as e:
+            print(f"[Java] Could not select Java for {self.version_id}: {e}")
+        self.finished_signal.emit(result)
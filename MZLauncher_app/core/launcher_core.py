@@ -3,12 +3,10 @@ import sys
 import shutil
 import json
 import webbrowser
-import psutil
 import requests
 import time
 import subprocess
 
-import xml.etree.ElementTree as ET
 import threading
 import shlex
 from pathlib import Path
@@ -27,53 +25,30 @@ from PySide6.QtCore import (
     Qt, QTimer, QSize, Signal, QThread, QObject, QUrl, QRect, QRectF, QPointF
 )
 import traceback
-import minecraft_launcher_lib
 import datetime
-from pypresence import Presence
-from pypresence.exceptions import InvalidID, PipeClosed
 from packaging.version import Version, InvalidVersion
-import minecraft_launcher_lib.microsoft_account as msa
 import uuid 
 
-from MZLauncher_app.settings.settings import get_minecraft_directory, load_settings, save_settings, load_accounts, save_accounts
+from MZLauncher_app.settings.settings import (get_minecraft_directory, load_settings, save_settings, flush_settings, load_accounts,
+                                              update_accounts)
 from MZLauncher_app.download.download import DownloadThread
 from MZLauncher_app.minecraft_account.account import UserManagerDialog
+from MZLauncher_app.minecraft_account.token_refresh import TokenRefreshThread, needs_refresh, token_expired
 from MZLauncher_app.gui.main_window import MainWindow
 from MZLauncher_app.gui.pages.home_page import HomePage
 from MZLauncher_app.gui.pages.setting_page import SettingsPage
 from MZLauncher_app.gui.pages.instance_page import InstancePage, load_instances
 from MZLauncher_app.gui.pages.modloader_page import ModLoaderPage
+from MZLauncher_app.core.log_pipeline import LogPipeline, get_game_log_path, CONSOLE_MAX_BLOCKS
+from MZLauncher_app.core.crash_detector import CrashDetector
+from MZLauncher_app.core.appcds import AppCDS, STARTUP_MARKERS
+from MZLauncher_app.core.command_cache import get_command_cache
+from MZLauncher_app.core.discord_rpc import DiscordRPC
+from MZLauncher_app.core.java_registry import RuntimePrepareThread, JavaSelectThread
 
-DISCORD_CLIENT_ID = "1410269369748946986"
 from MZLauncher_app.core.utils import (list_available_languages, load_language, resource_path, get_appdata_path, get_tmp_dir,
                                        get_installed_versions, get_available_versions, minecraft_version_key)
-CLIENT_ID = "YOUR_CLIENT_ID_HERE"  # Replace with your Azure App Client ID
-REDIRECT_URI = "http://localhost:12782/callback"
 
-def parse_launcher_args():
-    args = sys.argv[1:]
-
-    has_launcher = False
-    updater_ver = None
-
-    i = 0
-    while i < len(args):
-        arg = args[i]
-
-        if arg == "--Launcher":
-            has_launcher = True
-
-        elif arg == "--UpdaterVer":
-            if i + 1 < len(args):
-                updater_ver = args[i + 1]
-                i += 1
-
-        i += 1
-
-    if has_launcher and updater_ver is None:
-        updater_ver = "0.0.0"
-
-    return {"has_launcher": has_launcher, "updater_ver": updater_ver}
 
 def sort_versions_smart(versions: list[str], reverse=True) -> list[str]:
     def key(v):
@@ -100,63 +75,7 @@ def format_jvm_args(args: list[str]) -> str:
             result.append(arg)
     return " ".join(result)
 
-def find_java_executable(java_dir):
-    if not java_dir:
-        return None
-
-    win_candidates = [
-        os.path.join(java_dir, "bin", "javaw.exe"),
-        os.path.join(java_dir, "bin", "java.exe"),
-        os.path.join(java_dir, "javaw.exe"),
-        os.path.join(java_dir, "java.exe"),
-    ]
-
-    unix_candidates = [
-        os.path.join(java_dir, "bin", "java"),
-        os.path.join(java_dir, "java"),
-    ]
-    candidates = []
-    if sys.platform.startswith("win32"):
-        candidates = win_candidates
-    else:
-        candidates = unix_candidates
-
-    for path in candidates:
-        if os.path.exists(path) and os.access(path, os.X_OK):
-            return path
-    return None
-
-def find_minecraft_java_runtime(mc_dir: Path) -> str | None:
-    runtime_dir = mc_dir / "runtime"
-    if not runtime_dir.is_dir():
-        return None
-
-    candidates = []
-    for runtime_version_dir in runtime_dir.iterdir():
-        if not runtime_version_dir.is_dir():
-            continue
-
-        for platform_dir in runtime_version_dir.iterdir():
-            if not platform_dir.is_dir():
-                continue
-            
-            java_exe_name = "javaw.exe" if sys.platform.startswith("win32") else "java"
-            java_bin = platform_dir / "bin" / java_exe_name
-            if not java_bin.exists() and sys.platform.startswith("win32"):
-                 java_bin = platform_dir / "bin" / "java.exe"
-
-            if java_bin.exists() and os.access(java_bin, os.X_OK):
-                candidates.append(java_bin)
-
-    if not candidates:
-        return None
-
-    candidates.sort(key=lambda p: p.parent.parent.parent.name, reverse=True)
-    return str(candidates[0])
-
 class DevConsole(QWidget):
-    append_signal = Signal(str)
-    
     def __init__(self, parent_launcher, styles="", tr=None):
         super().__init__()
         self.parent_launcher = parent_launcher
@@ -169,6 +88,7 @@ class DevConsole(QWidget):
         self.layout = QVBoxLayout(self)
         self.console_output = QPlainTextEdit()
         self.console_output.setReadOnly(True)
+        self.console_output.setMaximumBlockCount(CONSOLE_MAX_BLOCKS)
         self.console_output.setStyleSheet("background-color: #000; color: #fff;")
         self.layout.addWidget(self.console_output)
         
@@ -179,17 +99,30 @@ class DevConsole(QWidget):
         button_layout.addWidget(self.kill_button)
         self.layout.addLayout(button_layout)
         
-        self.append_signal.connect(self._append_text)
+        self._partial_line = ""
+        self._write_lock = threading.Lock()
+        self.log_pipeline = LogPipeline(parent=self)
+        self.log_pipeline.batch_ready.connect(self.append_lines)
         sys.stdout = self
         
     def write(self, text):
-        self.append_signal.emit(text)
+        # print() writes the text and the newline separately; only whole lines go to the pipeline.
+        with self._write_lock:
+            self._partial_line += text
+            if "\n" not in self._partial_line:
+                return
+            *lines, self._partial_line = self._partial_line.split("\n")
+        for line in lines:
+            self.log_pipeline.push(line)
 
-    def _append_text(self, text):
-        self.console_output.appendPlainText(text)
+    def append_lines(self, lines):
+        self.console_output.appendPlainText("\n".join(lines))
     
     def flush(self):
-        pass
+        with self._write_lock:
+            line, self._partial_line = self._partial_line, ""
+        if line:
+            self.log_pipeline.push(line)
         
     def set_kill_button_enabled(self, enabled):
         if self.kill_button and not self.kill_button.parent() is None:
@@ -214,6 +147,13 @@ class DevConsole(QWidget):
         self.hide()
         event.ignore()
 
+CRASH_DESCRIPTIONS = {
+    "OUT_OF_MEMORY": "Minecraft ran out of memory.\nIncrease the allocated RAM in Settings, or remove heavy mods.",
+    "MISSING_NATIVE": "A native library could not be loaded.\nReinstall this version so its natives are extracted again.",
+    "MIXIN_FAILURE": "A mod failed to apply its mixins.\nOne of your mods is broken or incompatible with this version.",
+    "WRONG_JAVA_VERSION": "This version needs a different Java version.\nSwitch to the built-in Java or pick a matching custom Java.",
+}
+
 class CrashCheckDialog(QDialog):
     def __init__(self, error_code="UNKNOWN", crash_report_path=None, parent=None, tr=None):
         super().__init__(parent)
@@ -244,8 +184,11 @@ class CrashCheckDialog(QDialog):
         title.setFont(QFont("Segoe UI", 12, QFont.Bold))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        desc = QLabel(self.tr.get("crash_description", "An unknown error occurred. Yes, truly unknown C:\n"
-                      "Possible causes: MODs, JVM, or RAM settings in launcher."))
+        if error_code in CRASH_DESCRIPTIONS:
+            desc = QLabel(self.tr.get(f"crash_description_{error_code.lower()}", CRASH_DESCRIPTIONS[error_code]))
+        else:
+            desc = QLabel(self.tr.get("crash_description", "An unknown error occurred. Yes, truly unknown C:\n"
+                          "Possible causes: MODs, JVM, or RAM settings in launcher."))
         desc.setWordWrap(True)
         desc.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
@@ -277,17 +220,95 @@ class CrashCheckDialog(QDialog):
         self.layout.addWidget(fix_tips)
         self.layout.addLayout(btn_layout)
 
+def build_version_entries(settings, installed_versions, available_versions, latest_release_id, instances):
+    """Return the (label, data) rows of the home version combo and the index to select."""
+    current_version = settings.get("version_id")
+    filters = settings.get("filters", {})
+    show_installed = filters.get("installed", True)
+    installed_versions_set = set(installed_versions)
+
+    entries = []
+    for instance_data in instances:
+        entries.append((f"{instance_data['name']} ({instance_data['version']})", f"instance-{instance_data['name']}"))
+
+    all_versions_data = {}
+
+    for label, version_id in available_versions:
+        all_versions_data[version_id] = {
+            "label": label,
+            "is_installed": version_id in installed_versions_set
+        }
+
+    if show_installed:
+        for version_id in installed_versions:
+            if version_id not in all_versions_data:
+                all_versions_data[version_id] = {
+                    "label": version_id,
+                    "is_installed": True
+                }
+
+    def sort_key_packaging(v_id):
+        is_installed = all_versions_data[v_id].get("is_installed", False) and show_installed
+        return (is_installed, minecraft_version_key(v_id))
+    sorted_version_ids = sorted(all_versions_data.keys(), key=sort_key_packaging, reverse=True)
+
+    for version_id in sorted_version_ids:
+        data = all_versions_data[version_id]
+        display_label = data["label"]
+        installed_prefix = "(Installed) " if data["is_installed"] and show_installed else ""
+
+        if version_id == latest_release_id:
+            entries.append((f"{installed_prefix}Latest Release ({version_id})", version_id))
+            entries.append((f"{installed_prefix}Release - {version_id}", version_id))
+            continue
+
+        entries.append((f"{installed_prefix}{display_label}", version_id))
+
+    current_index = -1
+    if current_version:
+        matching = [(i, label) for i, (label, data) in enumerate(entries) if data == current_version]
+        if matching:
+            current_index = next((i for i, label in matching if "Release -" in label and "Latest" not in label), matching[0][0])
+    if current_index == -1 and latest_release_id:
+        current_index = next((i for i, (_, data) in enumerate(entries) if data == latest_release_id), -1)
+    if current_index == -1 and entries:
+        current_index = 0
+
+    return {"entries": entries, "current_index": current_index}
+
+
+def collect_version_list(cached_only=False):
+    settings = load_settings()
+    installed_versions = get_installed_versions()
+    available_versions, latest_release_id = get_available_versions(settings.get("filters", {}), cached_only=cached_only)
+    return build_version_entries(settings, installed_versions, available_versions, latest_release_id, load_instances())
+
+
+class VersionListThread(QThread):
+    loaded = Signal(object)
+
+    def run(self):
+        try:
+            self.loaded.emit(collect_version_list())
+        except Exception as e:
+            print(f"[Versions] Failed to load version list: {e}")
+
+
 class MinecraftThread(QThread):
     finished_signal = Signal()
-    log_signal = Signal(str)
     crash_detected = Signal(str, str)
 
-    def __init__(self, command, minecraft_directory, parent=None):
+    def __init__(self, command, minecraft_directory, parent=None, appcds=None):
         super().__init__(parent)
         self.command = command
         self.minecraft_directory = minecraft_directory
         self.process = None
         self.killed_by_user = False
+        self.appcds = appcds
+        # Created here so its flush timer lives on the GUI thread.
+        self.log_pipeline = LogPipeline(get_game_log_path(), parent=self)
+        self.log_batch = self.log_pipeline.batch_ready
+        self.crash_detector = CrashDetector(minecraft_directory)
 
     def run(self):
         try:
@@ -297,6 +318,8 @@ class MinecraftThread(QThread):
                 if os.path.exists(java_w_exe_path):
                     self.command[0] = java_w_exe_path
                     
+            started_at = time.monotonic()
+            startup_recorded = False
             self.process = subprocess.Popen(
                 self.command,
                 cwd=self.minecraft_directory,
@@ -307,10 +330,13 @@ class MinecraftThread(QThread):
                 encoding='utf-8',
                 errors='ignore'
             )
-            log_lines = []
             for line in iter(self.process.stdout.readline, ''):
-                self.log_signal.emit(line.strip())
-                log_lines.append(line.strip())
+                line = line.rstrip()
+                self.log_pipeline.push(line)
+                self.crash_detector.feed(line)
+                if self.appcds and not startup_recorded and any(marker in line for marker in STARTUP_MARKERS):
+                    startup_recorded = True
+                    self.appcds.record_startup(time.monotonic() - started_at)
             
             try:
                 self.process.wait(timeout=2)
@@ -324,33 +350,18 @@ class MinecraftThread(QThread):
                 except Exception:
                     pass
 
-            log_text = "\n".join(log_lines)
-            if not self.killed_by_user and "Stopping!" not in log_text:
-                try:
-                    crash_report_path = None
-
-                    for line in log_lines:
-                        if "crash report saved to:" in line.lower():
-                            possible_path = line.split("to:", 1)[1].strip().strip('"')
-                            if os.path.exists(possible_path):
-                                crash_report_path = possible_path
-                                print(f"[DEBUG] Found crash report path from log: {crash_report_path}")
-                                break
-
-                    if not crash_report_path:
-                        crash_report_dir = Path(self.minecraft_directory) / "crash-reports"
-                        if crash_report_dir.exists():
-                            reports = sorted(crash_report_dir.glob("*.txt"), key=os.path.getmtime, reverse=True)
-                            if reports:
-                                crash_report_path = str(reports[0])
-                                print(f"[DEBUG] Using fallback crash report path: {crash_report_path}")
-
-                    self.crash_detected.emit("UNKNOWN", crash_report_path)
-                except Exception as e:
-                    print(f"[CrashCheck] Error showing crash dialog: {e}")
+            crash = self.crash_detector.result(self.process.returncode, self.killed_by_user)
+            if crash:
+                error_code, crash_report_path = crash
+                print(f"[CrashCheck] Minecraft exited with {error_code}, report: {crash_report_path}")
+                self.crash_detected.emit(error_code, crash_report_path)
+            if self.appcds:
+                self.appcds.finish(crash is None and not self.killed_by_user)
 
         except Exception as e:
-            self.log_signal.emit(f"Error launching Minecraft: {e}")
+            self.log_pipeline.push(f"Error launching Minecraft: {e}")
+        finally:
+            self.log_pipeline.close()
         
         self.finished_signal.emit()
 
@@ -444,13 +455,10 @@ class MaZultLauncher(QWidget):
             else:
                 save_settings(version_id=selected_version_id)
 
-            if self.rpc:
-                self.update_rpc_menu()
+            self.prepare_runtime(selected_version_id)
+            self.update_rpc_menu()
             
-            self.home_page.update_mods_count()
-            self.home_page.update_worlds_count()
-            self.home_page.update_resource_packs_count()
-            self.home_page.update_shader_packs_count()
+            self.home_page.update_content_counts()
 
     def open_minecraft_folder(self):
         mc_dir = self.get_current_game_directory()
@@ -570,6 +578,14 @@ class MaZultLauncher(QWidget):
         self.mc_process = None
         self.minecraft_thread = None
         self.download_thread = None
+        self.version_list_thread = None
+        self.runtime_prepare_thread = None
+        self.java_select_thread = None
+        self._pending_launch = None
+        self.token_refresh_thread = None
+        self._after_token_refresh = []
+        self._token_refresh_attempted = False
+        self._reload_versions_pending = False
         self.update_info = update_info
         self.users = []
         self.temp_width = 0
@@ -587,7 +603,9 @@ class MaZultLauncher(QWidget):
         if load_settings().get("dev_console", False):
             self.dev_console.show()
 
-        self.rpc = None
+        self.rpc = DiscordRPC()
+        QApplication.instance().aboutToQuit.connect(self.rpc.close)
+        QApplication.instance().aboutToQuit.connect(flush_settings)
         self.setWindowTitle(self.tr.get("launcher_title", "MaZult Launcher"))
         self.setWindowIcon(QIcon(str(self.icon_path)))
         self.setMinimumSize(1024, 600)
@@ -633,17 +651,41 @@ class MaZultLauncher(QWidget):
         self.home_page.instant_launch_checkbox.setChecked(settings.get("skip_version_check", False))
         self.notification_toast = self.settings_page.notification_toast
 
-        self.home_page.update_mods_count()
-        self.home_page.update_worlds_count()
-        self.home_page.update_resource_packs_count()
-        self.home_page.update_shader_packs_count()
+        self.token_refresh_timer = QTimer(self)
+        self.token_refresh_timer.setInterval(15 * 60 * 1000)
+        self.token_refresh_timer.timeout.connect(self.refresh_microsoft_tokens)
+        self.token_refresh_timer.start()
+        self.refresh_microsoft_tokens()
+
+    def refresh_microsoft_tokens(self, on_done=None):
+        if on_done:
+            self._after_token_refresh.append(on_done)
+        if self.token_refresh_thread and self.token_refresh_thread.isRunning():
+            return
+        if not any(needs_refresh(acc) for acc in load_accounts()):
+            self.on_token_refresh_finished(0)
+            return
+        self.token_refresh_thread = TokenRefreshThread(parent=self)
+        self.token_refresh_thread.finished_signal.connect(self.on_token_refresh_finished)
+        self.token_refresh_thread.start()
+
+    def on_token_refresh_finished(self, refreshed):
+        callbacks, self._after_token_refresh = self._after_token_refresh, []
+        for callback in callbacks:
+            callback()
+
+    def get_selected_account(self):
+        username = self.home_page.username_combo.currentText()
+        for acc in load_accounts():
+            prefix = "(microsoft)" if acc.get("type") == "microsoft" else "(offline)"
+            if f"{prefix} {acc.get('name')}" == username:
+                return acc
+        return None
 
     def reload_game_directory_dependent_data(self):
         self.load_versions()
         self.instance_page.load_instance_list()
-        self.home_page.update_mods_count()
-        self.home_page.update_worlds_count()
-        self.home_page.update_resource_packs_count()
+        self.home_page.update_content_counts()
 
     def create_global_progress_widget(self):
         progress_widget = QWidget(self.main_window)
@@ -663,6 +705,21 @@ class MaZultLauncher(QWidget):
         progress_widget.hide()
         return progress_widget
 
+    def is_installing(self):
+        """True while a version download or a modloader install may be writing to the game directory."""
+        try:
+            if self.download_thread is not None and self.download_thread.isRunning():
+                return True
+        except RuntimeError:
+            # The finished thread was already deleted by deleteLater.
+            pass
+        install_thread = getattr(self.modloader_page, "install_thread", None)
+        return bool(install_thread and install_thread.isRunning())
+
+    def is_game_running(self):
+        """True while a launched Minecraft process may be using a Java runtime."""
+        return bool(self.minecraft_thread and self.minecraft_thread.isRunning())
+
     def set_global_installing_state(self, installing, status_text=""):
         self.home_page.play_button.setEnabled(not installing)
         if self.modloader_install_page:
@@ -729,75 +786,45 @@ class MaZultLauncher(QWidget):
         QApplication.quit()
 
     def reconnect_rpc(self):
-        if self.rpc:
-            try:
-                self.rpc.close()
-            except Exception as e:
-                print(f"Error while closing Discord RPC: {e}")
-        self.rpc = None
         self.connect_rpc()
+        self.update_rpc_menu()
 
     def connect_rpc(self):
-        settings = load_settings()
-        if not settings.get("discord_rpc", True):
-            self.rpc = None
-            return
-
-        try:
-            self.rpc = Presence(DISCORD_CLIENT_ID)
-            self.rpc.connect()
-            self.update_rpc_menu()
-        except InvalidID:
-            print("Invalid Client ID for Discord RPC. Please check your settings.")
-            self.rpc = None
-        except Exception as e:
-            print(f"Failed to connect to Discord RPC: {e}")
-            self.rpc = None
-
-    def update_rpc_menu(self):
-        if self.rpc:
-            try:
-                selected_version = self.home_page.version_combo.currentText().replace("(Installed) ", "")
-                self.rpc.update(
-                    details=self.tr.get("rpc_status_menu", "In the menu"),
-                    large_image="mzlauncher",
-                    large_text="MaZult Launcher", 
-                    small_image="nothing",
-                    small_text="MaZult Launcher",
-                    start=int(time.time())
-                )
-            except PipeClosed:
-                self.connect_rpc()
+        self.rpc.set_enabled(load_settings().get("discord_rpc", True))
+
+    def update_rpc_menu(self, transition=False):
+        self.rpc.set_presence(
+            transition=transition,
+            details=self.tr.get("rpc_status_menu", "In the menu"),
+            large_image="mzlauncher",
+            large_text="MaZult Launcher", 
+            small_image="nothing",
+            small_text="MaZult Launcher",
+            start=int(time.time())
+        )
 
     def update_rpc_downloading(self, version_id):
-        if self.rpc:
-            try:
-                self.rpc.update(
-                    state=self.tr.get("rpc_status_launching_version", "Launching Minecraft {version_id}").format(version_id=version_id),
-                    details=self.tr.get("launching", "Launching..."),
-                    large_image="mzlauncher",
-                    large_text="MaZult Launcher",
-                    small_image="nothing",
-                    small_text="MaZult Launcher",
-                    start=int(time.time())
-                )
-            except PipeClosed:
-                self.connect_rpc()
+        self.rpc.set_presence(
+            state=self.tr.get("rpc_status_launching_version", "Launching Minecraft {version_id}").format(version_id=version_id),
+            details=self.tr.get("launching", "Launching..."),
+            large_image="mzlauncher",
+            large_text="MaZult Launcher",
+            small_image="nothing",
+            small_text="MaZult Launcher",
+            start=int(time.time())
+        )
 
     def update_rpc_game(self, version_id):
-        if self.rpc:
-            try:
-                self.rpc.update(
-                    state=self.tr.get("rpc_status_playing_version", "Playing Minecraft {version_id}").format(version_id=version_id),
-                    details=self.tr.get("rpc_status_ingame", "In game"),
-                    large_image="mzlauncher",
-                    large_text=f"Minecraft {version_id}",
-                    small_image="logo",
-                    small_text="MaZult Launcher",
-                    start=int(time.time())
-                )
-            except PipeClosed:
-                self.connect_rpc()
+        self.rpc.set_presence(
+            transition=True,
+            state=self.tr.get("rpc_status_playing_version", "Playing Minecraft {version_id}").format(version_id=version_id),
+            details=self.tr.get("rpc_status_ingame", "In game"),
+            large_image="mzlauncher",
+            large_text=f"Minecraft {version_id}",
+            small_image="logo",
+            small_text="MaZult Launcher",
+            start=int(time.time())
+        )
 
 
     def on_update_clicked(self):
@@ -834,103 +861,48 @@ class MaZultLauncher(QWidget):
                 self.show()
                 if self.temp_width > self.minimumWidth() and self.temp_height > self.minimumHeight():
                     self.resize(self.temp_width, self.temp_height)
-            self.update_rpc_menu()
+            self.update_rpc_menu(transition=True)
 
-    def on_minecraft_log(self, text):
-        self.dev_console.write(text)
+    def on_minecraft_log(self, lines):
+        self.dev_console.append_lines(lines)
 
     def load_versions(self):
-        self.home_page.version_combo.clear()
-        
-        settings = load_settings()
-        current_version = settings.get("version_id")
-        
-        filters = settings.get("filters", {})
-        show_installed = filters.get("installed", True)
-        
-        installed_versions = get_installed_versions()
-        installed_versions_set = set(installed_versions)
-        
-        available_versions, latest_release_id = get_available_versions(filters)
-        
-        instances = load_instances()
-        instance_map = {f"instance-{inst['name']}": inst for inst in instances}
-
-        # Add instances to the version list
-        for instance_id, instance_data in instance_map.items():
-            self.home_page.version_combo.addItem(f"{instance_data['name']} ({instance_data['version']})", instance_id)
-
-        all_versions_data = {}
-
-        for label, version_id in available_versions:
-            all_versions_data[version_id] = {
-                "label": label,
-                "is_installed": version_id in installed_versions_set
-            }
-
-        if show_installed:
-            for version_id in installed_versions:
-                if version_id not in all_versions_data:
-                    all_versions_data[version_id] = {
-                        "label": version_id, 
-                        "is_installed": True
-                    }
-
-        def sort_key_packaging(v_id):
-            is_installed = all_versions_data[v_id].get("is_installed", False) and show_installed
-            return (is_installed, minecraft_version_key(v_id))
-        sorted_version_ids = sorted(all_versions_data.keys(), key=sort_key_packaging, reverse=True)
-
-        for version_id in sorted_version_ids:
-            data = all_versions_data[version_id]
-            display_label = data["label"]
-
-            if version_id == latest_release_id:
-                if data["is_installed"] and show_installed:
-                    self.home_page.version_combo.addItem(f"(Installed) Latest Release ({version_id})", version_id)
-                else:
-                    self.home_page.version_combo.addItem(f"Latest Release ({version_id})", version_id)
-
-                if data["is_installed"] and show_installed:
-                    self.home_page.version_combo.addItem(f"(Installed) Release - {version_id}", version_id)
-                else:
-                    self.home_page.version_combo.addItem(f"Release - {version_id}", version_id)
-                continue
+        if self.home_page.version_combo.count() == 0:
+            self.apply_version_list(collect_version_list(cached_only=True))
 
-            if data["is_installed"] and show_installed:
-                display_label = f"(Installed) {display_label}"
-            
-            self.home_page.version_combo.addItem(display_label, version_id)
-        
-        if current_version:
-            matching_indexes = []
-            for i in range(self.home_page.version_combo.count()):
-                if self.home_page.version_combo.itemData(i) == current_version:
-                    label = self.home_page.version_combo.itemText(i)
-                    matching_indexes.append((i, label))
-
-            if matching_indexes:
-                preferred_index = None
-                for idx, label in matching_indexes:
-                    if "Release -" in label and "Latest" not in label:
-                        preferred_index = idx
-                        break
-                if preferred_index is None:
-                    preferred_index = matching_indexes[0][0]
-
-                self.home_page.version_combo.setCurrentIndex(preferred_index)
-            else:
-                if latest_release_id:
-                    index = self.home_page.version_combo.findData(latest_release_id)
-                    if index != -1:
-                        self.home_page.version_combo.setCurrentIndex(index)
+        if self.version_list_thread and self.version_list_thread.isRunning():
+            self._reload_versions_pending = True
+            return
+        self._reload_versions_pending = False
+        self.version_list_thread = VersionListThread(self)
+        self.version_list_thread.loaded.connect(self.apply_version_list)
+        self.version_list_thread.finished.connect(self.on_version_list_thread_finished)
+        self.version_list_thread.finished.connect(self.version_list_thread.deleteLater)
+        self.version_list_thread.start()
+
+    def on_version_list_thread_finished(self):
+        self.version_list_thread = None
+        if self._reload_versions_pending:
+            self.load_versions()
+
+    def apply_version_list(self, version_list):
+        combo = self.home_page.version_combo
+        previous_data = combo.currentData()
+
+        model = QStandardItemModel(combo)
+        for label, data in version_list["entries"]:
+            item = QStandardItem(label)
+            item.setData(data, Qt.UserRole)
+            model.appendRow(item)
+
+        combo.blockSignals(True)
+        combo.setModel(model)
+        combo.setCurrentIndex(version_list["current_index"])
+        combo.blockSignals(False)
+
+        if combo.currentData() != previous_data:
+            self.on_version_changed(combo.currentIndex())
         else:
-            if latest_release_id:
-                index = self.home_page.version_combo.findData(latest_release_id)
-                if index != -1:
-                    self.home_page.version_combo.setCurrentIndex(index)
-        
-        if self.rpc:
             self.update_rpc_menu()
 
 
@@ -1181,6 +1153,11 @@ class MaZultLauncher(QWidget):
 
         self.update_rpc_menu()
 
+    def _resume_play_after_refresh(self):
+        # Put the play button back first, so any early return below leaves it usable.
+        self.reset_after_cancel()
+        self.on_play_clicked()
+
     def on_play_clicked(self):
         if self.minecraft_thread and self.minecraft_thread.isRunning():
             try:
@@ -1220,6 +1197,16 @@ class MaZultLauncher(QWidget):
             QMessageBox.warning(self, self.tr.get("no_version_selected", "No Version Selected"), self.tr.get("no_version_selected", "Please select a Minecraft version to play."))
             return
 
+        account = self.get_selected_account()
+        if account and needs_refresh(account) and not self._token_refresh_attempted:
+            # Launch once the token is fresh instead of refreshing on the GUI thread.
+            self._token_refresh_attempted = True
+            self.home_page.play_button.setText(self.tr.get("signing_in", "Signing in..."))
+            self.home_page.play_button.setEnabled(False)
+            self.refresh_microsoft_tokens(self._resume_play_after_refresh)
+            return
+        self._token_refresh_attempted = False
+
         is_instance = isinstance(selected_data, str) and selected_data.startswith("instance-")
         if is_instance:
             instance_name = selected_data.replace("instance-", "")
@@ -1245,7 +1232,9 @@ class MaZultLauncher(QWidget):
             return
 
         options = self.prepare_mc_options(is_instance, instance_info if is_instance else None)
-        if not options: return
+        if not options:
+            self.reset_after_cancel()
+            return
 
         self.go_home() # Ensure home page is visible
         self.global_progress_widget.show()
@@ -1318,24 +1307,13 @@ class MaZultLauncher(QWidget):
             options["gameDirectory"] = instance_info['path']
 
         if target_account.get("type") == "microsoft":
-            refresh_token = target_account.get("refresh_token")
-            if refresh_token:
-                try:
-                    new_account_info = msa.complete_refresh(CLIENT_ID, None, REDIRECT_URI, refresh_token)
-                    
-                    target_account["name"] = new_account_info["name"]
-                    target_account["uuid"] = new_account_info["id"]
-                    target_account["token"] = new_account_info["access_token"]
-                    target_account["refresh_token"] = new_account_info["refresh_token"]
-                    save_accounts(accounts)
-
-                except Exception as e:
-                    print(f"[Auth] Failed to refresh token: {e}")
-                    QMessageBox.warning(self, self.tr.get("login_expired_title", "Login Expired"), self.tr.get("login_expired_message", "Your Microsoft login has expired. Please log in again."))
-                    accounts.remove(target_account)
-                    save_accounts(accounts)
-                    self.update_username_combo()
-                    return None
+            # Tokens are refreshed in the background; only a token that is already expired blocks the launch.
+            if target_account.get("refresh_token") and token_expired(target_account):
+                print("[Auth] Microsoft token expired and could not be refreshed")
+                QMessageBox.warning(self, self.tr.get("login_expired_title", "Login Expired"), self.tr.get("login_expired_message", "Your Microsoft login has expired. Please log in again."))
+                update_accounts(lambda accounts: accounts.remove(target_account) if target_account in accounts else None)
+                self.update_username_combo()
+                return None
             
             options.update({
                 "username": clean_username,
@@ -1349,56 +1327,98 @@ class MaZultLauncher(QWidget):
             options.update({ "username": clean_username, "uuid": user_uuid, "token": "" })
             return options
 
+    def confirm_custom_java(self, found_major, java_version):
+        required = (java_version or {}).get("majorVersion")
+        if not required or not found_major or found_major >= required:
+            return True
+        reply = QMessageBox.question(self, self.tr.get("java_error_title", "Java Error"),
+                                     self.tr.get("custom_java_too_old", "The custom Java is Java {found}, but this version needs Java {required}.\nLaunch anyway?").format(found=found_major, required=required),
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        return reply == QMessageBox.Yes
+
+    def prepare_runtime(self, version_id):
+        if load_settings().get("java_mode", "default") == "custom":
+            return
+        if version_id.startswith("instance-"):
+            instance = next((inst for inst in load_instances() if f"instance-{inst['name']}" == version_id), None)
+            version_id = instance["version"] if instance else None
+        if not version_id or (self.runtime_prepare_thread and self.runtime_prepare_thread.isRunning()):
+            return
+        self.runtime_prepare_thread = RuntimePrepareThread(get_minecraft_directory(), version_id, self)
+        self.runtime_prepare_thread.start()
+
     def _start_minecraft_process(self, version_id, options, settings):
-        
+        # The launcher may be hidden or killed while the game runs; write pending settings now.
+        flush_settings()
+        java_mode = settings.get("java_mode", "default")
+        java_path = settings.get("java_path", "")
+        if java_mode == "custom" and not (java_path and os.path.isdir(java_path)):
+            QMessageBox.critical(self, self.tr.get("java_error_title", "Java Error"), 
+                                 self.tr.get("custom_java_path_invalid_error", "Custom Java path is selected but the path is invalid or empty."))
+            self.reset_after_cancel()
+            return
+
+        self.home_page.play_button.setText(self.tr.get("launching", "Launching..."))
+        self.home_page.play_button.setEnabled(False)
+        self.home_page.play_button.setStyleSheet(self.load_styles())
+
+        # Finding the JVM may scan the machine or run `java -version`; keep that off the GUI thread.
+        self._pending_launch = (version_id, options, settings)
+        self.java_select_thread = JavaSelectThread(get_minecraft_directory(), version_id, java_mode, java_path, self)
+        self.java_select_thread.finished_signal.connect(self.on_java_selected)
+        self.java_select_thread.finished.connect(self.java_select_thread.deleteLater)
+        self.java_select_thread.start()
+
+    def on_java_selected(self, java):
+        self.java_select_thread = None
+        if self._pending_launch is None:
+            return
+        version_id, options, settings = self._pending_launch
+        self._pending_launch = None
         try:
-            java_mode = settings.get("java_mode", "default")
-            java_path = settings.get("java_path", "")
-
-            if java_mode == "custom":
-                if java_path and os.path.isdir(java_path):
-                    custom_java = find_java_executable(java_path)
-                    if custom_java:
-                        options["executablePath"] = custom_java
-                    else:
-                        QMessageBox.critical(self,
-                            self.tr.get("java_error_title", "Java Error"),
-                            self.tr.get("no_valid_java_in_folder_error", 
-                                "No valid Java executable found in this folder.\n"
-                                "Please check the directory.\n\n"
-                                "Supported formats:\n"
-                                "- Windows: java.exe / javaw.exe\n"
-                                "- Linux/macOS: java")
-                        )
+            if settings.get("java_mode", "default") == "custom":
+                if java["executable"]:
+                    if not self.confirm_custom_java(java["major"], java["java_version"]):
                         self.reset_after_cancel()
                         return
+                    options["executablePath"] = java["executable"]
                 else:
-                    QMessageBox.critical(self, self.tr.get("java_error_title", "Java Error"), 
-                                         self.tr.get("custom_java_path_invalid_error", "Custom Java path is selected but the path is invalid or empty."))
+                    QMessageBox.critical(self,
+                        self.tr.get("java_error_title", "Java Error"),
+                        self.tr.get("no_valid_java_in_folder_error", 
+                            "No valid Java executable found in this folder.\n"
+                            "Please check the directory.\n\n"
+                            "Supported formats:\n"
+                            "- Windows: java.exe / javaw.exe\n"
+                            "- Linux/macOS: java")
+                    )
                     self.reset_after_cancel()
                     return
+            elif java["executable"]:
+                print(f"[Java] Using {java['executable']} for {version_id}")
+                options["executablePath"] = java["executable"]
 
-            command = minecraft_launcher_lib.command.get_minecraft_command(
+            command = get_command_cache().get_command(
                 version_id,
                 get_minecraft_directory(),
                 options
             )
+            appcds = None
+            if settings.get("appcds", False):
+                appcds = AppCDS(version_id, command, java_major=java["major"] if java["executable"] else None)
+                command = appcds.apply(command)
             print(f"[Launcher] Running command: {' '.join(command)}")
             self.update_rpc_game(version_id)
 
-            self.home_page.play_button.setText(self.tr.get("launching", "Launching..."))
-            self.home_page.play_button.setEnabled(False)
-            self.home_page.play_button.setStyleSheet(self.load_styles())
-
             hide_on_launch = settings.get("hide_on_launch", True)
             if hide_on_launch:
                 self.hide()
                 self.temp_width = self.width()
                 self.temp_height = self.height()
 
-            self.minecraft_thread = MinecraftThread(command, get_minecraft_directory(), self)
+            self.minecraft_thread = MinecraftThread(command, get_minecraft_directory(), self, appcds=appcds)
             self.minecraft_thread.finished_signal.connect(self.on_minecraft_finished)
-            self.minecraft_thread.log_signal.connect(self.on_minecraft_log)
+            self.minecraft_thread.log_batch.connect(self.on_minecraft_log)
             self.minecraft_thread.crash_detected.connect(self.show_crash_dialog)
             self.dev_console.set_kill_button_enabled(True)
             self.minecraft_thread.start()
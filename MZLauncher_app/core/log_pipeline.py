@@ -0,0 +1,80 @@
+import logging
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from MZLauncher_app.core.utils import get_appdata_path
+
+TAIL_SIZE = 5000
+FLUSH_INTERVAL_MS = 100
+CONSOLE_MAX_BLOCKS = 5000
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+
+def get_game_log_path():
+    log_dir = get_appdata_path() / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return log_dir / "game.log"
+
+
+class LogPipeline(QObject):
+    """Collects lines from any thread and hands them to the GUI in batches.
+
+    At most `capacity` lines are buffered between flushes, and at most one
+    batch_ready is emitted per `interval` milliseconds. If a log path is
+    given, every line is also streamed to a rotating file.
+    """
+    batch_ready = Signal(list)
+    _wakeup = Signal()
+
+    def __init__(self, log_path=None, capacity=TAIL_SIZE, interval=FLUSH_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self._pending = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush)
+        self._wakeup.connect(self._schedule_flush)
+
+        self._handler = None
+        self._logger = None
+        if log_path:
+            try:
+                self._handler = RotatingFileHandler(log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+                self._handler.setFormatter(logging.Formatter("%(message)s"))
+                self._logger = logging.Logger(f"mazult.log.{id(self)}")
+                self._logger.addHandler(self._handler)
+            except OSError as e:
+                print(f"[Log] Could not open {log_path}: {e}")
+
+    def push(self, line):
+        with self._lock:
+            was_empty = not self._pending
+            self._pending.append(line)
+        if self._logger:
+            self._logger.info(line)
+        if was_empty:
+            self._wakeup.emit()
+
+    def _schedule_flush(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        if batch:
+            self.batch_ready.emit(batch)
+
+    def close(self):
+        if self._handler:
+            self._handler.close()
+            self._logger.removeHandler(self._handler)
+            self._handler = None
+            self._logger = None
@@ -10,15 +10,71 @@ from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QProgressBar, QMessageBox
 )
 from PySide6.QtGui import QFont, QPainter, QColor
-from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtCore import Qt, QObject, QThread, Signal
 
-from MZLauncher_app.core.launcher_core import MaZultLauncher, parse_launcher_args
+from MZLauncher_app.core.bootstrap import parse_launcher_args
+from MZLauncher_app.core.startup_trace import trace_phase, trace_mark, write_startup_report, elapsed_since_start
 from MZLauncher_app.core.utils import load_language, get_appdata_path, get_tmp_dir
+from MZLauncher_app.core.http_cache import get_version_manifest
+from MZLauncher_app.core.java_registry import get_java_registry
 from MZLauncher_app.core.updater import (
     UpdateCheckThread, is_admin, relaunch_as_admin, download_update_with_progress,
     apply_update, cleanup_update, get_launcher_root
 )
 
+class StartupTaskThread(QThread):
+    """Runs one independent startup job in the background."""
+    done = Signal(str)
+
+    def __init__(self, name, func, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.func = func
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            self.func()
+        except Exception as e:
+            print(f"[Startup] {self.name} failed: {e}")
+        print(f"[Startup] {self.name} finished in {(time.perf_counter() - start) * 1000:.0f} ms")
+        trace_mark(f"{self.name} done")
+        self.done.emit(self.name)
+
+
+class StartupPipeline(QObject):
+    """Runs the startup jobs side by side and signals once the window can be shown.
+
+    Background tasks never hold the splash; only the gates (the main window
+    and the update check) do, and `ready` fires as soon as the last one passes.
+    """
+    ready = Signal()
+
+    def __init__(self, gates, parent=None):
+        super().__init__(parent)
+        self.pending = set(gates)
+        self.threads = []
+        self.is_ready = False
+
+    def run_task(self, name, func):
+        thread = StartupTaskThread(name, func, self)
+        self.threads.append(thread)
+        thread.start()
+
+    def complete(self, gate):
+        if gate not in self.pending:
+            return
+        self.pending.discard(gate)
+        trace_mark(f"{gate} ready")
+        if not self.pending and not self.is_ready:
+            self.is_ready = True
+            self.ready.emit()
+
+    def wait(self, timeout_ms=3000):
+        for thread in self.threads:
+            thread.wait(timeout_ms)
+
+
 class Splash(QWidget):
     finished = Signal()
 
@@ -164,12 +220,14 @@ def main():
 
     sys.excepthook = global_exception_hook
 
-    app = QApplication(sys.argv)
+    with trace_phase("QApplication"):
+        app = QApplication(sys.argv)
 
-    tr = load_language()
+    with trace_phase("splash"):
+        tr = load_language()
 
-    splash = Splash()
-    splash.set_translator(tr)
+        splash = Splash()
+        splash.set_translator(tr)
 
     appdata_path = get_appdata_path()
     os.makedirs(appdata_path, exist_ok=True)
@@ -197,8 +255,15 @@ def main():
         else:
             print("No updater found, run default app")
 
-    main_window = MaZultLauncher()
-    main_window.hide()
+    splash.show()
+    splash.set_progress(0, tr.get("splash_loading_config", "Loading configuration..."), indeterminate=True)
+    trace_mark("splash visible")
+
+    # Everything that does not need the main window starts right away and runs
+    # while launcher_core is imported and the window is built.
+    pipeline = StartupPipeline(("update_check", "main_window"))
+    app.startup_pipeline = pipeline
+    app.aboutToQuit.connect(pipeline.wait)
 
     def open_main_window():
         if not main_window.isVisible():
@@ -209,8 +274,12 @@ def main():
             main_window.main_window.start_entrance_animation()
             main_window.home_page.start_entrance_animation()
             app.main_window = main_window
+            print(f"[Startup] Time to interactive: {elapsed_since_start() * 1000:.0f} ms")
+            trace_mark("main window shown")
+            write_startup_report()
 
-    splash.finished.connect(open_main_window)
+    pipeline.ready.connect(open_main_window)
+    splash.finished.connect(lambda: pipeline.complete("update_check"))
 
     def on_update_available(version, url):
         if is_windows and not is_admin():
@@ -221,42 +290,33 @@ def main():
         start_update_process(splash)
 
     def on_up_to_date():
-        splash.set_progress(0, tr.get("updater_up_to_date", "Launcher is up to date."), indeterminate=True)
-        
-        def finish_loading():
-            splash.set_progress(0, tr.get("splash_preparing_launcher", "Preparing launcher..."), indeterminate=True)
-            QTimer.singleShot(800, lambda: splash.set_progress(100, tr.get("splash_preparing_launcher", "Preparing launcher..."), indeterminate=False))
-        
-        QTimer.singleShot(1200, finish_loading)
+        pipeline.complete("update_check")
 
     def on_error(message):
-        splash.set_progress(0, tr.get("updater_failed", "Update check failed."), indeterminate=True)
-        QTimer.singleShot(1500, lambda: splash.set_progress(100, tr.get("splash_starting_anyway", "Starting launcher..."), indeterminate=False))
-
-    splash.show()
-    splash.set_progress(0, tr.get("splash_loading_config", "Loading configuration..."), indeterminate=True)
-    QApplication.processEvents()
-
-    try:
-        from MZLauncher_app.core.bootstrap import preload_modules
-        splash.set_progress(0, tr.get("splash_init_modules", "Initializing modules..."), indeterminate=True)
-        QApplication.processEvents()
-        preload_modules()
-        splash.set_progress(0, tr.get("splash_preparing_launcher", "Preparing launcher..."), indeterminate=True)
-        QApplication.processEvents()
-    except Exception as e:
-        print(f"[BOOTSTRAP] Failed to preload modules: {e}")
-        splash.set_progress(0, tr.get("splash_starting_anyway", "Starting launcher..."), indeterminate=True)
-        QApplication.processEvents()
-
-    splash.set_progress(0, tr.get("updater_checking", "Checking for updates..."), indeterminate=True)
+        print(f"[UPDATER] {message}")
+        pipeline.complete("update_check")
 
     update_thread = UpdateCheckThread(launcher_args["updater_ver"])
     update_thread.update_available.connect(on_update_available)
     update_thread.up_to_date.connect(on_up_to_date)
     update_thread.error_occurred.connect(on_error)
     update_thread.start()
-
     app.update_thread = update_thread
 
+    pipeline.run_task("version manifest", get_version_manifest)
+    pipeline.run_task("java detection", lambda: get_java_registry().refresh())
+
+    splash.set_progress(0, tr.get("splash_init_modules", "Initializing modules..."), indeterminate=True)
+    with trace_phase("import launcher_core"):
+        from MZLauncher_app.core.launcher_core import MaZultLauncher
+
+    splash.set_progress(0, tr.get("splash_preparing_launcher", "Preparing launcher..."), indeterminate=True)
+    with trace_phase("build main window"):
+        main_window = MaZultLauncher()
+        main_window.hide()
+
+    if "update_check" in pipeline.pending:
+        splash.set_progress(0, tr.get("updater_checking", "Checking for updates..."), indeterminate=True)
+    pipeline.complete("main_window")
+
     sys.exit(app.exec())
\ No newline at end of file
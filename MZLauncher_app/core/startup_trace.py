@@ -0,0 +1,149 @@
+import os
+import sys
+import time
+import threading
+import importlib.abc
+import importlib.util
+from contextlib import contextmanager
+
+# Set MZ_STARTUP_TRACE=1 or pass --trace-startup to write logs/startup-trace.txt.
+TRACE_ENV = "MZ_STARTUP_TRACE"
+TRACE_FLAG = "--trace-startup"
+REPORT_TOP_IMPORTS = 40
+
+_started_at = time.perf_counter()
+_enabled = False
+_phases = []
+_marks = []
+_imports = {}
+_import_stack = threading.local()
+_finder = None
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path hook that times exec_module of every module imported while tracing."""
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        # Builtin and frozen importers are classes shared by every module; leave them alone.
+        if loader is not None and not isinstance(loader, type) and not getattr(loader, "_mz_timed", False):
+            try:
+                loader.exec_module = _timed_exec(loader.exec_module)
+                loader._mz_timed = True
+            except (AttributeError, TypeError):
+                pass
+        return spec
+
+
+def _timed_exec(exec_module):
+    def wrapper(module):
+        stack = getattr(_import_stack, "frames", None)
+        if stack is None:
+            stack = _import_stack.frames = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            total, own = _imports.get(module.__name__, (0.0, 0.0))
+            _imports[module.__name__] = (total + elapsed, own + elapsed - children)
+    return wrapper
+
+
+def is_enabled():
+    return _enabled
+
+
+def elapsed_since_start():
+    """Seconds since the launcher process started importing its modules."""
+    return time.perf_counter() - _started_at
+
+
+def start_startup_trace(argv=None):
+    """Enable tracing if requested by the environment or command line."""
+    global _enabled, _finder
+    argv = sys.argv if argv is None else argv
+    if _enabled or not (os.environ.get(TRACE_ENV) or TRACE_FLAG in argv):
+        return False
+    _enabled = True
+    _finder = _ImportTimer()
+    sys.meta_path.insert(0, _finder)
+    print("[Startup] Tracing enabled")
+    return True
+
+
+@contextmanager
+def trace_phase(name):
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, start - _started_at, time.perf_counter() - start))
+
+
+def trace_mark(name):
+    if _enabled:
+        _marks.append((name, time.perf_counter() - _started_at))
+
+
+def write_startup_report():
+    """Write the collected phases and import times and stop tracing; returns the report path."""
+    global _enabled
+    if not _enabled:
+        return None
+    _enabled = False
+    if _finder in sys.meta_path:
+        sys.meta_path.remove(_finder)
+
+    from MZLauncher_app.core.utils import get_appdata_path
+    lines = [f"Startup trace ({time.strftime('%Y-%m-%d %H:%M:%S')})", "", "Phases (start, duration):"]
+    for name, start, duration in _phases:
+        lines.append(f"  {start * 1000:8.1f} ms  {duration * 1000:8.1f} ms  {name}")
+    lines += ["", "Marks:"]
+    for name, at in _marks:
+        lines.append(f"  {at * 1000:8.1f} ms  {name}")
+    lines += ["", f"Imports: {len(_imports)} modules, top {REPORT_TOP_IMPORTS} by cumulative time (cumulative, self):"]
+    for name, (total, own) in sorted(_imports.items(), key=lambda item: item[1][0], reverse=True)[:REPORT_TOP_IMPORTS]:
+        lines.append(f"  {total * 1000:8.1f} ms  {own * 1000:8.1f} ms  {name}")
+
+    report_path = get_appdata_path() / "logs" / "startup-trace.txt"
+    try:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    except OSError as e:
+        print(f"[Startup] Could not write the startup trace: {e}")
+        return None
+    print(f"[Startup] Trace written to {report_path}")
+    return report_path
+
+
+def lazy_import(name):
+    """Return module `name`, deferring its execution until an attribute is first used."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
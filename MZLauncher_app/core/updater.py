@@ -1,6 +1,7 @@
 import sys
 import os
 import shutil
+import hashlib
 import zipfile
 import requests
 import ctypes
@@ -8,6 +9,8 @@ from pathlib import Path
 from PySide6.QtCore import QThread, Signal
 from packaging.version import Version
 
+from MZLauncher_app.download.download import download_file
+
 GITHUB_API_URL = "https://api.github.com/repos/LunarMoonDLCT/MZassets/releases/latest"
 
 def get_launcher_root():
@@ -44,13 +47,12 @@ def relaunch_as_admin(extra_args=None):
     )
     sys.exit(0)
 
-def get_latest_updater_info():
+def get_latest_updater_asset():
     r = requests.get(GITHUB_API_URL, timeout=10)
     r.raise_for_status()
     data = r.json()
 
     latest_ver = data["tag_name"].lstrip("v")
-    zip_url = None
 
     if sys.platform.startswith("win32"):
         os_specific_suffix = "-Win.zip"
@@ -59,13 +61,13 @@ def get_latest_updater_info():
 
     for asset in data.get("assets", []):
         if asset.get("name", "").endswith(os_specific_suffix):
-            zip_url = asset["browser_download_url"]
-            break
+            return latest_ver, asset
 
-    if not zip_url:
-        raise RuntimeError("No updater zip file found in the latest release.")
+    raise RuntimeError("No updater zip file found in the latest release.")
 
-    return latest_ver, zip_url
+def get_latest_updater_info():
+    latest_ver, asset = get_latest_updater_asset()
+    return latest_ver, asset["browser_download_url"]
 
 class UpdateCheckThread(QThread):
     update_available = Signal(str, str)
@@ -99,36 +101,51 @@ class UpdateCheckThread(QThread):
             print(f"[UPDATER] Update check/process failed: {e}")
             self.error_occurred.emit(f"Update check failed: {e}")
 
+def file_sha256(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
 def download_update_with_progress(dest_dir, splash):
-    _, url = get_latest_updater_info()
+    latest_ver, asset = get_latest_updater_asset()
+    url = asset["browser_download_url"]
 
     base_dir = get_launcher_root()
     temp_dir = base_dir / "temp_update"
     temp_dir.mkdir(exist_ok=True)
 
-    zip_path = temp_dir / "update.zip"
+    # Named per release so a .part left by an older release is never resumed against a newer one.
+    zip_path = temp_dir / f"update-{latest_ver}-{asset.get('id', 0)}.zip"
+    for item in temp_dir.iterdir():
+        if (item.is_file() and item.name.startswith("update") and item.name.endswith((".zip", ".zip.part"))
+                and item.name not in (zip_path.name, zip_path.name + ".part")):
+            print(f"[UPDATER] Removing stale download {item.name}")
+            item.unlink(missing_ok=True)
 
     splash.set_progress(1, splash.tr.get("updater_connecting", "Connecting to update server..."))
 
-    r = requests.get(url, stream=True, timeout=30)
-    r.raise_for_status()
+    last_percent = [-1]
 
-    total = int(r.headers.get("Content-Length", 0))
-    downloaded = 0
+    def on_progress(delta, downloaded, total):
+        if total > 0:
+            percent = int(downloaded * 100 / total)
+            if percent == last_percent[0]:
+                return
+            last_percent[0] = percent
+            splash.set_progress(
+                min(percent, 90),
+                splash.tr.get("updater_downloading", "Downloading update... {percent}%").format(percent=percent)
+            )
 
-    with open(zip_path, "wb") as f:
-        for chunk in r.iter_content(chunk_size=8192):
-            if not chunk:
-                continue
-            f.write(chunk)
-            downloaded += len(chunk)
+    download_file(url, zip_path, size=asset.get("size"), on_progress=on_progress)
 
-            if total > 0:
-                percent = int(downloaded * 100 / total)
-                splash.set_progress(
-                    min(percent, 90),
-                    splash.tr.get("updater_downloading", "Downloading update... {percent}%").format(percent=percent)
-                )
+    # GitHub publishes "sha256:<hex>" for release assets; older releases have no digest.
+    digest = asset.get("digest") or ""
+    if digest.startswith("sha256:") and file_sha256(zip_path) != digest.split(":", 1)[1].lower():
+        zip_path.unlink(missing_ok=True)
+        raise RuntimeError("The downloaded update does not match its published checksum.")
 
     return zip_path
 
@@ -157,7 +174,7 @@ def apply_update(zip_path, splash: 'Splash'):
     splash.set_progress(96, splash.tr.get("updater_installing", "Copying new files..."))
 
     for item in temp_dir.iterdir():
-        if item.is_file() and item.name.lower() == "update.zip":
+        if item.is_file() and item.name in (zip_path.name, zip_path.name + ".part"):
             continue
         dest = base_dir / item.name
         if item.is_dir():
@@ -1,14 +1,13 @@
 import os
 import sys
 import json
-import datetime
 from pathlib import Path
 import uuid
 
-import minecraft_launcher_lib
 from packaging.version import Version, InvalidVersion
 
 from MZLauncher_app.settings.settings import get_minecraft_directory
+from MZLauncher_app.core.http_cache import get_version_manifest
 
 
 def get_appdata_path():
@@ -110,17 +109,15 @@ def Launcher_profiles_json(mc_dir):
         except Exception:
             pass
 
-VERSION_FILE = get_appdata_path() / "versions.json"
-
 def minecraft_version_key(version_string: str):
     try:
         return Version(version_string)
     except InvalidVersion:
         return Version("0.0.0-alpha")
 
-def get_installed_versions():
+def get_installed_versions(minecraft_directory=None):
     installed_versions = []
-    versions_dir = get_minecraft_directory() / "versions"
+    versions_dir = Path(minecraft_directory or get_minecraft_directory()) / "versions"
     if os.path.exists(versions_dir):
         for folder_name in os.listdir(versions_dir):
             if os.path.isdir(os.path.join(versions_dir, folder_name)) and \
@@ -129,39 +126,13 @@ def get_installed_versions():
 
     return sorted(installed_versions, key=minecraft_version_key, reverse=True)
 
-def get_available_versions(filters, offline=False):
-    versions = []
-    latest_release_id = None
-    try:
-        if offline:
-            raise Exception("Forced offline")
-        mc_versions = minecraft_launcher_lib.utils.get_version_list()
-        serializable_versions = []
-
-        for v in mc_versions:
-            if v.get('type') == 'release' and latest_release_id is None:
-                latest_release_id = v['id']
-            if isinstance(v.get('releaseTime'), datetime.datetime):
-                v['releaseTime'] = v['releaseTime'].isoformat()
-            serializable_versions.append(v)
-
-        with open(VERSION_FILE, "w") as f:
-            json.dump(serializable_versions, f)
-
-    except Exception as e:
-        print("Offline or error fetching versions:", e)
-        if os.path.exists(VERSION_FILE):
-            try:
-                with open(VERSION_FILE, "r") as f:
-                    mc_versions = json.load(f)
-
-                for v in mc_versions:
-                    if v.get('type') == 'release' and latest_release_id is None:
-                        latest_release_id = v['id']
-            except Exception:
-                return [("Offline: No cached versions", "")], None
-        else:
-            return [("Offline: No cached versions", "")], None
+def get_available_versions(filters, offline=False, cached_only=False):
+    manifest = get_version_manifest(cached_only=offline or cached_only)
+    if not manifest:
+        return [("Offline: No cached versions", "")], None
+
+    mc_versions = manifest.get('versions', [])
+    latest_release_id = manifest.get('latest', {}).get('release')
 
     filtered_versions = []
     version_types = {
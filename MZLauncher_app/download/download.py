@@ -2,12 +2,495 @@ import os
 import shutil
 import subprocess
 import sys
+import json
+import time
+import hashlib
+import zipfile
+import platform
+import threading
 import requests
-import minecraft_launcher_lib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 from PySide6.QtCore import QThread, Signal
 
-from MZLauncher_app.settings.settings import get_appdata_path, get_minecraft_directory
+from MZLauncher_app.settings.settings import get_appdata_path, get_minecraft_directory, load_settings
+from MZLauncher_app.download.hash_index import HashIndex
+from MZLauncher_app.download.shared_store import SharedStore, register_directory
+from MZLauncher_app.core.http_cache import get_version_manifest
+from MZLauncher_app.core.java_registry import select_java, install_runtime
+
+ASSET_BASE_URL = 'https://resources.download.minecraft.net'
+LIBRARY_BASE_URL = 'https://libraries.minecraft.net'
+MAX_WORKERS = 16
+MAX_ATTEMPTS = 3
+CHUNK_SIZE = 64 * 1024
+PROGRESS_INTERVAL = 0.1
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+def get_os_name():
+    if sys.platform.startswith('win32'):
+        return 'windows'
+    elif sys.platform.startswith('darwin'):
+        return 'osx'
+    return 'linux'
+
+
+def get_arch_bits():
+    return '64' if sys.maxsize > 2 ** 32 else '32'
+
+
+def rules_allow(rules):
+    if not rules:
+        return True
+
+    allowed = False
+    machine = platform.machine().lower()
+    for rule in rules:
+        if 'features' in rule:
+            continue
+        os_rule = rule.get('os', {})
+        if 'name' in os_rule and os_rule['name'] != get_os_name():
+            continue
+        if 'arch' in os_rule and os_rule['arch'] == 'x86' and machine not in ('x86', 'i386', 'i686'):
+            continue
+        allowed = rule.get('action') == 'allow'
+    return allowed
+
+
+def maven_path(name):
+    ext = 'jar'
+    if '@' in name:
+        name, ext = name.split('@', 1)
+    parts = name.split(':')
+    group, artifact, version = parts[0], parts[1], parts[2]
+    classifier = f'-{parts[3]}' if len(parts) > 3 else ''
+    return f"{group.replace('.', '/')}/{artifact}/{version}/{artifact}-{version}{classifier}.{ext}"
+
+
+def merge_version_json(child, parent):
+    merged = dict(parent)
+    for key, value in child.items():
+        if isinstance(value, list) and isinstance(merged.get(key), list):
+            merged[key] = value + merged[key]
+        elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+            section = dict(merged[key])
+            for sub_key, sub_value in value.items():
+                if isinstance(sub_value, list) and isinstance(section.get(sub_key), list):
+                    section[sub_key] = section[sub_key] + sub_value
+                else:
+                    section[sub_key] = sub_value
+            merged[key] = section
+        else:
+            merged[key] = value
+    return merged
+
+
+def make_task(url, path, sha1=None, size=None, shared=True):
+    # shared=False keeps a file out of the SharedStore (files users or installers edit in place).
+    return {'url': url, 'path': Path(path), 'sha1': sha1, 'size': size or 0, 'shared': shared}
+
+
+def file_sha1(path):
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def fetch_remote_sha1(url, session=None):
+    """Return the SHA-1 published next to a maven artifact, or None."""
+    try:
+        response = (session or requests).get(url + '.sha1', timeout=10)
+        if response.status_code != 200:
+            return None
+        digest = response.text.strip().split()[0].lower() if response.text.strip() else ''
+        if len(digest) == 40 and all(c in '0123456789abcdef' for c in digest):
+            return digest
+    except requests.RequestException:
+        pass
+    return None
+
+
+def download_file(url, path, sha1=None, size=None, session=None, on_progress=None, is_cancelled=None):
+    """Download url to path through a resumable ``.part`` file.
+
+    An existing ``.part`` file is continued with an HTTP Range request. The
+    result is checked against sha1 (or size) before it is atomically renamed
+    into place. on_progress(delta, downloaded, total) is called per chunk.
+    Cancelling keeps the ``.part`` file so the next call resumes it.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = path.with_name(path.name + '.part')
+    own_session = session is None
+    session = session or requests.Session()
+    is_cancelled = is_cancelled or (lambda: False)
+
+    try:
+        last_error = None
+        for _ in range(MAX_ATTEMPTS):
+            if is_cancelled():
+                raise DownloadCancelled('Download cancelled')
+
+            offset = part_path.stat().st_size if part_path.exists() else 0
+            if size and offset > size:
+                part_path.unlink()
+                offset = 0
+
+            try:
+                sha = hashlib.sha1()
+                if offset and sha1:
+                    with open(part_path, 'rb') as f:
+                        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                            sha.update(chunk)
+
+                if not (size and offset == size):
+                    headers = {'Range': f'bytes={offset}-'} if offset else {}
+                    with session.get(url, stream=True, timeout=30, headers=headers) as r:
+                        if not (offset and r.status_code == 416):
+                            r.raise_for_status()
+                            if offset and r.status_code != 206:
+                                offset = 0
+                                sha = hashlib.sha1()
+                            total = size or offset + int(r.headers.get('Content-Length', 0))
+                            downloaded = offset
+                            with open(part_path, 'ab' if offset else 'wb') as f:
+                                for chunk in r.iter_content(CHUNK_SIZE):
+                                    if is_cancelled():
+                                        raise DownloadCancelled('Download cancelled')
+                                    if not chunk:
+                                        continue
+                                    f.write(chunk)
+                                    sha.update(chunk)
+                                    downloaded += len(chunk)
+                                    if on_progress:
+                                        on_progress(len(chunk), downloaded, total)
+
+                actual_size = part_path.stat().st_size
+                if size and actual_size != size:
+                    if actual_size > size:
+                        part_path.unlink()
+                    raise IOError(f'Size mismatch for {path.name}: {actual_size} != {size}')
+                if sha1 and sha.hexdigest() != sha1.lower():
+                    part_path.unlink()
+                    raise IOError(f'Checksum mismatch for {path.name}')
+
+                os.replace(part_path, path)
+                return
+            except DownloadCancelled:
+                raise
+            except (requests.RequestException, IOError) as e:
+                last_error = e
+        raise IOError(f'Failed to download {url}: {last_error}')
+    finally:
+        if own_session:
+            session.close()
+
+
+class DownloadEngine:
+    """Resolves a version's files and fetches them with a bounded worker pool.
+
+    The callback dict uses the same keys as minecraft_launcher_lib
+    (setStatus/setProgress/setMax) plus setFile(text, current, total, speed).
+    With fast_verify, files whose size and mtime match the version's
+    HashIndex are trusted without being re-hashed. With a SharedStore,
+    files are linked from the store before going to the network.
+    """
+
+    def __init__(self, minecraft_directory, callback=None, is_cancelled=None, max_workers=MAX_WORKERS, fast_verify=True,
+                 store=None):
+        self.minecraft_directory = Path(minecraft_directory)
+        self.callback = callback or {}
+        self.is_cancelled = is_cancelled or (lambda: False)
+        self.max_workers = max_workers
+        self.fast_verify = fast_verify
+        self.store = store
+        self.index = None
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=2)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._lock = threading.Lock()
+        self._bytes_done = 0
+        self._bytes_total = 0
+        self._files_done = 0
+        self._started_at = 0.0
+        self._last_emit = 0.0
+
+    def close(self):
+        self.session.close()
+
+    def _emit(self, key, *args):
+        func = self.callback.get(key)
+        if func:
+            func(*args)
+
+    def _check_cancelled(self):
+        if self.is_cancelled():
+            raise DownloadCancelled('Download cancelled')
+
+    def _version_dir(self, version_id):
+        return self.minecraft_directory / 'versions' / version_id
+
+    def get_manifest(self):
+        manifest = get_version_manifest(session=self.session)
+        if manifest is None:
+            raise ConnectionError('The version manifest is unavailable and no cached copy exists.')
+        return manifest
+
+    def load_version_json(self, version_id):
+        json_path = self._version_dir(version_id) / f'{version_id}.json'
+        if not json_path.exists():
+            manifest = self.get_manifest()
+            entry = next((v for v in manifest.get('versions', []) if v.get('id') == version_id), None)
+            if entry is None:
+                raise ValueError(f'Version {version_id} was not found in the version manifest.')
+            self._fetch(make_task(entry['url'], json_path, entry.get('sha1'), shared=False))
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def resolve_version(self, version_id):
+        """Return the merged version JSON and the inheritance chain (child first)."""
+        data = self.load_version_json(version_id)
+        chain = [data]
+        while 'inheritsFrom' in chain[-1]:
+            chain.append(self.load_version_json(chain[-1]['inheritsFrom']))
+
+        merged = chain[-1]
+        for child in reversed(chain[:-1]):
+            merged = merge_version_json(child, merged)
+        merged.pop('inheritsFrom', None)
+        return merged, chain
+
+    def collect_library_tasks(self, libraries):
+        libraries_dir = self.minecraft_directory / 'libraries'
+        tasks = []
+        natives = []
+        for lib in libraries:
+            if not rules_allow(lib.get('rules')):
+                continue
+            downloads = lib.get('downloads', {})
+            artifact = downloads.get('artifact')
+            if artifact:
+                if artifact.get('url'):
+                    path = artifact.get('path') or maven_path(lib['name'])
+                    tasks.append(make_task(artifact['url'], libraries_dir / path, artifact.get('sha1'), artifact.get('size')))
+            elif 'downloads' not in lib and 'name' in lib:
+                path = maven_path(lib['name'])
+                base_url = lib.get('url') or LIBRARY_BASE_URL
+                tasks.append(make_task(f"{base_url.rstrip('/')}/{path}", libraries_dir / path, lib.get('sha1'), lib.get('size')))
+
+            native_key = lib.get('natives', {}).get(get_os_name())
+            if native_key:
+                native_key = native_key.replace('${arch}', get_arch_bits())
+                classifier = downloads.get('classifiers', {}).get(native_key)
+                if classifier and classifier.get('url'):
+                    path = libraries_dir / (classifier.get('path') or maven_path(f"{lib['name']}:{native_key}"))
+                    tasks.append(make_task(classifier['url'], path, classifier.get('sha1'), classifier.get('size')))
+                    natives.append((path, lib.get('extract', {}).get('exclude', [])))
+        return tasks, natives
+
+    def collect_asset_tasks(self, asset_index):
+        index_info = asset_index
+        index_path = self.minecraft_directory / 'assets' / 'indexes' / f"{index_info['id']}.json"
+        index_task = make_task(index_info['url'], index_path, index_info.get('sha1'), index_info.get('size'))
+        if not self.is_valid(index_task):
+            self._fetch(index_task)
+        with open(index_path, 'r', encoding='utf-8') as f:
+            objects = json.load(f).get('objects', {})
+
+        objects_dir = self.minecraft_directory / 'assets' / 'objects'
+        tasks = []
+        seen = set()
+        for obj in objects.values():
+            digest = obj['hash']
+            if digest in seen:
+                continue
+            seen.add(digest)
+            tasks.append(make_task(f'{ASSET_BASE_URL}/{digest[:2]}/{digest}', objects_dir / digest[:2] / digest, digest, obj.get('size')))
+        return tasks
+
+    def collect_tasks(self, version_id, data, chain):
+        tasks = []
+        for version in chain:
+            client = version.get('downloads', {}).get('client')
+            if client:
+                jar_path = self._version_dir(version['id']) / f"{version['id']}.jar"
+                tasks.append(make_task(client['url'], jar_path, client.get('sha1'), client.get('size')))
+
+        library_tasks, natives = self.collect_library_tasks(data.get('libraries', []))
+        tasks.extend(library_tasks)
+
+        if 'assetIndex' in data:
+            self._emit('setStatus', 'Resolve Assets')
+            tasks.extend(self.collect_asset_tasks(data['assetIndex']))
+
+        log_file = data.get('logging', {}).get('client', {}).get('file')
+        if log_file:
+            log_path = self.minecraft_directory / 'assets' / 'log_configs' / log_file['id']
+            tasks.append(make_task(log_file['url'], log_path, log_file.get('sha1'), log_file.get('size')))
+
+        return tasks, natives
+
+    def is_valid(self, task):
+        path = task['path']
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        if task['sha1']:
+            if self.index is not None and self.index.lookup(path, st) == task['sha1']:
+                return True
+            if file_sha1(path) != task['sha1']:
+                return False
+            if self.store is not None and task['shared']:
+                self.store.ingest(path, task['sha1'])
+            if self.index is not None:
+                self.index.record(path, task['sha1'], st)
+            return True
+        if task['size']:
+            return st.st_size == task['size']
+        return True
+
+    def _add_bytes(self, count):
+        with self._lock:
+            self._bytes_done += count
+            now = time.monotonic()
+            if now - self._last_emit < PROGRESS_INTERVAL:
+                return
+            self._last_emit = now
+            done, total, files = self._bytes_done, self._bytes_total, self._files_done
+            elapsed = max(now - self._started_at, 0.001)
+        self._emit('setFile', f'{files} files', done, max(total, done), done / elapsed)
+
+    def _fetch(self, task):
+        if self.store is not None and task['sha1'] and task['shared']:
+            if self.store.link_into(task['sha1'], task['path'], task['size']):
+                self._add_bytes(task['size'])
+                if self.index is not None:
+                    self.index.record(task['path'], task['sha1'])
+                return
+
+        reported = [0]
+
+        def on_progress(delta, downloaded, total):
+            self._add_bytes(downloaded - reported[0])
+            reported[0] = downloaded
+
+        download_file(
+            task['url'],
+            task['path'],
+            sha1=task['sha1'],
+            size=task['size'],
+            session=self.session,
+            on_progress=on_progress,
+            is_cancelled=self.is_cancelled,
+        )
+        if task['sha1']:
+            if self.store is not None and task['shared']:
+                self.store.ingest(task['path'], task['sha1'])
+            if self.index is not None:
+                self.index.record(task['path'], task['sha1'])
+
+    def _run_pool(self, func, tasks, on_done=None):
+        if not tasks:
+            return []
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(func, task): task for task in tasks}
+            try:
+                for future in as_completed(futures):
+                    results.append((futures[future], future.result()))
+                    if on_done:
+                        on_done()
+            except BaseException:
+                pool.shutdown(wait=True, cancel_futures=True)
+                raise
+        return results
+
+    def download_tasks(self, tasks):
+        self._emit('setStatus', 'Verify Files')
+
+        def check(task):
+            self._check_cancelled()
+            return self.is_valid(task)
+
+        pending = [task for task, valid in self._run_pool(check, tasks) if not valid]
+        if not pending:
+            return []
+
+        self._emit('setStatus', 'Download Files')
+        self._emit('setMax', len(pending))
+        self._emit('setProgress', 0)
+        with self._lock:
+            self._bytes_done = 0
+            self._bytes_total = sum(task['size'] for task in pending)
+            self._files_done = 0
+            self._started_at = time.monotonic()
+
+        def on_done():
+            with self._lock:
+                self._files_done += 1
+                files = self._files_done
+            self._emit('setProgress', files)
+
+        self._run_pool(self._fetch, pending, on_done)
+        return pending
+
+    def extract_natives(self, version_id, natives):
+        natives_dir = self._version_dir(version_id) / 'natives'
+        natives_dir.mkdir(parents=True, exist_ok=True)
+        for jar_path, exclude in natives:
+            with zipfile.ZipFile(jar_path) as zf:
+                for member in zf.namelist():
+                    if member.endswith('/') or any(member.startswith(e) for e in exclude):
+                        continue
+                    zf.extract(member, natives_dir)
+
+    def install_version(self, version_id):
+        if self.store is not None:
+            register_directory(self.minecraft_directory)
+        if self.fast_verify:
+            self.index = HashIndex.for_version(self.minecraft_directory, version_id)
+        try:
+            self._install_version(version_id)
+        finally:
+            if self.index is not None:
+                self.index.save()
+
+    def _install_version(self, version_id):
+        self._emit('setStatus', 'Resolve Version')
+        data, chain = self.resolve_version(version_id)
+        tasks, natives = self.collect_tasks(version_id, data, chain)
+        downloaded = self.download_tasks(tasks)
+        self._check_cancelled()
+
+        jar_path = self._version_dir(version_id) / f'{version_id}.jar'
+        if not jar_path.exists() and len(chain) > 1:
+            parent_jar = self._version_dir(chain[-1]['id']) / f"{chain[-1]['id']}.jar"
+            if parent_jar.exists():
+                shutil.copyfile(parent_jar, jar_path)
+
+        natives_dir = self._version_dir(version_id) / 'natives'
+        downloaded_paths = {task['path'] for task in downloaded}
+        natives_stale = not self.fast_verify or not natives_dir.is_dir() or not any(natives_dir.iterdir())
+        if natives and (natives_stale or any(path in downloaded_paths for path, _ in natives)):
+            self._emit('setStatus', 'Extract Natives')
+            self.extract_natives(version_id, natives)
+
+        # A matching JVM already on the machine (Mojang's or from the registry) saves the runtime download.
+        java_version = data.get('javaVersion')
+        if java_version and not (self.fast_verify and select_java(self.minecraft_directory, java_version)):
+            self._emit('setStatus', 'Install Java Runtime')
+            install_runtime(self.minecraft_directory, java_version, callback=self.callback, force=not self.fast_verify)
+
+        self._emit('setStatus', 'Installation complete')
 
 
 class DownloadThread(QThread):
@@ -29,28 +512,33 @@ class DownloadThread(QThread):
         self._cancelled = True
 
     def run(self):
+        settings = load_settings()
+        engine = DownloadEngine(
+            self.minecraft_directory,
+            callback={
+                'setStatus': self.status_signal.emit,
+                'setProgress': self.value_signal.emit,
+                'setMax': self.max_signal.emit,
+                'setFile': self._on_file,
+            },
+            is_cancelled=lambda: self._cancelled,
+            fast_verify=settings.get('fast_verify', True),
+            store=SharedStore() if settings.get('shared_store', True) else None,
+        )
         try:
-            minecraft_launcher_lib.install.install_minecraft_version(
-                self.version_id,
-                self.minecraft_directory,
-                callback={
-                    'setStatus': self.status_signal.emit,
-                    'setProgress': self.value_signal.emit,
-                    'setMax': self.max_signal.emit,
-                    'setFile': self._on_file,
-                },
-            )
+            engine.install_version(self.version_id)
             self.finished_signal.emit(not self._cancelled)
         except Exception as e:
-            if str(e) == 'Download cancelled':
+            if isinstance(e, DownloadCancelled) or str(e) == 'Download cancelled':
                 print(self.tr.get('download_thread_cancelled_log', 'Download thread finished because it was cancelled.'))
             else:
                 print(f"{self.tr.get('download_error_log', 'Download error:')} {e}")
             self.finished_signal.emit(False)
         finally:
+            engine.close()
             self.is_running = False
 
     def _on_file(self, text, cur, tot, spd):
         if self._cancelled:
-            raise Exception('Download cancelled')
+            raise DownloadCancelled('Download cancelled')
         self.progress_signal.emit(text, cur, tot, spd)
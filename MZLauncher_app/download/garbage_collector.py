@@ -0,0 +1,304 @@
+import os
+import json
+import shutil
+from pathlib import Path
+from PySide6.QtCore import QThread, Signal
+
+from MZLauncher_app.settings.settings import get_minecraft_directory, load_settings
+from MZLauncher_app.core.utils import get_installed_versions
+from MZLauncher_app.download.download import maven_path
+from MZLauncher_app.download.shared_store import get_store_dir, registered_directories
+from MZLauncher_app.core.java_registry import get_java_registry
+
+# Forge/NeoForge installers write processor outputs here that no version JSON lists.
+PROTECTED_LIBRARY_DIRS = ('net/minecraft/client/', 'net/minecraft/server/', 'net/neoforged/neoform/', 'de/oceanlabs/mcp/')
+
+
+class GarbageCollector:
+    """Mark-and-sweep over libraries, asset objects, natives and Java runtimes.
+
+    The mark phase reads one version JSON (and its asset index) at a time and
+    keeps only referenced paths and 20-byte asset digests. The sweep phase
+    streams directories with os.scandir and yields unreferenced entries one
+    by one, so the asset store is never listed in memory as a whole.
+
+    The shared store is global, so its objects are marked by sha1 from every
+    game directory registered with it, not only this one. Runtimes the Java
+    registry knows about are kept too, since the launcher may pick any of them;
+    pass include_runtimes=False to leave runtime/ alone while the game runs.
+    """
+
+    def __init__(self, minecraft_directory=None, include_store=True, include_runtimes=True):
+        self.minecraft_directory = Path(minecraft_directory or get_minecraft_directory())
+        self.include_store = include_store
+        self.include_runtimes = include_runtimes
+        self.libraries = set()
+        self.library_dirs = set()
+        self.assets = set()
+        self.asset_indexes = set()
+        self.log_configs = set()
+        self.runtimes = set()
+        self.store_refs = set()
+        self.keep_forge_outputs = False
+
+    def _read_json(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f'[GC] Skipping unreadable {Path(path).name}: {e}')
+            return None
+
+    def mark(self):
+        versions_dir = self.minecraft_directory / 'versions'
+        for version_id in get_installed_versions(self.minecraft_directory):
+            data = self._read_json(versions_dir / version_id / f'{version_id}.json')
+            if data is not None:
+                self._mark_version(data)
+        if self.include_runtimes:
+            self.mark_registry_runtimes()
+        if self.include_store:
+            self.mark_store()
+
+    def mark_registry_runtimes(self):
+        """Mark every runtime/ component that holds a JVM known to the Java registry."""
+        runtime_dir = os.path.realpath(self.minecraft_directory / 'runtime') + os.sep
+        for entry in list(get_java_registry().entries.values()):
+            home = entry.get('home', '')
+            if home.startswith(runtime_dir):
+                self.runtimes.add(home[len(runtime_dir):].split(os.sep, 1)[0])
+
+    def mark_store(self):
+        """Mark store objects used by the other game directories that share the store."""
+        current = os.path.realpath(self.minecraft_directory)
+        for directory in registered_directories():
+            if directory == current or not os.path.isdir(directory):
+                continue
+            other = GarbageCollector(directory, include_store=False, include_runtimes=False)
+            other.mark()
+            self.store_refs |= other.store_refs | other.assets
+
+    def _mark_sha1(self, entry):
+        try:
+            self.store_refs.add(bytes.fromhex(entry['sha1']))
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    def _mark_library_path(self, path):
+        self.libraries.add(path)
+        self.library_dirs.add(path.rsplit('/', 1)[0])
+
+    def _mark_version(self, data):
+        self._mark_sha1(data.get('downloads', {}).get('client', {}))
+        for lib in data.get('libraries', []):
+            name = lib.get('name', '')
+            if name.startswith(('net.minecraftforge:', 'net.neoforged:')):
+                self.keep_forge_outputs = True
+            downloads = lib.get('downloads', {})
+            try:
+                artifact = downloads.get('artifact')
+                if artifact:
+                    self._mark_library_path(artifact.get('path') or maven_path(name))
+                    self._mark_sha1(artifact)
+                elif name:
+                    self._mark_library_path(maven_path(name))
+                    self._mark_sha1(lib)
+                for classifier_key, classifier in downloads.get('classifiers', {}).items():
+                    self._mark_library_path(classifier.get('path') or maven_path(f'{name}:{classifier_key}'))
+                    self._mark_sha1(classifier)
+            except (IndexError, AttributeError):
+                continue
+
+        self._mark_sha1(data.get('assetIndex', {}))
+        index_id = data.get('assetIndex', {}).get('id') or data.get('assets')
+        if index_id and index_id not in self.asset_indexes:
+            self.asset_indexes.add(index_id)
+            index = self._read_json(self.minecraft_directory / 'assets' / 'indexes' / f'{index_id}.json')
+            if index:
+                for obj in index.get('objects', {}).values():
+                    try:
+                        self.assets.add(bytes.fromhex(obj['hash']))
+                    except (KeyError, ValueError):
+                        continue
+
+        log_file = data.get('logging', {}).get('client', {}).get('file', {})
+        if log_file.get('id'):
+            self.log_configs.add(log_file['id'])
+            self._mark_sha1(log_file)
+
+        runtime = data.get('javaVersion', {}).get('component')
+        if runtime:
+            self.runtimes.add(runtime)
+
+    def _dir_size(self, path):
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+
+    def _sweep_libraries(self):
+        libraries_dir = self.minecraft_directory / 'libraries'
+        for root, _, files in os.walk(libraries_dir):
+            rel_dir = os.path.relpath(root, libraries_dir).replace(os.sep, '/')
+            if rel_dir in self.library_dirs:
+                continue
+            if self.keep_forge_outputs and (rel_dir + '/').startswith(PROTECTED_LIBRARY_DIRS):
+                continue
+            for name in files:
+                if f'{rel_dir}/{name}' in self.libraries:
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    yield Path(path), os.lstat(path).st_size, False
+                except OSError:
+                    continue
+
+    def _sweep_assets(self):
+        assets_dir = self.minecraft_directory / 'assets'
+        objects_dir = assets_dir / 'objects'
+        if objects_dir.is_dir():
+            with os.scandir(objects_dir) as shards:
+                for shard in shards:
+                    if not shard.is_dir():
+                        continue
+                    with os.scandir(shard.path) as entries:
+                        for entry in entries:
+                            try:
+                                digest = bytes.fromhex(entry.name)
+                            except ValueError:
+                                continue
+                            if digest not in self.assets and entry.is_file():
+                                yield Path(entry.path), entry.stat().st_size, False
+
+        for folder, keep, suffix in ((assets_dir / 'indexes', self.asset_indexes, '.json'),
+                                     (assets_dir / 'log_configs', self.log_configs, '')):
+            if not folder.is_dir():
+                continue
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    key = entry.name[:-len(suffix)] if suffix and entry.name.endswith(suffix) else entry.name
+                    if key not in keep and entry.is_file():
+                        yield Path(entry.path), entry.stat().st_size, False
+
+    def _sweep_natives(self):
+        versions_dir = self.minecraft_directory / 'versions'
+        if not versions_dir.is_dir():
+            return
+        with os.scandir(versions_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir() or os.path.exists(os.path.join(entry.path, f'{entry.name}.json')):
+                    continue
+                natives_dir = Path(entry.path) / 'natives'
+                if natives_dir.is_dir():
+                    yield natives_dir, self._dir_size(natives_dir), True
+
+    def _sweep_runtimes(self):
+        runtime_dir = self.minecraft_directory / 'runtime'
+        if not runtime_dir.is_dir():
+            return
+        custom_java = os.path.abspath(load_settings().get('java_path', '') or os.devnull)
+        with os.scandir(runtime_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir() or entry.name in self.runtimes:
+                    continue
+                if custom_java.startswith(os.path.abspath(entry.path) + os.sep):
+                    continue
+                yield Path(entry.path), self._dir_size(entry.path), True
+
+    def _sweep_store(self):
+        store_dir = get_store_dir()
+        if not store_dir.is_dir():
+            return
+        with os.scandir(store_dir) as shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                with os.scandir(shard.path) as entries:
+                    for entry in entries:
+                        try:
+                            digest = bytes.fromhex(entry.name)
+                        except ValueError:
+                            continue
+                        if digest in self.store_refs or digest in self.assets:
+                            continue
+                        # Still hard-linked from some file, even if no version JSON names it.
+                        st = entry.stat()
+                        if st.st_nlink <= 1:
+                            yield Path(entry.path), st.st_size, False
+
+    def sweep(self):
+        yield from self._sweep_libraries()
+        yield from self._sweep_assets()
+        yield from self._sweep_natives()
+        if self.include_runtimes:
+            yield from self._sweep_runtimes()
+        else:
+            print('[GC] Minecraft is running; leaving Java runtimes alone')
+        if self.include_store:
+            yield from self._sweep_store()
+
+    def _prune_empty_dirs(self, folder):
+        for root, dirs, files in os.walk(folder, topdown=False):
+            if root != str(folder) and not dirs and not files:
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    pass
+
+    def scan(self):
+        """Return the unreferenced entries as (path, size, is_dir) tuples."""
+        self.mark()
+        return list(self.sweep())
+
+    def delete(self, entries):
+        """Delete the given scan entries; returns (count, bytes) actually removed."""
+        count = 0
+        total = 0
+        runtime_dir = self.minecraft_directory / 'runtime'
+        for path, size, is_dir in entries:
+            if not self.include_runtimes and path.parent == runtime_dir:
+                continue
+            try:
+                if is_dir:
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                print(f'[GC] Failed to remove {path}: {e}')
+                continue
+            count += 1
+            total += size
+        self._prune_empty_dirs(self.minecraft_directory / 'libraries')
+        return count, total
+
+
+class GarbageCollectThread(QThread):
+    """Scans when entries is None (the result is kept in self.entries), otherwise deletes exactly those entries."""
+    finished_signal = Signal(int, object)
+    error_signal = Signal(str)
+
+    def __init__(self, minecraft_directory=None, entries=None, include_runtimes=True, parent=None):
+        super().__init__(parent)
+        self.minecraft_directory = minecraft_directory
+        self.entries = entries
+        self.include_runtimes = include_runtimes
+        self.dry_run = entries is None
+
+    def run(self):
+        try:
+            collector = GarbageCollector(self.minecraft_directory, include_runtimes=self.include_runtimes)
+            if self.dry_run:
+                self.entries = collector.scan()
+                count, total = len(self.entries), sum(size for _, size, _ in self.entries)
+            else:
+                count, total = collector.delete(self.entries)
+            print(f"[GC] {'Found' if self.dry_run else 'Removed'} {count} unused entries ({total / 1024 / 1024:.1f} MB)")
+            self.finished_signal.emit(count, total)
+        except Exception as e:
+            self.error_signal.emit(str(e))
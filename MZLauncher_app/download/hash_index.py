@@ -0,0 +1,68 @@
+import os
+import json
+import threading
+from pathlib import Path
+
+INDEX_FILE_NAME = 'mazult-index.json'
+
+
+class HashIndex:
+    """Persisted (size, mtime, sha1) records for the files of one version.
+
+    A file whose size and mtime still match its record is trusted without
+    re-hashing it. Keys are paths relative to the Minecraft directory.
+    """
+
+    def __init__(self, path, root):
+        self.path = Path(path)
+        self.root = Path(root)
+        self.entries = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    @classmethod
+    def for_version(cls, minecraft_directory, version_id):
+        minecraft_directory = Path(minecraft_directory)
+        return cls(minecraft_directory / 'versions' / version_id / INDEX_FILE_NAME, minecraft_directory)
+
+    def _key(self, file_path):
+        return os.path.relpath(file_path, self.root).replace(os.sep, '/')
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.entries = data.get('files', {})
+        except Exception as e:
+            print(f'[HashIndex] {self.path.name} is broken, rebuilding: {e}')
+            self.entries = {}
+
+    def lookup(self, file_path, st):
+        """Return the recorded sha1 if the stat data is unchanged, else None."""
+        entry = self.entries.get(self._key(file_path))
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        return None
+
+    def record(self, file_path, sha1, st=None):
+        if st is None:
+            st = os.stat(file_path)
+        with self._lock:
+            self.entries[self._key(file_path)] = [st.st_size, st.st_mtime_ns, sha1]
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'files': dict(self.entries)}
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
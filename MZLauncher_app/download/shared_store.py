@@ -0,0 +1,158 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+
+from MZLauncher_app.settings.settings import get_appdata_path
+
+FICLONE = 0x40049409
+CHUNK_SIZE = 64 * 1024
+
+
+def get_store_dir():
+    return get_appdata_path() / 'store' / 'objects'
+
+
+def get_directories_file():
+    return get_appdata_path() / 'store' / 'directories.json'
+
+
+_directories_lock = threading.Lock()
+
+
+def registered_directories():
+    """Game directories that have linked or stored files; the GC marks store objects from all of them."""
+    try:
+        with open(get_directories_file(), 'r', encoding='utf-8') as f:
+            directories = json.load(f)
+        return [d for d in directories if isinstance(d, str)] if isinstance(directories, list) else []
+    except (OSError, ValueError):
+        return []
+
+
+def register_directory(minecraft_directory):
+    directory = os.path.realpath(minecraft_directory)
+    with _directories_lock:
+        directories = registered_directories()
+        if directory in directories:
+            return
+        directories.append(directory)
+        path = get_directories_file()
+        tmp_path = path.with_name(path.name + '.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(directories, f, indent=4)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f'[SharedStore] Could not register {directory}: {e}')
+
+
+def _reflink(src, dst):
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+    try:
+        with open(src, 'rb') as s, open(dst, 'wb') as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except OSError:
+        try:
+            os.unlink(dst)
+        except OSError:
+            pass
+        return False
+
+
+def link_file(src, dst):
+    """Place src at dst as a hard link, a reflink, or a plain copy."""
+    dst = Path(dst)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dst.with_name(dst.name + '.link')
+    if tmp_path.exists():
+        tmp_path.unlink()
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        if not _reflink(src, tmp_path):
+            shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+def _sha1(path):
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class SharedStore:
+    """Launcher-wide content-addressed store of libraries and assets, keyed by sha1.
+
+    Game directories hard-link (or reflink/copy) their files out of the store,
+    so every directory after the first one gets them without the network.
+    Only files Mojang and the loaders publish with a sha1 go in here: client
+    jars, libraries, asset objects and log configs. Never configs, mods or
+    saves. A hard-linked file is the same file in every directory, so an
+    in-place edit in one game directory changes all of them. Objects are
+    re-hashed before they are linked, and a damaged one is dropped and
+    downloaded again.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else get_store_dir()
+        # sha1 -> (size, mtime_ns) of objects hashed during this session.
+        self._verified = {}
+        self._lock = threading.Lock()
+
+    def object_path(self, sha1):
+        return self.root / sha1[:2] / sha1
+
+    def verify(self, sha1):
+        """Return True if the stored object still hashes to sha1; a bad object is deleted."""
+        obj = self.object_path(sha1)
+        try:
+            st = obj.stat()
+            with self._lock:
+                if self._verified.get(sha1) == (st.st_size, st.st_mtime_ns):
+                    return True
+            if _sha1(obj) == sha1:
+                with self._lock:
+                    self._verified[sha1] = (st.st_size, st.st_mtime_ns)
+                return True
+        except OSError:
+            return False
+        print(f'[SharedStore] {sha1} is damaged, removing it from the store')
+        obj.unlink(missing_ok=True)
+        return False
+
+    def link_into(self, sha1, dest, size=None):
+        """Materialise the object at dest. Returns False if the store lacks a good copy."""
+        obj = self.object_path(sha1)
+        try:
+            st = obj.stat()
+        except OSError:
+            return False
+        if size and st.st_size != size:
+            obj.unlink(missing_ok=True)
+            return False
+        if not self.verify(sha1):
+            return False
+        link_file(obj, dest)
+        return True
+
+    def ingest(self, path, sha1):
+        obj = self.object_path(sha1)
+        try:
+            if obj.stat().st_size == os.stat(path).st_size:
+                return
+        except OSError:
+            pass
+        try:
+            link_file(path, obj)
+        except OSError as e:
+            print(f'[SharedStore] Could not store {Path(path).name}: {e}')
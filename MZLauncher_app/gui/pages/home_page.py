@@ -1,19 +1,29 @@
-import os
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QScrollArea,
     QProgressBar, QFrame, QSpacerItem, QSizePolicy, QCheckBox, QStackedLayout, QGraphicsOpacityEffect
 )
-from PySide6.QtCore import Qt, QSize, QRect, QPoint, QTimer
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt, QSize, QRect, QPoint, QTimer, QAbstractAnimation
 from PySide6.QtGui import QFont, QIcon, QPixmap, QPainter, QPainterPath, QCursor, QBrush, QColor
 from PySide6.QtCore import Property, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup
 
 from MZLauncher_app.core.utils import resource_path
 from MZLauncher_app.settings.settings import get_minecraft_directory
+from MZLauncher_app.core.content_counter import ContentCounter
+
+HOVER_ZOOM = 1.05
+# Zoom factors are rounded to this step for caching, so a hover animation reuses a handful of pixmaps.
+ZOOM_BUCKET = 0.01
+PIXMAP_CACHE_SIZE = 8
 
 class HeaderFrame(QFrame):
     def __init__(self, parent=None, bg_path="assets/bg1.png", overlay_color=QColor(0, 0, 0, 80)):
         super().__init__(parent)
         self.bg = QPixmap(resource_path(bg_path))
+        self._base = None
+        self._base_key = None
+        self._pixmap_cache = OrderedDict()
         self.setObjectName("headerFrame")
         self._zoom_factor = 1.0
         self._overlay_opacity = 0.0
@@ -22,13 +32,15 @@ class HeaderFrame(QFrame):
         self.zoom_animation = QPropertyAnimation(self, b"zoom_factor", self)
         self.zoom_animation.setDuration(250)
         self.zoom_animation.setEasingCurve(QEasingCurve.InOutQuad)
+        # The last animation frame is drawn with the fast transform; repaint it smoothly.
+        self.zoom_animation.finished.connect(self.update)
 
         self.overlay_animation = QPropertyAnimation(self, b"overlay_opacity", self)
         self.overlay_animation.setDuration(250)
         self.overlay_animation.setEasingCurve(QEasingCurve.InOutQuad)
 
     def enterEvent(self, event):
-        self.zoom_animation.setEndValue(1.05)
+        self.zoom_animation.setEndValue(HOVER_ZOOM)
         self.zoom_animation.start()
         self.overlay_animation.setEndValue(1.0)
         self.overlay_animation.start()
@@ -49,19 +61,57 @@ class HeaderFrame(QFrame):
         path.addRoundedRect(self.rect(), 18, 18)
         painter.setClipPath(path)
 
-        target_size = self.size() * self._zoom_factor
-        pixmap_scaled = self.bg.scaled(target_size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        pixmap_scaled = self.background_pixmap()
+        size = pixmap_scaled.deviceIndependentSize()
 
-        draw_x = (self.width() - pixmap_scaled.width()) / 2
-        draw_y = (self.height() - pixmap_scaled.height()) / 2
+        draw_x = (self.width() - size.width()) / 2
+        draw_y = (self.height() - size.height()) / 2
         
-        painter.drawPixmap(draw_x, draw_y, pixmap_scaled)
+        painter.drawPixmap(QPoint(round(draw_x), round(draw_y)), pixmap_scaled)
 
         if self._overlay_opacity > 0:
-            overlay_color = self.overlay_color
+            overlay_color = QColor(self.overlay_color)
             overlay_color.setAlphaF(self._overlay_opacity * (self.overlay_color.alphaF()))
             painter.fillRect(self.rect(), overlay_color)
 
+    def base_pixmap(self, dpr):
+        """The background downscaled once to cover the whole screen at full hover zoom."""
+        screen = self.screen().size() if self.screen() else self.size()
+        key = (screen.width(), screen.height(), dpr)
+        if self._base_key != key:
+            max_size = screen * (HOVER_ZOOM * dpr)
+            if self.bg.width() > max_size.width() and self.bg.height() > max_size.height():
+                self._base = self.bg.scaled(max_size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+            else:
+                self._base = self.bg
+            self._base_key = key
+            self._pixmap_cache.clear()
+        return self._base
+
+    def background_pixmap(self):
+        dpr = self.devicePixelRatioF()
+        base = self.base_pixmap(dpr)
+        bucket = round(self._zoom_factor / ZOOM_BUCKET)
+        key = (self.width(), self.height(), bucket, dpr)
+        pixmap = self._pixmap_cache.get(key)
+        if pixmap is not None:
+            self._pixmap_cache.move_to_end(key)
+            return pixmap
+
+        target_size = self.size() * (bucket * ZOOM_BUCKET * dpr)
+        if self.zoom_animation.state() == QAbstractAnimation.Running:
+            # Mid-animation frames are on screen for a few milliseconds; scale fast and don't cache.
+            pixmap = base.scaled(target_size, Qt.KeepAspectRatioByExpanding, Qt.FastTransformation)
+            pixmap.setDevicePixelRatio(dpr)
+            return pixmap
+
+        pixmap = base.scaled(target_size, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        pixmap.setDevicePixelRatio(dpr)
+        self._pixmap_cache[key] = pixmap
+        while len(self._pixmap_cache) > PIXMAP_CACHE_SIZE:
+            self._pixmap_cache.popitem(last=False)
+        return pixmap
+
     @Property(float)
     def zoom_factor(self):
         return self._zoom_factor
@@ -203,7 +253,7 @@ class HomePage(QWidget):
 
         frame1_title_layout.addWidget(icon_frame)
 
-        self.mods_title_label = QLabel() 
+        self.mods_title_label = QLabel(self.tr.get("mods_manager_title", "Mods Manager"))
         self.mods_title_label.setFont(QFont("Segoe UI Variable", 16, QFont.Bold))
         frame1_title_layout.addWidget(self.mods_title_label)
         mods_count_frame = QFrame()
@@ -242,7 +292,6 @@ class HomePage(QWidget):
         
         self.frame1.setMinimumHeight(120)
         self.frame1.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.update_mods_count()
         self.frame2 = HeaderFrame(bg_path="assets/bg3.png")
         frame2_layout = QVBoxLayout(self.frame2)
         frame2_layout.setContentsMargins(15, 15, 15, 15)
@@ -270,7 +319,6 @@ class HomePage(QWidget):
         frame2_layout.addLayout(frame2_bottom_layout)
         self.frame2.setMinimumHeight(120)
         self.frame2.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.update_worlds_count()
         self.frame3 = HeaderFrame(bg_path="assets/bg4.png")
         frame3_layout = QVBoxLayout(self.frame3)
         frame3_layout.setContentsMargins(15, 15, 15, 15)
@@ -298,7 +346,6 @@ class HomePage(QWidget):
         frame3_layout.addLayout(frame3_bottom_layout)
         self.frame3.setMinimumHeight(120)
         self.frame3.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.update_resource_packs_count()
         self.frame4 = HeaderFrame(bg_path="assets/bg5.png")
         frame4_layout = QVBoxLayout(self.frame4)
         frame4_layout.setContentsMargins(15, 15, 15, 15)
@@ -533,6 +580,10 @@ class HomePage(QWidget):
         self.secondary_frames = [self.frame1, self.frame2, self.frame3, self.frame4, self.frame5, self.frame6]
         self.prepare_entrance_animation()
 
+        self.content_counter = ContentCounter(self)
+        self.content_counter.count_changed.connect(self.on_content_count_changed)
+        self.update_content_counts()
+
     def create_secondary_frame_title(self, icon_path, title, count_label_attr, icon_frame_object_name="iconFrame", count_frame_object_name="countFrame"):
         title_layout = QHBoxLayout()
         title_layout.setSpacing(10)
@@ -569,39 +620,18 @@ class HomePage(QWidget):
         title_layout.addStretch()
         return title_layout
 
-    def update_mods_count(self):
-        mc_dir = get_minecraft_directory()
-        mods_dir = mc_dir / "mods"
-        count = 0
-        if mods_dir.exists() and mods_dir.is_dir():
-            count = len([f for f in os.listdir(mods_dir) if f.endswith('.jar')])
-        
-        self.mods_title_label.setText(self.tr.get("mods_manager_title", "Mods Manager"))
-        self.mods_count_label.setText(str(count))
-
-    def update_worlds_count(self):
-        mc_dir = get_minecraft_directory()
-        saves_dir = mc_dir / "saves"
-        count = 0
-        if saves_dir.exists() and saves_dir.is_dir():
-            count = len([d for d in os.listdir(saves_dir) if os.path.isdir(os.path.join(saves_dir, d))])
-        self.worlds_count_label.setText(str(count))
-
-    def update_resource_packs_count(self):
-        mc_dir = get_minecraft_directory()
-        packs_dir = mc_dir / "resourcepacks"
-        count = 0
-        if packs_dir.exists() and packs_dir.is_dir():
-            count = len([f for f in os.listdir(packs_dir) if f.endswith('.zip') or os.path.isdir(os.path.join(packs_dir, f))])
-        self.packs_count_label.setText(str(count))
-
-    def update_shader_packs_count(self):
-        mc_dir = get_minecraft_directory()
-        packs_dir = mc_dir / "shaderpacks"
-        count = 0
-        if packs_dir.exists() and packs_dir.is_dir():
-            count = len([f for f in os.listdir(packs_dir) if f.endswith('.zip') or os.path.isdir(os.path.join(packs_dir, f))])
-        self.shader_packs_count_label.setText(str(count))
+    def update_content_counts(self):
+        self.content_counter.set_root(get_minecraft_directory())
+
+    def on_content_count_changed(self, folder, count):
+        label = {
+            "mods": self.mods_count_label,
+            "saves": self.worlds_count_label,
+            "resourcepacks": self.packs_count_label,
+            "shaderpacks": self.shader_packs_count_label,
+        }.get(folder)
+        if label:
+            label.setText(str(count))
 
     def prepare_entrance_animation(self):
         for i, frame in enumerate(self.secondary_frames):
@@ -4,11 +4,12 @@ import sys
 import subprocess
 import shutil
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QFrame,
-    QDialog, QLineEdit, QComboBox, QDialogButtonBox, QMessageBox, QListWidgetItem, QInputDialog, QCheckBox, QScrollArea
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListView,
+    QDialog, QLineEdit, QComboBox, QDialogButtonBox, QMessageBox, QInputDialog, QCheckBox, QScrollArea,
+    QStyledItemDelegate, QStyle, QToolTip
 )
-from PySide6.QtGui import QFont, QCursor, QIcon, QPixmap
-from PySide6.QtCore import Qt, Signal, QSize
+from PySide6.QtGui import QFont, QCursor, QIcon, QPixmap, QPainter, QPen, QColor, QFontMetrics
+from PySide6.QtCore import Qt, Signal, QSize, QRect, QRectF, QEvent, QModelIndex, QAbstractListModel
 from pathlib import Path
 
 from MZLauncher_app.settings.settings import load_settings, save_settings, get_minecraft_directory
@@ -58,7 +59,7 @@ class AddInstanceDialog(QDialog):
     def populate_versions(self):
         filters = load_settings().get("filters", {})
         installed_versions = get_installed_versions()
-        available_versions, _ = get_available_versions(filters)
+        available_versions, _ = get_available_versions(filters, cached_only=True)
 
         all_versions = set(installed_versions)
         for _, version_id in available_versions:
@@ -103,7 +104,7 @@ class EditInstanceDialog(QDialog):
     def populate_versions(self):
         filters = load_settings().get("filters", {})
         installed_versions = get_installed_versions()
-        available_versions, _ = get_available_versions(filters)
+        available_versions, _ = get_available_versions(filters, cached_only=True)
 
         all_versions = set(installed_versions)
         for _, version_id in available_versions:
@@ -118,119 +119,219 @@ class EditInstanceDialog(QDialog):
             "version": self.version_combo.currentText()
         }
 
-class InstanceItem(QFrame):
-    clicked = Signal(QListWidgetItem)
-    edit_requested = Signal()
-    delete_requested = Signal()
+INSTANCE_ITEM_HEIGHT = 80
+INSTANCE_ICON_SIZE = 32
+ACTION_BUTTON_SIZE = 40
+ACTION_BUTTON_SPACING = 5
+# (action, glyph, tooltip), left to right; shown on the hovered row only.
+INSTANCE_ACTIONS = (
+    ("edit", "✎", "Sửa instance"),
+    ("delete", "🗑️", "Xóa instance"),
+    ("open_folder", "📁", "Mở thư mục instance"),
+)
 
-    def __init__(self, instance_data, list_widget_item, parent=None):
-        super().__init__(parent)
-        self.instance_data = instance_data
-        self.list_widget_item = list_widget_item
-        self.setCursor(QCursor(Qt.PointingHandCursor))
-        self.setMouseTracking(True)
-        self.setObjectName("instanceItem")
-        self.setMinimumHeight(70)
-
-        main_layout = QHBoxLayout(self)
-        main_layout.setContentsMargins(15, 10, 15, 10)
-        main_layout.setSpacing(15)
-
-        icon_frame = QFrame()
-        icon_frame.setObjectName("iconFrame")
-        icon_frame.setFixedSize(50, 50)
-        icon_layout = QVBoxLayout(icon_frame)
-        icon_label = QLabel()
-        icon_label.setPixmap(QPixmap(resource_path("assets/stack.png")).scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        icon_label.setAlignment(Qt.AlignCenter)
-        icon_layout.addWidget(icon_label)
-        main_layout.addWidget(icon_frame)
-
-        text_layout = QVBoxLayout()
-        name_label = QLabel(instance_data['name'])
-        name_label.setFont(QFont("Segoe UI Variable", 14, QFont.Bold))
-        version_label = QLabel(f"Version: {instance_data['version']}")
-        version_label.setStyleSheet("color: #A0A0A0;")
-        text_layout.addWidget(name_label)
-        text_layout.addWidget(version_label)
-        main_layout.addLayout(text_layout)
-        main_layout.addStretch()
-
-        self.action_buttons_widget = QWidget()
-        action_buttons_layout = QHBoxLayout(self.action_buttons_widget)
-        action_buttons_layout.setContentsMargins(0, 0, 0, 0)
-        self.action_buttons_widget.setStyleSheet("background-color: transparent;")
-        action_buttons_layout.setSpacing(5)
-
-        self.edit_button = QPushButton("✎")
-        font = self.edit_button.font()
-        font.setPointSize(12)
-        self.edit_button.setFont(font)
-        self.edit_button.setFixedSize(40, 40)
-        self.edit_button.setObjectName("folderButton")
-        self.edit_button.setCursor(QCursor(Qt.PointingHandCursor))
-        self.edit_button.setToolTip("Sửa instance")
-        self.edit_button.clicked.connect(self.on_edit_clicked)
-        action_buttons_layout.addWidget(self.edit_button)
-
-        self.delete_button = QPushButton("🗑️")
-        self.delete_button.setFont(font)
-        self.delete_button.setFixedSize(40, 40)
-        self.delete_button.setObjectName("folderButton")
-        self.delete_button.setCursor(QCursor(Qt.PointingHandCursor))
-        self.delete_button.setToolTip("Xóa instance")
-        self.delete_button.clicked.connect(self.on_delete_clicked)
-        action_buttons_layout.addWidget(self.delete_button)
-        self.open_folder_button = QPushButton("📁")
-        self.open_folder_button.setFont(font)
-        self.open_folder_button.setFixedSize(40, 40)
-        self.open_folder_button.setObjectName("folderButton")
-        self.open_folder_button.setCursor(QCursor(Qt.PointingHandCursor))
-        self.open_folder_button.setToolTip("Mở thư mục instance")
-        self.open_folder_button.clicked.connect(self.open_instance_folder)
-        action_buttons_layout.addWidget(self.open_folder_button)
-
-        self.action_buttons_widget.hide()
-        main_layout.addWidget(self.action_buttons_widget)
-
-    def open_instance_folder(self):
-        path = self.instance_data.get("path")
-        if not path or not os.path.exists(path):
-            QMessageBox.warning(self, "Lỗi", "Không tìm thấy thư mục của instance.")
-            return
+_icon_cache = {}
 
-        try:
-            if sys.platform.startswith('win32'):
-                os.startfile(path)
-            elif sys.platform.startswith('darwin'):
-                subprocess.Popen(['open', path])
-            elif sys.platform.startswith('linux'):
-                subprocess.Popen(['xdg-open', path])
-        except Exception as e:
-            QMessageBox.critical(self, "Lỗi", f"Không thể mở thư mục:\n{e}")
 
-    def on_edit_clicked(self):
-        self.list_widget_item.listWidget().setCurrentItem(self.list_widget_item)
-        self.edit_requested.emit()
+def get_instance_icon(size=INSTANCE_ICON_SIZE, device_pixel_ratio=1.0):
+    """Instance icon scaled once per size and screen, shared by every row."""
+    key = (size, device_pixel_ratio)
+    pixmap = _icon_cache.get(key)
+    if pixmap is None:
+        pixel_size = round(size * device_pixel_ratio)
+        pixmap = QPixmap(resource_path("assets/stack.png")).scaled(pixel_size, pixel_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        _icon_cache[key] = pixmap
+    return pixmap
 
-    def on_delete_clicked(self):
-        self.list_widget_item.listWidget().setCurrentItem(self.list_widget_item)
-        self.delete_requested.emit()
 
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            if not self.action_buttons_widget.underMouse():
-                self.clicked.emit(self.list_widget_item)
-        super().mousePressEvent(event)
+class InstanceListModel(QAbstractListModel):
+    """Instances as list rows; edits touch only the rows that changed."""
 
-    def enterEvent(self, event):
-        self.action_buttons_widget.show()
-        super().enterEvent(event)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.instances = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.instances)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.instances):
+            return None
+        instance = self.instances[index.row()]
+        if role == Qt.DisplayRole:
+            return instance.get("name")
+        if role == Qt.UserRole:
+            return instance
+        return None
+
+    def set_instances(self, instances):
+        self.beginResetModel()
+        self.instances = list(instances)
+        self.endResetModel()
+
+    def append_instance(self, instance):
+        row = len(self.instances)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.instances.append(instance)
+        self.endInsertRows()
+        return self.index(row)
+
+    def update_instance(self, row, instance):
+        self.instances[row] = instance
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove_instance(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.instances[row]
+        self.endRemoveRows()
+
+
+class InstanceItemDelegate(QStyledItemDelegate):
+    """Paints an instance card, replacing the per-row widget and its layouts."""
+    action_requested = Signal(str, QModelIndex)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont("Segoe UI Variable", 14, QFont.Bold)
+        self.button_font = QFont()
+        self.button_font.setPointSize(12)
+        self.hovered_row = -1
+        self.hovered_action = None
+        self.pressed_action = None
+
+    def sizeHint(self, option, index):
+        return QSize(100, INSTANCE_ITEM_HEIGHT)
+
+    def action_rects(self, rect):
+        top = rect.center().y() - ACTION_BUTTON_SIZE // 2 + 1
+        left = rect.right() - 15 - len(INSTANCE_ACTIONS) * (ACTION_BUTTON_SIZE + ACTION_BUTTON_SPACING) + ACTION_BUTTON_SPACING
+        rects = {}
+        for action, _glyph, _tooltip in INSTANCE_ACTIONS:
+            rects[action] = QRect(left, top, ACTION_BUTTON_SIZE, ACTION_BUTTON_SIZE)
+            left += ACTION_BUTTON_SIZE + ACTION_BUTTON_SPACING
+        return rects
+
+    def action_at(self, rect, pos):
+        for action, action_rect in self.action_rects(rect).items():
+            if action_rect.contains(pos):
+                return action
+        return None
+
+    def paint(self, painter, option, index):
+        instance = index.data(Qt.UserRole)
+        if not instance:
+            return
+        selected = bool(option.state & QStyle.State_Selected)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        rect = option.rect
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        painter.setPen(QPen(QColor("#7C4DFF") if selected else QColor(255, 255, 255, 25), 1))
+        painter.setBrush(QColor("#1B2133") if selected or hovered else QColor("#141826"))
+        painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 18, 18)
+
+        icon_rect = QRect(rect.left() + 15, rect.center().y() - 24, 50, 50)
+        painter.setPen(QPen(QColor(255, 255, 255, 20), 1))
+        painter.setBrush(QColor(124, 77, 255, 46))
+        painter.drawRoundedRect(QRectF(icon_rect).adjusted(0.5, 0.5, -0.5, -0.5), 12, 12)
+        icon = get_instance_icon(INSTANCE_ICON_SIZE, painter.device().devicePixelRatioF())
+        painter.drawPixmap(icon_rect.center().x() - INSTANCE_ICON_SIZE // 2 + 1, icon_rect.center().y() - INSTANCE_ICON_SIZE // 2 + 1, icon)
+
+        actions = self.action_rects(rect) if hovered else {}
+        text_left = icon_rect.right() + 16
+        text_right = min(r.left() for r in actions.values()) - 15 if actions else rect.right() - 15
+        text_width = max(0, text_right - text_left)
+
+        name_metrics = QFontMetrics(self.name_font)
+        painter.setFont(self.name_font)
+        painter.setPen(QColor("#F5F6FA"))
+        name_rect = QRect(text_left, rect.center().y() - name_metrics.height(), text_width, name_metrics.height())
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignBottom, name_metrics.elidedText(instance.get("name", ""), Qt.ElideRight, text_width))
+
+        painter.setFont(option.font)
+        painter.setPen(QColor("#A0A0A0"))
+        version_metrics = QFontMetrics(option.font)
+        version_rect = QRect(text_left, rect.center().y() + 4, text_width, version_metrics.height())
+        painter.drawText(version_rect, Qt.AlignLeft | Qt.AlignTop, version_metrics.elidedText(f"Version: {instance.get('version', '')}", Qt.ElideRight, text_width))
+
+        if actions:
+            painter.setFont(self.button_font)
+            for action, glyph, _tooltip in INSTANCE_ACTIONS:
+                is_hovered = index.row() == self.hovered_row and action == self.hovered_action
+                if is_hovered and action == self.pressed_action:
+                    painter.setPen(QPen(QColor("#915EFF"), 1))
+                    painter.setBrush(QColor("#915EFF"))
+                elif is_hovered:
+                    painter.setPen(QPen(QColor("#915EFF"), 1))
+                    painter.setBrush(QColor("#1B2133"))
+                else:
+                    painter.setPen(QPen(QColor("#23283B"), 1))
+                    painter.setBrush(QColor("#141826"))
+                button_rect = actions[action]
+                painter.drawRoundedRect(QRectF(button_rect).adjusted(0.5, 0.5, -0.5, -0.5), 14, 14)
+                painter.setPen(QColor("#F5F6FA"))
+                painter.drawText(button_rect, Qt.AlignCenter, glyph)
+
+        painter.restore()
+
+    def set_hovered(self, view, row, action, pressed_action=None):
+        if (row, action, pressed_action) == (self.hovered_row, self.hovered_action, self.pressed_action):
+            return
+        # Only the rows whose buttons change are repainted.
+        model = view.model()
+        rows = {self.hovered_row, row} - {-1}
+        self.hovered_row, self.hovered_action, self.pressed_action = row, action, pressed_action
+        for r in rows:
+            if r < model.rowCount():
+                view.update(model.index(r))
+
+    def editorEvent(self, event, model, option, index):
+        view = self.parent()
+        if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            action = self.action_at(option.rect, event.position().toPoint())
+            if action:
+                self.set_hovered(view, index.row(), action, action)
+        elif event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            pressed_action = self.pressed_action
+            action = self.action_at(option.rect, event.position().toPoint())
+            self.set_hovered(view, index.row(), action)
+            if action and action == pressed_action:
+                self.action_requested.emit(action, index)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.ToolTip:
+            action = self.action_at(option.rect, event.pos())
+            for name, _glyph, tooltip in INSTANCE_ACTIONS:
+                if name == action:
+                    QToolTip.showText(event.globalPos(), tooltip, view)
+                    return True
+        return super().helpEvent(event, view, option, index)
+
+
+class InstanceListView(QListView):
+    """QListView that tells the delegate which action button is under the mouse."""
+
+    def mouseMoveEvent(self, event):
+        delegate = self.itemDelegate()
+        pos = event.position().toPoint()
+        index = self.indexAt(pos)
+        if index.isValid():
+            delegate.set_hovered(self, index.row(), delegate.action_at(self.visualRect(index), pos), delegate.pressed_action)
+        else:
+            delegate.set_hovered(self, -1, None)
+        super().mouseMoveEvent(event)
 
     def leaveEvent(self, event):
-        self.action_buttons_widget.hide()
+        self.itemDelegate().set_hovered(self, -1, None)
         super().leaveEvent(event)
 
+
 class InstancePage(QWidget):
     def __init__(self, launcher):
         super().__init__(launcher)
@@ -261,10 +362,19 @@ class InstancePage(QWidget):
 
         layout.addLayout(title_layout)
 
-        self.instance_list = QListWidget()
+        self.instance_model = InstanceListModel(self)
+        self.instance_list = InstanceListView()
         self.instance_list.setObjectName("transparentListWidget")
         self.instance_list.setSpacing(5)
-        self.instance_list.currentItemChanged.connect(self.on_selection_changed)
+        # Rows share one height, so scrolling never asks the delegate to measure off-screen rows.
+        self.instance_list.setUniformItemSizes(True)
+        self.instance_list.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.instance_list.setMouseTracking(True)
+        self.instance_list.viewport().setCursor(QCursor(Qt.PointingHandCursor))
+        self.instance_delegate = InstanceItemDelegate(self.instance_list)
+        self.instance_delegate.action_requested.connect(self.on_instance_action)
+        self.instance_list.setItemDelegate(self.instance_delegate)
+        self.instance_list.setModel(self.instance_model)
 
         layout.addWidget(self.instance_list)
         button_layout = QHBoxLayout()
@@ -288,63 +398,44 @@ class InstancePage(QWidget):
         self.load_instance_list()
         
         self.setStyleSheet("""
-            QListWidget#transparentListWidget {
+            QListView#transparentListWidget {
                 background-color: transparent;
                 border: none;
                 outline: 0;
             }
-            QListWidget#transparentListWidget::item {
-                background-color: transparent;
-                border: none;
-            }
-            QListWidget#transparentListWidget::item:selected, QListWidget#transparentListWidget::item:hover {
-                background-color: transparent;
-                border: none;
-            }
-            QFrame#instanceItem {
-                background-color: #141826;
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 18px;
-            }
-            QFrame#instanceItem:hover {
-                background-color: #1B2133;
-            }
-            QFrame#instanceItemSelected {
-                background-color: #1B2133;
-                border: 1px solid #7C4DFF;
-                border-radius: 18px;
-            }
-            QFrame#iconFrame {
-                background: rgba(124,77,255,.18);
-                border: 1px solid rgba(255,255,255,.08);
-                border-radius: 12px;
-            }
         """)
 
     def load_instance_list(self):
-        self.instance_list.clear()
-        instances = load_instances()
-        for instance in instances:
-            item = QListWidgetItem(self.instance_list)
-            item.setData(Qt.UserRole, instance)
-            item.setSizeHint(QSize(100, 80))
-            instance_widget = InstanceItem(instance, item)
-            instance_widget.clicked.connect(self.instance_list.setCurrentItem)
-            instance_widget.edit_requested.connect(self.edit_instance)
-            instance_widget.delete_requested.connect(self.delete_instance)
-            self.instance_list.setItemWidget(item, instance_widget)
-
-    def on_selection_changed(self, current, previous):
-        if previous:
-            widget = self.instance_list.itemWidget(previous)
-            if widget:
-                widget.setObjectName("instanceItem")
-                widget.style().unpolish(widget); widget.style().polish(widget)
-        if current:
-            widget = self.instance_list.itemWidget(current)
-            if widget:
-                widget.setObjectName("instanceItemSelected")
-                widget.style().unpolish(widget); widget.style().polish(widget)
+        self.instance_model.set_instances(load_instances())
+
+    def current_row(self):
+        index = self.instance_list.currentIndex()
+        return index.row() if index.isValid() else -1
+
+    def on_instance_action(self, action, index):
+        self.instance_list.setCurrentIndex(index)
+        if action == "edit":
+            self.edit_instance()
+        elif action == "delete":
+            self.delete_instance()
+        elif action == "open_folder":
+            self.open_instance_folder(index.data(Qt.UserRole))
+
+    def open_instance_folder(self, instance_data):
+        path = instance_data.get("path")
+        if not path or not os.path.exists(path):
+            QMessageBox.warning(self, "Lỗi", "Không tìm thấy thư mục của instance.")
+            return
+
+        try:
+            if sys.platform.startswith('win32'):
+                os.startfile(path)
+            elif sys.platform.startswith('darwin'):
+                subprocess.Popen(['open', path])
+            elif sys.platform.startswith('linux'):
+                subprocess.Popen(['xdg-open', path])
+        except Exception as e:
+            QMessageBox.critical(self, "Lỗi", f"Không thể mở thư mục:\n{e}")
 
     def add_instance(self):
         dialog = AddInstanceDialog(self, self.tr)
@@ -370,15 +461,15 @@ class InstancePage(QWidget):
             instance_data["path"] = str(instance_path)
             instances.append(instance_data)
             save_instances(instances)
-            self.load_instance_list()
+            self.instance_list.setCurrentIndex(self.instance_model.append_instance(instance_data))
             self.launcher.load_versions()
 
     def edit_instance(self):
-        current_item = self.instance_list.currentItem()
-        if not current_item:
+        row = self.current_row()
+        if row < 0:
             return
 
-        instance_data = current_item.data(Qt.UserRole)
+        instance_data = self.instance_model.instances[row]
         dialog = EditInstanceDialog(instance_data, self, self.tr)
 
         if dialog.exec() == QDialog.Accepted:
@@ -397,21 +488,23 @@ class InstancePage(QWidget):
                     QMessageBox.warning(self, self.tr.get("error_title", "Error"), self.tr.get("instance_name_exists_error", "An instance with this name already exists."))
                     return
 
+            updated = dict(instance_data, **new_data)
             for i in instances:
                 if i['name'] == old_name:
                     i.update(new_data)
+                    updated = i
                     break
 
             save_instances(instances)
-            self.load_instance_list()
+            self.instance_model.update_instance(row, updated)
             self.launcher.load_versions()
 
     def delete_instance(self):
-        current_item = self.instance_list.currentItem()
-        if not current_item:
+        row = self.current_row()
+        if row < 0:
             return
 
-        instance_data = current_item.data(Qt.UserRole)
+        instance_data = self.instance_model.instances[row]
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle(self.tr.get("delete_instance_title", "Delete Instance"))
         msg_box.setText(self.tr.get("delete_instance_confirm", "Are you sure you want to delete the instance '{name}'?").format(name=instance_data['name']))
@@ -432,16 +525,16 @@ class InstancePage(QWidget):
                 except OSError as e:
                     QMessageBox.critical(self, self.tr.get("error_title", "Error"), f"Could not delete instance directory:\n{e}")
 
-            self.load_instance_list()
+            self.instance_model.remove_instance(row)
             self.launcher.load_versions()
 
     def play_instance(self):
-        current_item = self.instance_list.currentItem()
-        if not current_item:
+        row = self.current_row()
+        if row < 0:
             QMessageBox.warning(self, self.tr.get("no_selection_title", "No Selection"), self.tr.get("select_instance_to_play_prompt", "Please select an instance to play."))
             return
 
-        instance_data = current_item.data(Qt.UserRole)
+        instance_data = self.instance_model.instances[row]
         instance_name = instance_data.get("name")
         if instance_name:
             self.launcher.launch_from_instance_page(instance_name)
\ No newline at end of file
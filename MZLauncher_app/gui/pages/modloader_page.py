@@ -4,7 +4,6 @@ import subprocess
 import sys
 from pathlib import Path
 
-import xml.etree.ElementTree as ET
 from PySide6.QtCore import (QThread, Signal, Qt, QPropertyAnimation, QEasingCurve,
                           Property, QSize, QTimer, QEvent)
 from PySide6.QtGui import QFont, QCursor, QPixmap, QPainter, QIcon, QColor
@@ -14,9 +13,12 @@ from PySide6.QtWidgets import ( QDialog, QButtonGroup,
     QProgressBar, QMessageBox, QGroupBox, QSpacerItem, QSizePolicy
 )
 
-from MZLauncher_app.modloader.modloader import modloaderf as ModLoaderFetchThread, ModLoaderInstallThread
 from MZLauncher_app.settings.settings import get_minecraft_directory
 from MZLauncher_app.core.utils import load_language, resource_path, get_appdata_path
+from MZLauncher_app.core.startup_trace import lazy_import
+
+# Fetching and installer code is only needed once a loader is picked.
+modloader = lazy_import("MZLauncher_app.modloader.modloader")
 
 class ModLoaderItem(QFrame):
     clicked = Signal(str)
@@ -65,7 +67,7 @@ class ModLoaderPage(QWidget):
         self.tr = launcher.tr
         self.setObjectName("modloaderPage")
 
-        self.fetched_data = None
+        self.fetched_data = {}
         self.fetch_thread = None
         page_layout = QVBoxLayout(self)
         page_layout.setContentsMargins(20, 20, 20, 20)
@@ -156,12 +158,23 @@ class ModLoaderPage(QWidget):
         else:
             self.progress_widget.hide()
 
-    def on_data_fetched(self, data):
-        self.fetched_data = data
-        self.set_ui_loading(False)
-        if hasattr(self, '_pending_loader_name') and self._pending_loader_name:
-            self.launcher.open_modloader_install_page(self._pending_loader_name)
+    def has_loader_data(self, loader_name):
+        return all(key in self.fetched_data for key in modloader.LOADER_ENDPOINTS.get(loader_name, ()))
+
+    def on_endpoint_loaded(self, key, value):
+        self.fetched_data[key] = value
+        pending = getattr(self, '_pending_loader_name', None)
+        if pending and self.has_loader_data(pending):
             self._pending_loader_name = None
+            self.set_ui_loading(False)
+            self.launcher.open_modloader_install_page(pending)
+
+    def on_data_fetched(self, data):
+        self.fetched_data.update(data)
+        self.fetch_thread = None
+        pending = getattr(self, '_pending_loader_name', None)
+        if pending:
+            self.on_fetch_error(self.tr.get('modloader_endpoint_unavailable', 'No data is available for {loader}.').format(loader=pending))
 
     def on_fetch_error(self, msg):
         self.set_ui_loading(False)
@@ -170,7 +183,7 @@ class ModLoaderPage(QWidget):
         self.fetch_thread = None
 
     def on_loader_button_clicked(self, loader_name):
-        if self.fetched_data:
+        if self.has_loader_data(loader_name):
             self.launcher.open_modloader_install_page(loader_name)
         else:
             if self.fetch_thread and self.fetch_thread.isRunning():
@@ -179,7 +192,8 @@ class ModLoaderPage(QWidget):
                 return
             self.set_ui_loading(True)
             self._pending_loader_name = loader_name
-            self.fetch_thread = ModLoaderFetchThread(self)
+            self.fetch_thread = modloader.modloaderf(self)
+            self.fetch_thread.endpoint_loaded.connect(self.on_endpoint_loaded)
             self.fetch_thread.loaded.connect(self.on_data_fetched)
             self.fetch_thread.error.connect(self.on_fetch_error)
             self.fetch_thread.finished.connect(self.fetch_thread.deleteLater)
@@ -220,7 +234,7 @@ class ModLoaderPage(QWidget):
 
         mc_dir = get_minecraft_directory()
 
-        self.install_thread = ModLoaderInstallThread(loader, mc_ver, loader_ver, mc_dir, self.tr)
+        self.install_thread = modloader.ModLoaderInstallThread(loader, mc_ver, loader_ver, mc_dir, self.tr)
         if install_page:
             self.install_thread.status.connect(self.launcher.set_progress_status)
             self.install_thread.progress.connect(self.launcher.set_progress_value)
@@ -391,17 +405,8 @@ class InstallPage(QWidget):
                 mc_versions = sorted([v['version'] for v in self.fetched_data['fabric']['game'] if v['stable']], key=version_key, reverse=True)
             elif self.loader_name == 'legacy-fabric':
                 mc_versions = sorted([v['version'] for v in self.fetched_data['legacy-fabric']['game'] if v['stable']], key=version_key, reverse=True)
-            elif self.loader_name == 'forge':
-                root = ET.fromstring(self.fetched_data[self.loader_name])
-                versions_element = root.find('versioning/versions')
-                if versions_element is not None:
-                    all_versions = [v.text for v in versions_element.findall('version') if v.text]
-                    mc_versions = sorted(list(set(v.split('-', 1)[0] for v in all_versions)), key=version_key, reverse=True)
-            elif self.loader_name == 'neoforge':
-                root = ET.fromstring(self.fetched_data[self.loader_name])
-                versions_element = root.find('versioning/versions')
-                if versions_element is not None:
-                    mc_versions = [v.text for v in versions_element.findall('version') if v.text]
+            elif self.loader_name in ('forge', 'neoforge'):
+                mc_versions = self.fetched_data[self.loader_name]['mc_versions']
 
             if self.loader_name == 'quilt':
                 self.load_loader_versions()
@@ -434,12 +439,8 @@ class InstallPage(QWidget):
                 versions = [v['version'] for v in self.fetched_data['legacy-fabric']['loader']]
             elif self.loader_name == 'quilt':
                 versions = [v['version'] for v in self.fetched_data['quilt']]
-            elif self.loader_name == 'forge':
-                root = ET.fromstring(self.fetched_data[self.loader_name])
-                versions = [v.text for v in root.findall('versioning/versions/version') if v.text and v.text.startswith(mc_ver + '-')]
-            elif self.loader_name == 'neoforge':
-                root = ET.fromstring(self.fetched_data[self.loader_name])
-                versions = [v.text for v in root.findall('versioning/versions/version') if v.text and v.text.startswith(mc_ver)]
+            elif self.loader_name in ('forge', 'neoforge'):
+                versions = self.fetched_data[self.loader_name]['versions'].get(mc_ver, [])
 
             if not versions:
                 self.loader_version_combo.addItem(self.tr.get('modloader_no_versions_available', 'No loader available'))
@@ -1,6 +1,5 @@
 import os
 import sys
-import psutil
 import webbrowser
 import shlex
 from pathlib import Path
@@ -16,8 +15,12 @@ from PySide6.QtCore import Qt, Signal, QPropertyAnimation, QEasingCurve, QTimer,
 from PySide6.QtWidgets import QFileDialog, QApplication
 
 from MZLauncher_app.settings.settings import get_minecraft_directory, load_settings, save_settings
+from MZLauncher_app.download.garbage_collector import GarbageCollectThread
 from MZLauncher_app.core.utils import (list_available_languages, load_language, resource_path, get_appdata_path,
                                        Launcher_profiles_json)
+from MZLauncher_app.core.startup_trace import lazy_import
+
+psutil = lazy_import("psutil")
 
 def format_jvm_args(args: list[str]) -> str:
     result = []
@@ -377,6 +380,14 @@ class SettingsPage(QWidget):
         java_layout.addLayout(java_path_row)
         layout.addWidget(java_groupbox)
 
+        storage_group = QGroupBox(self.tr.get("storage_group", "Storage"))
+        storage_layout = QVBoxLayout(storage_group)
+        storage_layout.addWidget(QLabel(self.tr.get("cleanup_description", "Remove libraries, assets, natives and Java runtimes no installed version uses.")))
+        self.cleanup_btn = QPushButton(self.tr.get("cleanup_button", "Clean up unused files"))
+        self.cleanup_btn.clicked.connect(self.start_cleanup_scan)
+        storage_layout.addWidget(self.cleanup_btn, alignment=Qt.AlignLeft)
+        layout.addWidget(storage_group)
+
         return card
 
     def create_performance_settings(self):
@@ -437,6 +448,21 @@ class SettingsPage(QWidget):
         self.skip_check_checkbox.setObjectName("transparentCheckbox")
         self.skip_check_checkbox.setProperty("class", "settingCheckBox")
         layout.addWidget(self.skip_check_checkbox)
+        self.fast_verify_checkbox = QCheckBox(self.tr.get("fast_verify_checkbox", "Fast file verification (only re-check changed files)"))
+        self.fast_verify_checkbox.setToolTip(self.tr.get("fast_verify_tooltip", "Keeps a hash index of installed files so launching only re-hashes files that changed on disk."))
+        self.fast_verify_checkbox.setObjectName("transparentCheckbox")
+        self.fast_verify_checkbox.setProperty("class", "settingCheckBox")
+        layout.addWidget(self.fast_verify_checkbox)
+        self.shared_store_checkbox = QCheckBox(self.tr.get("shared_store_checkbox", "Share libraries and assets between game directories"))
+        self.shared_store_checkbox.setToolTip(self.tr.get("shared_store_tooltip", "Keeps one copy of each library and asset and hard-links it into every game directory, so other directories install without downloading them again."))
+        self.shared_store_checkbox.setObjectName("transparentCheckbox")
+        self.shared_store_checkbox.setProperty("class", "settingCheckBox")
+        layout.addWidget(self.shared_store_checkbox)
+        self.appcds_checkbox = QCheckBox(self.tr.get("appcds_checkbox", "Class data sharing (faster game startup)"))
+        self.appcds_checkbox.setToolTip(self.tr.get("appcds_tooltip", "Saves the classes loaded by the first launch of a version into an archive that later launches reuse. Needs Java 13 or newer."))
+        self.appcds_checkbox.setObjectName("transparentCheckbox")
+        self.appcds_checkbox.setProperty("class", "settingCheckBox")
+        layout.addWidget(self.appcds_checkbox)
 
         return card
 
@@ -536,6 +562,61 @@ class SettingsPage(QWidget):
         dialog.exec()
         self.on_setting_changed()
 
+    def cleanup_blocked(self):
+        main_window = self.window()
+        if hasattr(main_window, 'is_installing') and main_window.is_installing():
+            QMessageBox.warning(self, self.tr.get("cleanup_title", "Clean Up"), self.tr.get("cleanup_busy", "Wait for the running installation to finish before cleaning up."))
+            return True
+        return False
+
+    def cleanup_runtimes_allowed(self):
+        # A running game keeps its Java runtime open, so runtimes are only swept while nothing runs.
+        main_window = self.window()
+        return not (hasattr(main_window, 'is_game_running') and main_window.is_game_running())
+
+    def start_cleanup_scan(self):
+        if self.cleanup_blocked():
+            return
+        self.cleanup_btn.setEnabled(False)
+        self.cleanup_btn.setText(self.tr.get("cleanup_scanning", "Scanning..."))
+        self.gc_thread = GarbageCollectThread(get_minecraft_directory(), include_runtimes=self.cleanup_runtimes_allowed())
+        self.gc_thread.finished_signal.connect(self.on_cleanup_scanned)
+        self.gc_thread.error_signal.connect(self.on_cleanup_error)
+        self.gc_thread.start()
+
+    def reset_cleanup_button(self):
+        self.cleanup_btn.setEnabled(True)
+        self.cleanup_btn.setText(self.tr.get("cleanup_button", "Clean up unused files"))
+
+    def on_cleanup_scanned(self, count, total):
+        entries = self.gc_thread.entries
+        if count == 0:
+            self.reset_cleanup_button()
+            QMessageBox.information(self, self.tr.get("cleanup_title", "Clean Up"), self.tr.get("cleanup_nothing", "No unused files were found."))
+            return
+        message = self.tr.get("cleanup_confirm", "Found {count} unused files ({size} MB). Delete them?").format(count=count, size=f"{total / 1024 / 1024:.1f}")
+        reply = QMessageBox.question(self, self.tr.get("cleanup_title", "Clean Up"), message, QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        # An install started while the question was open may already use some of these files.
+        if reply != QMessageBox.Yes or self.cleanup_blocked():
+            self.reset_cleanup_button()
+            return
+        self.cleanup_btn.setText(self.tr.get("cleanup_running", "Cleaning up..."))
+        self.gc_thread = GarbageCollectThread(get_minecraft_directory(), entries=entries, include_runtimes=self.cleanup_runtimes_allowed())
+        self.gc_thread.finished_signal.connect(self.on_cleanup_finished)
+        self.gc_thread.error_signal.connect(self.on_cleanup_error)
+        self.gc_thread.start()
+
+    def on_cleanup_finished(self, count, total):
+        self.reset_cleanup_button()
+        main_window = self.window()
+        if hasattr(main_window, 'notification_toast'):
+            message = self.tr.get("cleanup_done", "Freed {size} MB.").format(size=f"{total / 1024 / 1024:.1f}")
+            main_window.notification_toast.show_toast(message)
+
+    def on_cleanup_error(self, error):
+        self.reset_cleanup_button()
+        QMessageBox.critical(self, self.tr.get("cleanup_title", "Clean Up"), error)
+
     def save_settings_action(self):
         self.save_and_hide_bar()
         
@@ -576,7 +657,10 @@ class SettingsPage(QWidget):
             language=language,
             java_mode="custom" if self.java_custom_radio.isChecked() else "default",
             java_path=self.java_path_input.text().strip(),
-            skip_version_check=self.skip_check_checkbox.isChecked()
+            skip_version_check=self.skip_check_checkbox.isChecked(),
+            fast_verify=self.fast_verify_checkbox.isChecked(),
+            shared_store=self.shared_store_checkbox.isChecked(),
+            appcds=self.appcds_checkbox.isChecked()
         )
         
         self.save_button.setEnabled(False)
@@ -643,6 +727,9 @@ class SettingsPage(QWidget):
         self.discord_rpc_checkbox.stateChanged.connect(self.on_setting_changed)
         self.dev_console_checkbox.stateChanged.connect(self.on_setting_changed)
         self.skip_check_checkbox.stateChanged.connect(self.on_setting_changed)
+        self.fast_verify_checkbox.stateChanged.connect(self.on_setting_changed)
+        self.shared_store_checkbox.stateChanged.connect(self.on_setting_changed)
+        self.appcds_checkbox.stateChanged.connect(self.on_setting_changed)
 
     def load_settings_to_ui(self):
         settings = load_settings()
@@ -678,6 +765,9 @@ class SettingsPage(QWidget):
         self.discord_rpc_checkbox.setChecked(settings.get("discord_rpc", True))
         self.dev_console_checkbox.setChecked(settings.get("dev_console", False))
         self.skip_check_checkbox.setChecked(settings.get("skip_version_check", False))
+        self.fast_verify_checkbox.setChecked(settings.get("fast_verify", True))
+        self.shared_store_checkbox.setChecked(settings.get("shared_store", True))
+        self.appcds_checkbox.setChecked(settings.get("appcds", False))
 
         for widget in self.findChildren(QWidget):
             widget.blockSignals(False)
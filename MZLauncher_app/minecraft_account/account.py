@@ -1,17 +1,110 @@
 import http.server
-import socketserver
-import threading
 import time
 import webbrowser
 import uuid
 from pathlib import Path
+from urllib.parse import urlparse, parse_qs
 
-import minecraft_launcher_lib.microsoft_account as msa
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QInputDialog, QListWidget, QListWidgetItem, QHBoxLayout, QMessageBox, QLineEdit
-from PySide6.QtCore import Qt
-from PySide6.QtWidgets import QApplication
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QInputDialog, QListWidget, QListWidgetItem, QHBoxLayout, QMessageBox, QLineEdit, QProgressDialog
+from PySide6.QtCore import Qt, QThread, Signal
 
-from MZLauncher_app.settings.settings import load_accounts, save_accounts, get_appdata_path
+from MZLauncher_app.settings.settings import load_accounts, update_accounts, get_appdata_path
+from MZLauncher_app.minecraft_account.token_refresh import CLIENT_ID, REDIRECT_URI, account_from_login
+from MZLauncher_app.core.startup_trace import lazy_import
+
+# The package imports all of its submodules; defer that until a login actually starts.
+minecraft_launcher_lib = lazy_import("minecraft_launcher_lib")
+
+LOGIN_TIMEOUT = 300
+# Login threads still finishing after their dialog closed; held here until Qt deletes them.
+_background_login_threads = set()
+
+
+class OAuthCallbackServer(http.server.HTTPServer):
+    allow_reuse_address = True
+    timeout = 0.5
+
+    def __init__(self, address):
+        super().__init__(address, OAuthCallbackHandler)
+        self.auth_code = None
+        self.error = None
+
+
+class OAuthCallbackHandler(http.server.BaseHTTPRequestHandler):
+    # Browsers open idle preconnect sockets; without a timeout handle_request() would block on them forever.
+    timeout = 5
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        if 'code' in query:
+            self.server.auth_code = minecraft_launcher_lib.microsoft_account.get_auth_code_from_url(self.path)
+            message = b'<html><h2>Login successful! You can close this window now.</h2></html>'
+        elif 'error' in query:
+            self.server.error = query.get('error_description', query['error'])[0]
+            message = b'<html><h2>Login failed. You can close this window now.</h2></html>'
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-type', 'text/html')
+        self.end_headers()
+        self.wfile.write(message)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MicrosoftLoginThread(QThread):
+    """Runs the loopback OAuth callback and the token exchange off the GUI thread."""
+    success_signal = Signal(dict)
+    failed_signal = Signal(str)
+    cancelled_signal = Signal()
+
+    def __init__(self, timeout=LOGIN_TIMEOUT, parent=None, tr=None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self.tr = tr if tr else {}
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        redirect = urlparse(REDIRECT_URI)
+        try:
+            server = OAuthCallbackServer((redirect.hostname, redirect.port))
+        except OSError as e:
+            self.failed_signal.emit(self.tr.get('login_server_error', 'Could not start the login callback server: {error}').format(error=e))
+            return
+
+        try:
+            webbrowser.open(minecraft_launcher_lib.microsoft_account.get_login_url(CLIENT_ID, REDIRECT_URI))
+            deadline = time.monotonic() + self.timeout
+            # handle_request() returns after server.timeout, so cancel() is noticed within half a second.
+            while server.auth_code is None and server.error is None and not self._cancelled:
+                if time.monotonic() >= deadline:
+                    self.failed_signal.emit(self.tr.get('login_timed_out', 'Timed out waiting for the browser login.'))
+                    return
+                server.handle_request()
+        finally:
+            server.server_close()
+
+        if self._cancelled:
+            self.cancelled_signal.emit()
+            return
+        if server.error:
+            self.failed_signal.emit(server.error)
+            return
+        try:
+            account = minecraft_launcher_lib.microsoft_account.complete_login(CLIENT_ID, None, REDIRECT_URI, server.auth_code)
+        except Exception as e:
+            self.failed_signal.emit(self.tr.get('login_complete_error', 'Failed to complete login: {error}').format(error=e))
+            return
+        if self._cancelled:
+            self.cancelled_signal.emit()
+        else:
+            self.success_signal.emit(account)
 
 
 class UserManagerDialog(QDialog):
@@ -22,6 +115,8 @@ class UserManagerDialog(QDialog):
         self.setMinimumSize(350, 400)
         self.users = load_accounts()
         self.parent_window = parent
+        self.login_thread = None
+        self.login_progress = None
         layout = QVBoxLayout(self)
         self.user_list = QListWidget()
         self.update_list()
@@ -80,77 +175,66 @@ class UserManagerDialog(QDialog):
         btn_cancel.clicked.connect(dialog.reject)
 
         if dialog.exec() == QDialog.Accepted and result == 'offline':
-            accounts = load_accounts()
             name, ok = QInputDialog.getText(self, self.tr.get('offline_login_title', 'Offline Login'), self.tr.get('username_prompt', 'Username:'))
             if ok and name:
-                accounts.append({'type': 'offline', 'name': name})
-                save_accounts(accounts)
+                update_accounts(lambda accounts: accounts.append({'type': 'offline', 'name': name}))
                 self.update_list()
         elif result == 'microsoft':
             self.start_microsoft_login()
 
     def start_microsoft_login(self):
-        try:
-            auth_code = None
-            server_started = threading.Event()
-
-            class OAuthHandler(http.server.SimpleHTTPRequestHandler):
-                def do_GET(self):
-                    nonlocal auth_code
-                    if 'code=' in self.path:
-                        auth_code = msa.get_auth_code_from_url(self.path)
-                        self.send_response(200)
-                        self.send_header('Content-type', 'text/html')
-                        self.end_headers()
-                        self.wfile.write(b'<html><h2>Login successful! You can close this window now.</h2></html>')
-                    else:
-                        self.send_response(404)
-                        self.end_headers()
-
-            def start_auth_server():
-                try:
-                    server = socketserver.TCPServer(('localhost', 12782), OAuthHandler)
-                    server_started.set()
-                    server.handle_request()
-                    return server
-                except Exception as e:
-                    print(f'Server error: {e}')
-                    server_started.set()
-                    return None
-
-            server_thread = threading.Thread(target=start_auth_server)
-            server_thread.daemon = True
-            server_thread.start()
-            server_started.wait(timeout=5)
-            login_url = msa.get_login_url('YOUR_CLIENT_ID_HERE', 'http://localhost:12782/callback')
-            webbrowser.open(login_url)
-            while auth_code is None and server_thread.is_alive():
-                QApplication.processEvents()
-                time.sleep(0.1)
-            if auth_code:
-                try:
-                    account = msa.complete_login('YOUR_CLIENT_ID_HERE', None, 'http://localhost:12782/callback', auth_code)
-                    self.on_login_success(account)
-                except Exception as e:
-                    self.on_login_failed(f'Failed to complete login: {e}')
-        except Exception as e:
-            self.on_login_failed(f'An unexpected error occurred: {e}')
+        if self.login_thread and self.login_thread.isRunning():
+            return
+        self.login_progress = QProgressDialog(self.tr.get('waiting_for_browser_login', 'Waiting for you to sign in with Microsoft in your browser...'),
+                                              self.tr.get('cancel', 'Cancel'), 0, 0, self)
+        self.login_progress.setWindowTitle(self.tr.get('microsoft_account', 'Microsoft'))
+        self.login_progress.setWindowModality(Qt.WindowModal)
+        self.login_progress.setMinimumDuration(0)
+        self.login_progress.canceled.connect(self.cancel_microsoft_login)
+        self.add_btn.setEnabled(False)
+
+        self.login_thread = MicrosoftLoginThread(parent=self, tr=self.tr)
+        self.login_thread.success_signal.connect(self.on_login_success)
+        self.login_thread.failed_signal.connect(self.on_login_failed)
+        self.login_thread.finished.connect(self.on_login_thread_finished)
+        self.login_thread.start()
+        self.login_progress.show()
+
+    def cancel_microsoft_login(self):
+        if self.login_thread:
+            self.login_thread.cancel()
+
+    def on_login_thread_finished(self):
+        if self.login_progress:
+            self.login_progress.canceled.disconnect(self.cancel_microsoft_login)
+            self.login_progress.close()
+            self.login_progress = None
+        self.add_btn.setEnabled(True)
+        self.login_thread = None
+
+    def done(self, result):
+        thread = self.login_thread
+        if thread and thread.isRunning():
+            # Don't block the GUI on handle_request() or the token exchange; let the thread finish on its own.
+            thread.cancel()
+            thread.success_signal.disconnect(self.on_login_success)
+            thread.failed_signal.disconnect(self.on_login_failed)
+            thread.finished.disconnect(self.on_login_thread_finished)
+            thread.setParent(None)
+            _background_login_threads.add(thread)
+            thread.finished.connect(thread.deleteLater)
+            thread.destroyed.connect(lambda: _background_login_threads.discard(thread))
+            self.on_login_thread_finished()
+        super().done(result)
 
     def on_login_success(self, account):
-        accounts = load_accounts()
-        new_account = {
-            'type': 'microsoft',
-            'name': account['name'],
-            'uuid': account['id'],
-            'token': account['access_token'],
-            'refresh_token': account.get('refresh_token')
-        }
-        accounts.append(new_account)
-        save_accounts(accounts)
+        new_account = {'type': 'microsoft', **account_from_login(account)}
+        update_accounts(lambda accounts: accounts.append(new_account))
         self.update_list()
 
     def on_login_failed(self, error_message):
-        QMessageBox.critical(self, 'Login Failed', f'Microsoft login failed:\n{error_message}')
+        QMessageBox.critical(self, self.tr.get('login_failed_title', 'Login Failed'),
+                             self.tr.get('microsoft_login_failed', 'Microsoft login failed:\n{error}').format(error=error_message))
 
     def edit_user(self):
         selected = self.user_list.currentItem()
@@ -163,9 +247,11 @@ class UserManagerDialog(QDialog):
             text, ok = QInputDialog.getText(self, self.tr.get('edit_user_title', 'Edit User'), self.tr.get('edit_user_prompt', 'Edit username:'), QLineEdit.Normal, current_name)
             if ok and text and text != current_name:
                 index = self.user_list.currentRow()
-                accounts = load_accounts()
-                accounts[index]['name'] = text
-                save_accounts(accounts)
+
+                def rename(accounts):
+                    if 0 <= index < len(accounts):
+                        accounts[index]['name'] = text
+                update_accounts(rename)
                 self.update_list()
         else:
             QMessageBox.information(self, self.tr.get('edit_user_title', 'Edit User'), self.tr.get('cannot_edit_ms_account', 'Microsoft account names cannot be edited here.'))
@@ -179,8 +265,9 @@ class UserManagerDialog(QDialog):
         reply = QMessageBox.question(self, self.tr.get('delete_user_title', 'Delete User'), self.tr.get('delete_user_confirm', 'Are you sure you want to delete \"{username}\"?').format(username=display_name), QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
             index = self.user_list.currentRow()
-            accounts = load_accounts()
-            if 0 <= index < len(accounts):
-                accounts.pop(index)
-                save_accounts(accounts)
+
+            def remove(accounts):
+                if 0 <= index < len(accounts):
+                    accounts.pop(index)
+            update_accounts(remove)
             self.update_list()
@@ -0,0 +1,94 @@
+import json
+import time
+import base64
+
+from PySide6.QtCore import QThread, Signal
+
+from MZLauncher_app.settings.settings import load_accounts, update_accounts
+from MZLauncher_app.core.startup_trace import lazy_import
+
+# Only a refresh needs the library; the expiry checks run at startup without it.
+minecraft_launcher_lib = lazy_import("minecraft_launcher_lib")
+
+CLIENT_ID = "YOUR_CLIENT_ID_HERE"  # Replace with your Azure App Client ID
+REDIRECT_URI = "http://localhost:12782/callback"
+# Tokens closer than this to their expiry are refreshed ahead of time.
+REFRESH_MARGIN = 60 * 60
+# Minecraft access tokens live for about a day; this is used when one cannot be decoded.
+DEFAULT_TOKEN_LIFETIME = 24 * 60 * 60
+
+
+def token_expiry(token):
+    """Return the `exp` claim of a JWT access token, or None."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def account_expiry(account):
+    return account.get("expires_at") or token_expiry(account.get("token"))
+
+
+def needs_refresh(account, margin=REFRESH_MARGIN):
+    if account.get("type") != "microsoft" or not account.get("refresh_token"):
+        return False
+    expires_at = account_expiry(account)
+    return expires_at is None or time.time() + margin >= expires_at
+
+
+def token_expired(account):
+    return account.get("type") == "microsoft" and needs_refresh(account, margin=0)
+
+
+def account_from_login(login):
+    """Build the stored account fields from a complete_login/complete_refresh result."""
+    return {
+        "name": login["name"],
+        "uuid": login["id"],
+        "token": login["access_token"],
+        "refresh_token": login.get("refresh_token"),
+        "expires_at": token_expiry(login["access_token"]) or int(time.time()) + DEFAULT_TOKEN_LIFETIME,
+    }
+
+
+def refresh_accounts(margin=REFRESH_MARGIN):
+    """Refresh every Microsoft account close to expiry; returns how many were refreshed."""
+    refreshed = {}
+    for account in load_accounts():
+        if not needs_refresh(account, margin):
+            continue
+        try:
+            login = minecraft_launcher_lib.microsoft_account.complete_refresh(CLIENT_ID, None, REDIRECT_URI, account["refresh_token"])
+            refreshed[account["refresh_token"]] = account_from_login(login)
+            print(f"[Auth] Refreshed token for {account.get('name')}")
+        except Exception as e:
+            print(f"[Auth] Failed to refresh token for {account.get('name')}: {e}")
+
+    if refreshed:
+        # Re-read so accounts added or removed during the refresh are kept.
+        def apply(accounts):
+            for account in accounts:
+                update = refreshed.get(account.get("refresh_token"))
+                if update and account.get("type") == "microsoft":
+                    account.update(update)
+        update_accounts(apply)
+    return len(refreshed)
+
+
+class TokenRefreshThread(QThread):
+    """Refreshes Microsoft tokens off the GUI thread; each refresh is several HTTPS round trips."""
+    finished_signal = Signal(int)
+
+    def __init__(self, margin=REFRESH_MARGIN, parent=None):
+        super().__init__(parent)
+        self.margin = margin
+
+    def run(self):
+        try:
+            self.finished_signal.emit(refresh_accounts(self.margin))
+        except Exception as e:
+            print(f"[Auth] Token refresh failed: {e}")
+            self.finished_signal.emit(0)
@@ -1 +1,4 @@
-from .modloader import *
+def __getattr__(name):
+    # Importing the package no longer loads the installer code; it is loaded when first used.
+    from . import modloader
+    return getattr(modloader, name)
@@ -0,0 +1,87 @@
+import os
+import json
+import hashlib
+import xml.etree.ElementTree as ET
+
+from packaging.version import Version, InvalidVersion
+
+from MZLauncher_app.core.http_cache import get_cache_dir
+
+CATALOG_FORMAT = 1
+
+
+def version_key(v_str):
+    try:
+        return Version(v_str)
+    except InvalidVersion:
+        return Version("0.0.0")
+
+
+def parse_maven_versions(xml_text):
+    root = ET.fromstring(xml_text)
+    return [v.text for v in root.findall('versioning/versions/version') if v.text]
+
+
+def forge_mc_version(loader_version):
+    return loader_version.split('-', 1)[0]
+
+
+def neoforge_mc_version(loader_version):
+    """Map a NeoForge version to its Minecraft version (20.2.86 -> 1.20.2, 21.0.3 -> 1.21)."""
+    parts = loader_version.split('-', 1)[0].split('.')
+    if len(parts) < 2:
+        return None
+    if parts[0] == '0':
+        # Snapshot builds, e.g. 0.25w14craftmine.3
+        return parts[1]
+    if parts[0].isdigit() and int(parts[0]) >= 25 and len(parts) >= 4:
+        # Year-based Minecraft versions, e.g. 26.1.0.5 -> 26.1
+        return f"{parts[0]}.{parts[1]}" if parts[2] == '0' else f"{parts[0]}.{parts[1]}.{parts[2]}"
+    return f"1.{parts[0]}" if parts[1] == '0' else f"1.{parts[0]}.{parts[1]}"
+
+
+def loader_sort_key(loader, loader_version):
+    if loader == 'forge':
+        return version_key(loader_version.split('-', 2)[1] if '-' in loader_version else loader_version)
+    return version_key(loader_version)
+
+
+def build_catalog(loader, xml_text):
+    """Group maven versions by Minecraft version, newest first on both levels."""
+    mc_version_of = forge_mc_version if loader == 'forge' else neoforge_mc_version
+    versions = {}
+    for loader_version in parse_maven_versions(xml_text):
+        mc_version = mc_version_of(loader_version)
+        if mc_version:
+            versions.setdefault(mc_version, []).append((loader_sort_key(loader, loader_version), loader_version))
+
+    catalog_versions = {}
+    for mc_version, entries in versions.items():
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        catalog_versions[mc_version] = [v for _, v in entries]
+    mc_versions = sorted(catalog_versions, key=version_key, reverse=True)
+    return {'mc_versions': mc_versions, 'versions': catalog_versions}
+
+
+def load_catalog(loader, xml_text):
+    """Return the catalog for xml_text, reusing the disk copy while the XML is unchanged."""
+    source = hashlib.sha1(xml_text.encode('utf-8')).hexdigest()
+    catalog_path = get_cache_dir() / 'modloader' / f'{loader}-catalog.json'
+    try:
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('format') == CATALOG_FORMAT and cached.get('source') == source:
+            return {'mc_versions': cached['mc_versions'], 'versions': cached['versions']}
+    except (OSError, ValueError, KeyError):
+        pass
+
+    catalog = build_catalog(loader, xml_text)
+    try:
+        catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = catalog_path.with_name(catalog_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': CATALOG_FORMAT, 'source': source, **catalog}, f, separators=(',', ':'))
+        os.replace(tmp_path, catalog_path)
+    except OSError as e:
+        print(f'[ModLoader] Could not cache the {loader} catalog: {e}')
+    return catalog
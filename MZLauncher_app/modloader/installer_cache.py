@@ -0,0 +1,69 @@
+import os
+import time
+from pathlib import Path
+
+from MZLauncher_app.core.http_cache import get_cache_dir
+from MZLauncher_app.download.download import download_file, fetch_remote_sha1
+
+INSTALLER_CACHE_LIMIT = 512 * 1024 * 1024
+
+
+def get_installer_cache_dir():
+    return get_cache_dir() / 'installers'
+
+
+class InstallerCache:
+    """Size-bounded LRU cache of modloader installer jars, keyed by loader and version.
+
+    A jar's mtime is bumped on every hit, and the least recently used jars
+    are removed once the cache grows past max_bytes.
+    """
+
+    def __init__(self, root=None, max_bytes=INSTALLER_CACHE_LIMIT):
+        self.root = Path(root) if root else get_installer_cache_dir()
+        self.max_bytes = max_bytes
+
+    def path_for(self, loader, file_name):
+        return self.root / loader / file_name
+
+    def get(self, loader, url, on_progress=None):
+        """Return a local path for the installer at url, downloading it only on a miss."""
+        path = self.path_for(loader, url.rsplit('/', 1)[-1])
+        try:
+            if path.stat().st_size > 0:
+                now = time.time()
+                os.utime(path, (now, now))
+                print(f'[ModLoader] Using cached installer {path.name}')
+                return path
+        except OSError:
+            pass
+
+        download_file(url, path, sha1=fetch_remote_sha1(url), on_progress=on_progress)
+        self.prune(keep=path)
+        return path
+
+    def prune(self, keep=None):
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.root):
+            for name in files:
+                file_path = Path(root) / name
+                try:
+                    st = file_path.stat()
+                except OSError:
+                    continue
+                total += st.st_size
+                entries.append((st.st_mtime, st.st_size, file_path))
+
+        entries.sort()
+        for _, size, file_path in entries:
+            if total <= self.max_bytes:
+                break
+            if file_path == keep:
+                continue
+            try:
+                file_path.unlink()
+                total -= size
+                print(f'[ModLoader] Evicted cached installer {file_path.name}')
+            except OSError:
+                pass
@@ -1,60 +1,108 @@
 import os
-import shutil
+import json
 import subprocess
 import sys
 from pathlib import Path
+from collections import deque
 
 import requests
 import minecraft_launcher_lib
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PySide6.QtCore import QThread, Signal, Qt
-from PySide6.QtCore import Qt
 
 from MZLauncher_app.settings.settings import get_minecraft_directory
-from MZLauncher_app.core.utils import get_tmp_dir
+from MZLauncher_app.core.utils import Launcher_profiles_json
+from MZLauncher_app.modloader.installer_cache import InstallerCache
+from MZLauncher_app.core.java_registry import get_java_registry, fetch_version_java, select_java, install_runtime
+from MZLauncher_app.core.http_cache import get_cached_resource, decode_text
+from MZLauncher_app.modloader.catalog import load_catalog
+
+MODLOADER_METADATA_TTL = 3600
+MODLOADER_ENDPOINTS = {
+    'fabric': ('https://meta.fabricmc.net/v2/versions', 'modloader/fabric-versions.json', json.loads),
+    'legacy-fabric': ('https://meta.legacyfabric.net/v2/versions', 'modloader/legacy-fabric-versions.json', json.loads),
+    'quilt': ('https://meta.quiltmc.org/v3/versions/installer', 'modloader/quilt-installer.json', json.loads),
+    'quilt_game': ('https://meta.quiltmc.org/v3/versions/game', 'modloader/quilt-game.json', json.loads),
+    'neoforge': ('https://maven.neoforged.net/releases/net/neoforged/neoforge/maven-metadata.xml', 'modloader/neoforge-maven-metadata.xml', decode_text),
+    'forge': ('https://maven.minecraftforge.net/net/minecraftforge/forge/maven-metadata.xml', 'modloader/forge-maven-metadata.xml', decode_text),
+}
+# Endpoints each loader's install page needs before it can open.
+LOADER_ENDPOINTS = {
+    'fabric': ('fabric',),
+    'legacy-fabric': ('legacy-fabric',),
+    'quilt': ('quilt', 'quilt_game'),
+    'neoforge': ('neoforge',),
+    'forge': ('forge',),
+}
+
+
+# Maven metadata that is handed to the UI as a pre-built version catalog.
+CATALOG_ENDPOINTS = ('forge', 'neoforge')
+
+
+def fetch_modloader_endpoint(key):
+    url, cache_name, parse = MODLOADER_ENDPOINTS[key]
+    return get_cached_resource(url, cache_name, MODLOADER_METADATA_TTL, parse).get()
+
+
+def fetch_modloader_data(key):
+    value = fetch_modloader_endpoint(key)
+    if value is not None and key in CATALOG_ENDPOINTS:
+        value = load_catalog(key, value)
+    return value
+
 
 class modloaderf(QThread):
     loaded = Signal(dict)
+    endpoint_loaded = Signal(str, object)
     error = Signal(str)
 
     def run(self):
         if self.isInterruptionRequested():
             return
 
-        session = requests.Session()
+        data = {}
+        missing = []
         try:
-            data = {}
-            fabric_response = session.get('https://meta.fabricmc.net/v2/versions', timeout=10)
-            fabric_response.raise_for_status()
-            data['fabric'] = fabric_response.json()
-
-            legacy_fabric_response = session.get('https://meta.legacyfabric.net/v2/versions', timeout=10)
-            legacy_fabric_response.raise_for_status()
-            data['legacy-fabric'] = legacy_fabric_response.json()
-
-            quilt_installer_response = session.get('https://meta.quiltmc.org/v3/versions/installer', timeout=10)
-            quilt_installer_response.raise_for_status()
-            data['quilt'] = quilt_installer_response.json()
-
-            quilt_game_response = session.get('https://meta.quiltmc.org/v3/versions/game', timeout=10)
-            quilt_game_response.raise_for_status()
-            data['quilt_game'] = quilt_game_response.json()
-
-            neoforge_response = session.get('https://maven.neoforged.net/releases/net/neoforged/neoforge/maven-metadata.xml', timeout=10)
-            neoforge_response.raise_for_status()
-            data['neoforge'] = neoforge_response.text
-
-            forge_response = session.get('https://maven.minecraftforge.net/net/minecraftforge/forge/maven-metadata.xml', timeout=10)
-            forge_response.raise_for_status()
-            data['forge'] = forge_response.text
-
-            self.loaded.emit(data)
-        except requests.exceptions.RequestException as e:
-            self.error.emit(f'Network error: {e}')
+            with ThreadPoolExecutor(max_workers=len(MODLOADER_ENDPOINTS)) as pool:
+                futures = {pool.submit(fetch_modloader_data, key): key for key in MODLOADER_ENDPOINTS}
+                for future in as_completed(futures):
+                    key = futures[future]
+                    value = future.result()
+                    if value is None:
+                        missing.append(key)
+                        continue
+                    data[key] = value
+                    self.endpoint_loaded.emit(key, value)
         except Exception as e:
             self.error.emit(f'An unexpected error occurred: {e}')
-        finally:
-            session.close()
+            return
+
+        if not data:
+            self.error.emit(f'Network error: no cached data for {", ".join(sorted(missing))}')
+            return
+        self.loaded.emit(data)
+
+
+INSTALLER_PHASES = {
+    'download': ('installer_phase_download', 'Downloading libraries...'),
+    'extract': ('installer_phase_extract', 'Extracting files...'),
+    'process': ('installer_phase_process', 'Running installer processors...'),
+    'finish': ('installer_phase_finish', 'Finishing installation...'),
+}
+
+
+def installer_phase(line):
+    lower = line.lower()
+    if 'processor' in lower or lower.startswith(('task:', '  mainclass:', 'splitting', 'patching')):
+        return 'process'
+    if 'download' in lower or 'considering library' in lower:
+        return 'download'
+    if 'extract' in lower:
+        return 'extract'
+    if 'successfully installed' in lower or 'injecting profile' in lower:
+        return 'finish'
+    return None
 
 
 class ModLoaderInstallThread(QThread):
@@ -71,30 +119,88 @@ class ModLoaderInstallThread(QThread):
         self.loader_ver = loader_ver
         self.mc_dir = mc_dir
         self.lang = tr if tr else {}
+        self.installer_java = None
+
+    def find_installer_java(self):
+        """Pick a JVM able to run the target Minecraft version, installing Mojang's runtime if none is."""
+        if self.installer_java:
+            return self.installer_java
+        self.installer_java = self._find_installer_java()
+        return self.installer_java
+
+    def _find_installer_java(self):
+        if self.mc_ver:
+            java_version = fetch_version_java(self.mc_dir, self.mc_ver)
+            if java_version:
+                java = select_java(self.mc_dir, java_version, allow_newer=True)
+                if not java:
+                    self.status.emit(self.lang.get('installing_java_runtime', 'Installing Java runtime...'))
+                    java = install_runtime(self.mc_dir, java_version)
+                if java:
+                    return java
+        registry = get_java_registry()
+        registry.ensure_scanned(self.mc_dir)
+        return registry.best_java() or ('javaw' if sys.platform.startswith('win32') else 'java')
 
     def run(self):
         try:
             mc_dir_path = Path(self.mc_dir)
-            tmp_dir = get_tmp_dir()
-            java_path = 'javaw' if sys.platform.startswith('win32') else 'java'
+            installer_cache = InstallerCache()
 
-            def run_java_installer(jar_path: Path, extra_args=None):
+            def run_java_installer(jar_path: Path, extra_args=None, start=70, end=99):
                 if extra_args is None:
                     extra_args = []
-                command = [java_path, '-jar', str(jar_path), *extra_args]
+                command = [self.find_installer_java(), '-jar', str(jar_path), *extra_args]
+                print(f"[ModLoader] Running installer command: {' '.join(command)}")
                 try:
-                    print(f"[ModLoader] Running installer command: {' '.join(command)}")
-                    process = subprocess.run(command, cwd=str(mc_dir_path), check=True, capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW if sys.platform.startswith('win32') else 0)
-                    return process
-                except subprocess.CalledProcessError as e:
-                    error_message = f"Installer failed with exit code {e.returncode}.\n"
-                    error_message += f"STDOUT:\n{e.stdout}\n"
-                    error_message += f"STDERR:\n{e.stderr}"
-                    raise RuntimeError(error_message) from e
+                    process = subprocess.Popen(command, cwd=str(mc_dir_path), stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                               text=True, encoding='utf-8', errors='ignore',
+                                               creationflags=subprocess.CREATE_NO_WINDOW if sys.platform.startswith('win32') else 0)
                 except FileNotFoundError:
                     self.java_not_found.emit()
                     raise InterruptedError("Java not found")
 
+                # Installers print no totals, so progress approaches `end` with each line and jumps per phase.
+                output_tail = deque(maxlen=50)
+                progress = start
+                phase = None
+                for line in iter(process.stdout.readline, ''):
+                    line = line.rstrip()
+                    if not line:
+                        continue
+                    output_tail.append(line)
+                    print(f"[Installer] {line}")
+                    new_phase = installer_phase(line)
+                    if new_phase and new_phase != phase:
+                        phase = new_phase
+                        self.status.emit(self.lang.get(INSTALLER_PHASES[phase][0], INSTALLER_PHASES[phase][1]))
+                    progress += (end - progress) * 0.02
+                    self.progress.emit(int(progress))
+                process.wait()
+
+                if process.returncode != 0:
+                    output = "\n".join(output_tail)
+                    raise subprocess.CalledProcessError(process.returncode, command, output=output)
+                return output_tail
+
+            def run_headless_installer(jar_path: Path):
+                Launcher_profiles_json(str(mc_dir_path))
+                try:
+                    return run_java_installer(jar_path, extra_args=['--installClient', str(mc_dir_path)])
+                except subprocess.CalledProcessError as e:
+                    # Installers from before --installClient existed reject the option; fall back to their GUI.
+                    if 'installClient' not in (e.output or '') and 'recognized option' not in (e.output or ''):
+                        raise
+                    print("[ModLoader] Installer does not support --installClient, opening its GUI instead.")
+                    return run_java_installer(jar_path)
+
+            def download_installer(url, start=30, end=70):
+                def on_progress(delta, downloaded, total):
+                    if total > 0:
+                        self.progress.emit(start + int((end - start) * downloaded / total))
+
+                return installer_cache.get(self.loader, url, on_progress=on_progress)
+
             if self.loader == 'fabric':
                 self.status.emit(self.lang.get('installing_fabric', 'Installing Fabric...'))
                 self.progress.emit(50)
@@ -103,45 +209,35 @@ class ModLoaderInstallThread(QThread):
                 self.status.emit(self.lang.get('installing_legacy_fabric', 'Installing Legacy Fabric...'))
                 self.progress.emit(50)
                 
-                meta_resp = requests.get('https://meta.legacyfabric.net/v2/versions', timeout=10)
-                meta_resp.raise_for_status()
-                meta_data = meta_resp.json()
+                meta_data = fetch_modloader_endpoint('legacy-fabric')
+                if meta_data is None:
+                    raise ConnectionError("Could not fetch Legacy Fabric metadata.")
                 stable_installers = [v for v in meta_data.get('installer', []) if v.get('stable')]
                 if not stable_installers:
                     raise ValueError("Could not find a stable Legacy Fabric installer.")
                 
                 latest_installer_version = stable_installers[0]['version']
                 installer_url = f'https://maven.legacyfabric.net/net/legacyfabric/fabric-installer/{latest_installer_version}/fabric-installer-{latest_installer_version}.jar'
-                installer_path = tmp_dir / f'legacy-fabric-installer-{latest_installer_version}.jar'
                 
-                r = requests.get(installer_url, stream=True)
-                r.raise_for_status()
-                with open(installer_path, 'wb') as f:
-                    shutil.copyfileobj(r.raw, f)
+                installer_path = download_installer(installer_url, start=50)
                 self.progress.emit(70)
                 run_java_installer(installer_path, extra_args=["client", "-mcversion", self.mc_ver, "-loader", self.loader_ver])
-                installer_path.unlink(missing_ok=True)
             elif self.loader == 'quilt':
                 self.status.emit(self.lang.get('installing_quilt', 'Installing Quilt...'))
                 self.progress.emit(10)
                 new_repo_url = f'https://repo.maven.apache.org/maven2/org/quiltmc/quilt-installer/{self.loader_ver}/quilt-installer-{self.loader_ver}.jar'
                 old_repo_url = f'https://maven.quiltmc.org/repository/release/org/quiltmc/quilt-installer/{self.loader_ver}/quilt-installer-{self.loader_ver}.jar'
                 installer_urls = [new_repo_url, old_repo_url]
-                installer_path = tmp_dir / f'quilt-installer-{self.loader_ver}.jar'
 
-                downloaded = False
+                installer_path = None
                 for url in installer_urls:
                     try:
                         self.status.emit(self.lang.get('quilt_downloading_from', 'Trying to download from {server}...').format(server=url.split('/')[2]))
-                        r = requests.get(url, stream=True, timeout=15)
-                        if r.status_code == 200:
-                            with open(installer_path, 'wb') as f:
-                                shutil.copyfileobj(r.raw, f)
-                            downloaded = True
-                            break
-                    except requests.RequestException:
+                        installer_path = download_installer(url, start=10)
+                        break
+                    except (requests.RequestException, IOError):
                         continue
-                if not downloaded:
+                if installer_path is None:
                     raise FileNotFoundError(f'Could not download Quilt installer {self.loader_ver} from any known repository.')
                 self.progress.emit(70)
                 run_java_installer(installer_path)
@@ -149,32 +245,22 @@ class ModLoaderInstallThread(QThread):
                 self.status.emit(self.lang.get('installing_forge', 'Installing Forge...'))
                 self.progress.emit(30)
                 installer_url = f'https://maven.minecraftforge.net/net/minecraftforge/forge/{self.loader_ver}/forge-{self.loader_ver}-installer.jar'
-                installer_path = tmp_dir / f'forge-{self.loader_ver}-installer.jar'
-                r = requests.get(installer_url, stream=True)
-                r.raise_for_status()
-                with open(installer_path, 'wb') as f:
-                    shutil.copyfileobj(r.raw, f)
+                installer_path = download_installer(installer_url)
                 self.progress.emit(70)
-                process = run_java_installer(installer_path)
-                installer_path.unlink(missing_ok=True)
+                run_headless_installer(installer_path)
             elif self.loader == 'neoforge':
                 self.status.emit(self.lang.get('installing_neoforge_download', 'Downloading NeoForge installer...'))
                 self.progress.emit(30)
                 installer_url = f'https://maven.neoforged.net/releases/net/neoforged/neoforge/{self.loader_ver}/neoforge-{self.loader_ver}-installer.jar'
-                installer_path = tmp_dir / f'neoforge-{self.loader_ver}-installer.jar'
-                r = requests.get(installer_url, stream=True)
-                r.raise_for_status()
-                with open(installer_path, 'wb') as f:
-                    shutil.copyfileobj(r.raw, f)
+                installer_path = download_installer(installer_url)
                 self.status.emit(self.lang.get('installing_neoforge_install', 'Installing NeoForge...'))
                 self.progress.emit(70)
-                process = run_java_installer(installer_path)
-                installer_path.unlink(missing_ok=True)
+                run_headless_installer(installer_path)
 
             self.progress.emit(100)
             self.done.emit(self.lang.get('modloader_install_success', '{loader_name} {loader_ver} installed successfully!').format(loader_name=self.loader.capitalize(), loader_ver=self.loader_ver))
         except subprocess.CalledProcessError as e:
-            error_output = f"Installer Error:\n{e.stderr or e.stdout or 'No output from installer.'}"
+            error_output = f"Installer failed with exit code {e.returncode}:\n{e.output or 'No output from installer.'}"
             self.error.emit(error_output)
         except InterruptedError:
             pass
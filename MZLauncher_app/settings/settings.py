@@ -1,6 +1,9 @@
 import json
 import os
 import sys
+import copy
+import atexit
+import threading
 from pathlib import Path
 
 
@@ -17,9 +20,90 @@ def get_appdata_path():
 ACCOUNTS_FILE = get_appdata_path() / 'users.json'
 SETTINGS_FILE = get_appdata_path() / 'settings.json'
 VERSION_FILE = get_appdata_path() / 'versions.json'
+SAVE_DELAY = 0.3
+
+
+class SettingsStore:
+    """Process-wide copy of settings.json.
+
+    Reads are served from memory and reloaded only when the file's mtime
+    changes on disk. Writes are debounced and persisted with a temp file and
+    os.replace, so a crash never leaves a half-written settings.json.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._data = None
+        self._mtime = None
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def _get_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _reload(self):
+        mtime = self._get_mtime()
+        if self._data is not None and mtime == self._mtime:
+            return
+        data = None
+        if mtime is not None:
+            try:
+                with open(self.path, 'r', encoding='utf8') as f:
+                    data = json.load(f)
+            except Exception:
+                pass
+        self._data = data if isinstance(data, dict) else get_default_settings()
+        self._mtime = mtime
+
+    def get(self):
+        with self._lock:
+            # While a write is pending, memory is newer than the file.
+            if self._timer is None:
+                self._reload()
+            return copy.deepcopy(self._data)
+
+    def set(self, data):
+        with self._lock:
+            self._data = copy.deepcopy(data)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._timer is None:
+                return
+            self._timer.cancel()
+            self._timer = None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            try:
+                with open(tmp_path, 'w', encoding='utf8') as f:
+                    json.dump(self._data, f, indent=4)
+                os.replace(tmp_path, self.path)
+                self._mtime = self._get_mtime()
+            except OSError as e:
+                print(f'[Settings] Failed to write settings.json: {e}')
+
+
+_settings_store = SettingsStore(SETTINGS_FILE)
+atexit.register(_settings_store.flush)
+# Guards users.json; the token refresher writes it from a worker thread.
+_accounts_lock = threading.RLock()
 
 
 def load_accounts():
+    # A read during a write would see a half-written file and reset it.
+    with _accounts_lock:
+        return _load_accounts()
+
+
+def _load_accounts():
     os.makedirs(get_appdata_path(), exist_ok=True)
     if ACCOUNTS_FILE.exists():
         try:
@@ -48,13 +132,27 @@ def load_accounts():
 
 
 def save_accounts(accounts):
-    with open(ACCOUNTS_FILE, 'w', encoding='utf8') as f:
-        json.dump(accounts, f, indent=4)
+    with _accounts_lock:
+        with open(ACCOUNTS_FILE, 'w', encoding='utf8') as f:
+            json.dump(accounts, f, indent=4)
+
+
+def update_accounts(func):
+    """Read, modify and write users.json under one lock so concurrent edits are not lost.
+
+    func changes the account list in place; its return value is passed through.
+    """
+    with _accounts_lock:
+        accounts = load_accounts()
+        result = func(accounts)
+        save_accounts(accounts)
+        return result
 
 
 def save_settings(username=None, version_id=None, ram_mb=None, mc_dir=None, filters=None, dev_console=None,
                   hide_on_launch=None, jvm_args=None, discord_rpc=None, language=None, java_mode=None,
-                  java_path=None, skip_version_check=None, instant_launch=None, instances=None, _reset_to_default=False):
+                  java_path=None, skip_version_check=None, instant_launch=None, instances=None, fast_verify=None,
+                  manifest_ttl=None, appcds=None, shared_store=None, _reset_to_default=False):
     if _reset_to_default:
         data = {
             'filters': {
@@ -73,7 +171,11 @@ def save_settings(username=None, version_id=None, ram_mb=None, mc_dir=None, filt
             'java_path': '',
             'skip_version_check': False,
             'ram_mb': 2048,
-            'instant_launch': False
+            'instant_launch': False,
+            'fast_verify': True,
+            'manifest_ttl': 600,
+            'appcds': False,
+            'shared_store': True
         }
     else:
         data = load_settings()
@@ -107,19 +209,27 @@ def save_settings(username=None, version_id=None, ram_mb=None, mc_dir=None, filt
         data['instant_launch'] = instant_launch
     if instances is not None:
         data['instances'] = instances
+    if fast_verify is not None:
+        data['fast_verify'] = fast_verify
+    if manifest_ttl is not None:
+        data['manifest_ttl'] = manifest_ttl
+    if appcds is not None:
+        data['appcds'] = appcds
+    if shared_store is not None:
+        data['shared_store'] = shared_store
 
-    os.makedirs(get_appdata_path(), exist_ok=True)
-    with open(SETTINGS_FILE, 'w', encoding='utf8') as f:
-        json.dump(data, f, indent=4)
+    _settings_store.set(data)
+
+
+def flush_settings():
+    _settings_store.flush()
 
 
 def load_settings():
-    if os.path.exists(SETTINGS_FILE):
-        try:
-            with open(SETTINGS_FILE, 'r', encoding='utf8') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    return _settings_store.get()
+
+
+def get_default_settings():
     return {
         'filters': {
             'release': True,
@@ -136,7 +246,11 @@ def load_settings():
         'java_mode': 'default',
         'java_path': '',
         'skip_version_check': False,
-        'instant_launch': False
+        'instant_launch': False,
+        'fast_verify': True,
+        'manifest_ttl': 600,
+        'appcds': False,
+        'shared_store': True
     }
 
 
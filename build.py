@@ -9,7 +9,9 @@ build_exe_options = {
         "os", "sys", "json", "uuid", "requests",
         "PySide6.QtCore", "PySide6.QtGui", "PySide6.QtWidgets",
         "minecraft_launcher_lib",
-        "packaging", "psutil"
+        "packaging", "psutil", "pypresence",
+        # Imported lazily by name, so the freezer cannot find them on its own.
+        "MZLauncher_app"
     ],
 
     "excludes": [